@@ -1,103 +1,137 @@
 """
 API v1 routes
 """
+import importlib
+import time
+from typing import Iterable, Optional
+
 from fastapi import APIRouter
-from app.api.v1.endpoints import (
-    auth, vendors, products, orders, inventory, payouts, dashboard,
-    support, reviews, promotions, staff, analytics, upload, vendor_deliveries, vendor_marketing, vendor_stores,
-    customer_auth, customer_products, customer_orders, customer_stores, customer_cart, customer_profile, customer_recipes, customer_reviews, customer_promotions, customer_chat, customer_deliveries, customer_support, customer_marketing, customer_chefs,
-    driver_auth, driver_portal, delivery_tracking,
-    chef_auth, chef_portal, chef_marketing, chef_support, chef_chat, chef_cuisines, chef_orders, chef_promotions,
-    admin_auth, admin_vendors, admin_customers, admin_products, admin_orders, admin_dashboard,
-    admin_analytics, admin_reviews, admin_support, admin_activity, admin_users, admin_promotions, admin_export, admin_drivers, admin_deliveries, admin_settings, admin_barcode, admin_chefs,
-    restore_backup, marketing, marketing_extended, marketing_admin, marketing_recipes, marketing_coupons,
-    customer_coupons, barcode, payments_helcim,
-    customer_chat_messages, vendor_chat, driver_chat, admin_chat
-)
-
-api_router = APIRouter()
-
-# Include endpoint routers
-api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(vendors.router, prefix="/vendors", tags=["Vendors"])
-api_router.include_router(products.router, prefix="/products", tags=["Products"])
-api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
-api_router.include_router(inventory.router, prefix="/inventory", tags=["Inventory"])
-api_router.include_router(barcode.router, prefix="/barcode", tags=["Barcode"])
-api_router.include_router(payouts.router, prefix="/payouts", tags=["Payouts"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
-api_router.include_router(support.router, prefix="/support", tags=["Support"])
-api_router.include_router(reviews.router, prefix="/reviews", tags=["Reviews"])
-api_router.include_router(promotions.router, prefix="/promotions", tags=["Promotions"])
-api_router.include_router(staff.router, prefix="/staff", tags=["Staff"])
-api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
-api_router.include_router(upload.router, prefix="/uploads", tags=["Uploads"])
-api_router.include_router(vendor_deliveries.router, prefix="/deliveries", tags=["Vendor Deliveries"])
-api_router.include_router(vendor_marketing.router, prefix="/vendor/marketing", tags=["Vendor Marketing"])
-api_router.include_router(vendor_stores.router, prefix="/stores", tags=["Vendor Stores"])
-api_router.include_router(vendor_chat.router, prefix="/vendor/chat", tags=["Vendor Chat"])
-
-# Customer endpoints
-api_router.include_router(customer_auth.router, prefix="/customer/auth", tags=["Customer Auth"])
-api_router.include_router(customer_products.router, prefix="/customer", tags=["Customer Products"])
-api_router.include_router(customer_orders.router, prefix="/customer/orders", tags=["Customer Orders"])
-api_router.include_router(customer_stores.router, prefix="/customer/stores", tags=["Customer Stores"])
-api_router.include_router(customer_cart.router, prefix="/customer/cart", tags=["Customer Cart"])
-api_router.include_router(payments_helcim.router, prefix="/customer/payments", tags=["Payments"])
-api_router.include_router(customer_profile.router, prefix="/customer", tags=["Customer Profile"])
-api_router.include_router(customer_recipes.router, prefix="/customer/recipes", tags=["Customer Recipes"])
-api_router.include_router(customer_reviews.router, prefix="/customer/reviews", tags=["Customer Reviews"])
-api_router.include_router(customer_promotions.router, prefix="/customer", tags=["Customer Promotions"])
-api_router.include_router(customer_chat.router, prefix="/customer", tags=["Customer Chat"])
-api_router.include_router(customer_chat_messages.router, prefix="/customer/chat", tags=["Customer Chat Messages"])
-api_router.include_router(customer_deliveries.router, prefix="/customer/deliveries", tags=["Customer Deliveries"])
-api_router.include_router(customer_support.router, prefix="/customer/support", tags=["Customer Support"])
-api_router.include_router(customer_marketing.router, prefix="/customer/marketing", tags=["Customer Marketing"])
-
-# Driver endpoints
-api_router.include_router(driver_auth.router, prefix="/driver/auth", tags=["Driver Auth"])
-api_router.include_router(driver_portal.router, prefix="/driver", tags=["Driver Portal"])
-api_router.include_router(driver_chat.router, prefix="/driver/chat", tags=["Driver Chat"])
-api_router.include_router(delivery_tracking.router, tags=["Delivery Tracking"])
-
-# Chef endpoints
-api_router.include_router(chef_auth.router, prefix="/chef/auth", tags=["Chef Auth"])
-api_router.include_router(chef_portal.router, prefix="/chef", tags=["Chef Portal"])
-api_router.include_router(chef_marketing.router, prefix="/chef/marketing", tags=["Chef Marketing"])
-api_router.include_router(chef_support.router, prefix="/chef/support", tags=["Chef Support"])
-api_router.include_router(chef_chat.router, prefix="/chef/chat", tags=["Chef Chat"])
-api_router.include_router(chef_cuisines.router, prefix="/chef/cuisines", tags=["Chef Cuisines"])
-api_router.include_router(chef_orders.router, prefix="/chef/orders", tags=["Chef Orders"])
-api_router.include_router(chef_promotions.router, prefix="/chef/promotions", tags=["Chef Promotions"])
-api_router.include_router(customer_chefs.router, prefix="/customer", tags=["Customer Chefs"])
-
-# Admin endpoints
-api_router.include_router(admin_auth.router, prefix="/admin/auth", tags=["Admin Auth"])
-api_router.include_router(admin_dashboard.router, prefix="/admin/dashboard", tags=["Admin Dashboard"])
-api_router.include_router(admin_vendors.router, prefix="/admin/vendors", tags=["Admin Vendors"])
-api_router.include_router(admin_customers.router, prefix="/admin/customers", tags=["Admin Customers"])
-api_router.include_router(admin_products.router, prefix="/admin/products", tags=["Admin Products"])
-api_router.include_router(admin_orders.router, prefix="/admin/orders", tags=["Admin Orders"])
-api_router.include_router(admin_analytics.router, prefix="/admin/analytics", tags=["Admin Analytics"])
-api_router.include_router(admin_reviews.router, prefix="/admin/reviews", tags=["Admin Reviews"])
-api_router.include_router(admin_support.router, prefix="/admin/support", tags=["Admin Support"])
-api_router.include_router(admin_chat.router, prefix="/admin/chat", tags=["Admin Chat"])
-api_router.include_router(admin_activity.router, prefix="/admin/activity", tags=["Admin Activity"])
-api_router.include_router(admin_users.router, prefix="/admin/users", tags=["Admin Users"])
-api_router.include_router(admin_promotions.router, prefix="/admin/promotions", tags=["Admin Promotions"])
-api_router.include_router(admin_export.router, prefix="/admin/export", tags=["Admin Export"])
-api_router.include_router(admin_drivers.router, prefix="/admin/drivers", tags=["Admin Drivers"])
-api_router.include_router(admin_deliveries.router, prefix="/admin/deliveries", tags=["Admin Deliveries"])
-api_router.include_router(admin_settings.router, prefix="/admin", tags=["Admin Settings"])
-api_router.include_router(admin_barcode.router, prefix="/admin/barcode", tags=["Admin Barcode"])
-api_router.include_router(admin_chefs.router, prefix="/admin/chefs", tags=["Admin Chefs"])
-api_router.include_router(restore_backup.router, prefix="/admin", tags=["Admin Restore"])
-api_router.include_router(marketing.router, prefix="/admin/marketing", tags=["Admin Marketing"])
-api_router.include_router(marketing_extended.router, prefix="/admin/marketing", tags=["Admin Marketing Extended"])
-api_router.include_router(marketing_admin.router, prefix="/admin/marketing/admin", tags=["Marketing Admin Control"])
-api_router.include_router(marketing_recipes.router, prefix="/admin/marketing", tags=["Marketing Recipes & Meal Plans"])
-api_router.include_router(marketing_coupons.router, prefix="/admin/marketing/coupons", tags=["Marketing Coupons"])
-
-# Customer coupon endpoints
-api_router.include_router(customer_coupons.router, prefix="/customer/coupons", tags=["Customer Coupons"])
 
+from app.core.startup import startup_timings
+
+# (endpoint module, prefix, tag[, router attribute]) in registration order: order matters where paths
+# overlap. A group is the first path segment of the prefix ("customer", "admin", ...); lazy loading
+# imports a whole group at once, so a module serving two groups has a router per group.
+ROUTERS = [
+    ("auth", "/auth", "Authentication"),
+    ("vendors", "/vendors", "Vendors"),
+    ("products", "/products", "Products"),
+    ("orders", "/orders", "Orders"),
+    ("inventory", "/inventory", "Inventory"),
+    ("barcode", "/barcode", "Barcode"),
+    ("payouts", "/payouts", "Payouts"),
+    ("dashboard", "/dashboard", "Dashboard"),
+    ("support", "/support", "Support"),
+    ("reviews", "/reviews", "Reviews"),
+    ("promotions", "/promotions", "Promotions"),
+    ("staff", "/staff", "Staff"),
+    ("analytics", "/analytics", "Analytics"),
+    ("upload", "/uploads", "Uploads"),
+    ("vendor_deliveries", "/deliveries", "Vendor Deliveries"),
+    ("vendor_marketing", "/vendor/marketing", "Vendor Marketing"),
+    ("vendor_stores", "/stores", "Vendor Stores"),
+    ("vendor_chat", "/vendor/chat", "Vendor Chat"),
+
+    # Customer endpoints
+    ("customer_auth", "/customer/auth", "Customer Auth"),
+    ("customer_products", "/customer", "Customer Products"),
+    ("customer_orders", "/customer/orders", "Customer Orders"),
+    ("customer_stores", "/customer/stores", "Customer Stores"),
+    ("customer_cart", "/customer/cart", "Customer Cart"),
+    ("payments_helcim", "/customer/payments", "Payments"),
+    ("customer_profile", "/customer", "Customer Profile"),
+    ("customer_recipes", "/customer/recipes", "Customer Recipes"),
+    ("customer_reviews", "/customer/reviews", "Customer Reviews"),
+    ("customer_promotions", "/customer", "Customer Promotions"),
+    ("customer_chat", "/customer", "Customer Chat"),
+    ("customer_chat_messages", "/customer/chat", "Customer Chat Messages"),
+    ("customer_deliveries", "/customer/deliveries", "Customer Deliveries"),
+    ("customer_support", "/customer/support", "Customer Support"),
+    ("customer_marketing", "/customer/marketing", "Customer Marketing"),
+
+    # Driver endpoints
+    ("driver_auth", "/driver/auth", "Driver Auth"),
+    ("driver_portal", "/driver", "Driver Portal"),
+    ("driver_chat", "/driver/chat", "Driver Chat"),
+    ("delivery_tracking", "/driver", "Delivery Tracking", "driver_router"),
+    ("delivery_tracking", "/customer", "Delivery Tracking", "customer_router"),
+
+    # Chef endpoints
+    ("chef_auth", "/chef/auth", "Chef Auth"),
+    ("chef_portal", "/chef", "Chef Portal"),
+    ("chef_marketing", "/chef/marketing", "Chef Marketing"),
+    ("chef_support", "/chef/support", "Chef Support"),
+    ("chef_chat", "/chef/chat", "Chef Chat"),
+    ("chef_cuisines", "/chef/cuisines", "Chef Cuisines"),
+    ("chef_orders", "/chef/orders", "Chef Orders"),
+    ("chef_promotions", "/chef/promotions", "Chef Promotions"),
+    ("customer_chefs", "/customer", "Customer Chefs"),
+
+    # Admin endpoints
+    ("admin_auth", "/admin/auth", "Admin Auth"),
+    ("admin_dashboard", "/admin/dashboard", "Admin Dashboard"),
+    ("admin_vendors", "/admin/vendors", "Admin Vendors"),
+    ("admin_customers", "/admin/customers", "Admin Customers"),
+    ("admin_products", "/admin/products", "Admin Products"),
+    ("admin_orders", "/admin/orders", "Admin Orders"),
+    ("admin_analytics", "/admin/analytics", "Admin Analytics"),
+    ("admin_reviews", "/admin/reviews", "Admin Reviews"),
+    ("admin_support", "/admin/support", "Admin Support"),
+    ("admin_chat", "/admin/chat", "Admin Chat"),
+    ("admin_activity", "/admin/activity", "Admin Activity"),
+    ("admin_users", "/admin/users", "Admin Users"),
+    ("admin_promotions", "/admin/promotions", "Admin Promotions"),
+    ("admin_export", "/admin/export", "Admin Export"),
+    ("admin_drivers", "/admin/drivers", "Admin Drivers"),
+    ("admin_deliveries", "/admin/deliveries", "Admin Deliveries"),
+    ("admin_settings", "/admin", "Admin Settings"),
+    ("admin_barcode", "/admin/barcode", "Admin Barcode"),
+    ("admin_chefs", "/admin/chefs", "Admin Chefs"),
+    ("restore_backup", "/admin", "Admin Restore"),
+    ("marketing", "/admin/marketing", "Admin Marketing"),
+    ("marketing_extended", "/admin/marketing", "Admin Marketing Extended"),
+    ("marketing_admin", "/admin/marketing/admin", "Marketing Admin Control"),
+    ("marketing_recipes", "/admin/marketing", "Marketing Recipes & Meal Plans"),
+    ("marketing_coupons", "/admin/marketing/coupons", "Marketing Coupons"),
+
+    # Customer coupon endpoints
+    ("customer_coupons", "/customer/coupons", "Customer Coupons"),
+]
+
+
+def _group(entry) -> str:
+    return entry[1].strip("/").split("/")[0]
+
+
+ROUTE_GROUPS = frozenset(_group(entry) for entry in ROUTERS)
+
+
+def build_api_router(groups: Optional[Iterable[str]] = None) -> APIRouter:
+    """
+    Import endpoint modules and include their routers (all of them, or only `groups`).
+    Import and build times are recorded in startup_timings for --profile-startup.
+    """
+    wanted = None if groups is None else set(groups)
+    router = APIRouter()
+    build_start = time.perf_counter()
+    for entry in ROUTERS:
+        name, prefix, tag = entry[:3]
+        if wanted is not None and _group(entry) not in wanted:
+            continue
+        import_start = time.perf_counter()
+        module = importlib.import_module(f"app.api.v1.endpoints.{name}")
+        # Includes first-time imports of shared dependencies (models, services) the module pulls in
+        startup_timings["endpoint_imports"].setdefault(name, time.perf_counter() - import_start)
+        router_name = entry[3] if len(entry) > 3 else "router"
+        router.include_router(getattr(module, router_name), prefix=prefix, tags=[tag])
+    startup_timings["router_build_seconds"] += time.perf_counter() - build_start
+    return router
+
+
+def __getattr__(name):
+    # `from app.api.v1 import api_router` still works, but only builds the full router when asked for
+    if name == "api_router":
+        router = build_api_router()
+        globals()["api_router"] = router
+        return router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.cache import TTLCache
 from app.core.database import get_db
 from app.models.vendor import VendorUser
 from app.models.customer import Customer
@@ -21,8 +22,31 @@ driver_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/driver/auth/login"
 chef_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/chef/auth/login", auto_error=False)
 admin_oauth2_scheme = HTTPBearer(auto_error=False)
 
+# The get_current_* dependencies are plain `def` on purpose: FastAPI runs them in its
+# threadpool, so their sync user lookup doesn't block the event loop of async routes.
 
-async def get_current_vendor(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> dict:
+# Principals confirmed to exist (and be active) recently, so cheap endpoints like chat polling
+# and location pings skip the lookup. Keys: ("vendor", vendor_id, user_id), ("customer", id),
+# ("driver", id), ("chef", id), ("admin", id). Only valid principals are cached.
+# Per worker: invalidate_principal() clears this worker; other workers converge within the TTL.
+principal_cache = TTLCache(
+    "principals",
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(kind: str, principal_id) -> int:
+    """
+    Drop cached principals after an admin changes a user's status.
+    kind: vendor, customer, driver, chef or admin. For vendor, principal_id may be
+    the vendor id (drops all its users) or a single vendor user id.
+    """
+    principal_id = str(principal_id)
+    return principal_cache.invalidate_where(lambda key: key[0] == kind and principal_id in key[1:])
+
+
+def get_current_vendor(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> dict:
     """
     Get current authenticated vendor user from JWT token
     """
@@ -45,9 +69,12 @@ async def get_current_vendor(token: str = Depends(oauth2_scheme), db: Session =
         raise credentials_exception
     
     # Verify vendor user exists
-    vendor_user = db.query(VendorUser).filter(VendorUser.id == UUID(user_id)).first()
-    if vendor_user is None:
-        raise credentials_exception
+    cache_key = ("vendor", vendor_id, user_id)
+    if principal_cache.get(cache_key) is None:
+        vendor_user = db.query(VendorUser).filter(VendorUser.id == UUID(user_id)).first()
+        if vendor_user is None:
+            raise credentials_exception
+        principal_cache.set(cache_key, True)
     
     return {
         "email": email,
@@ -57,7 +84,7 @@ async def get_current_vendor(token: str = Depends(oauth2_scheme), db: Session =
     }
 
 
-async def get_current_customer(token: str = Depends(customer_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
+def get_current_customer(token: str = Depends(customer_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
     """
     Get current authenticated customer from JWT token
     """
@@ -81,9 +108,12 @@ async def get_current_customer(token: str = Depends(customer_oauth2_scheme), db:
         raise credentials_exception
     
     # Verify customer exists
-    customer = db.query(Customer).filter(Customer.id == UUID(customer_id)).first()
-    if customer is None:
-        raise credentials_exception
+    cache_key = ("customer", customer_id)
+    if principal_cache.get(cache_key) is None:
+        customer = db.query(Customer).filter(Customer.id == UUID(customer_id)).first()
+        if customer is None:
+            raise credentials_exception
+        principal_cache.set(cache_key, True)
     
     return {
         "email": email,
@@ -91,7 +121,7 @@ async def get_current_customer(token: str = Depends(customer_oauth2_scheme), db:
     }
 
 
-async def get_optional_customer(token: str = Depends(customer_oauth2_scheme), db: Session = Depends(get_db)) -> Optional[dict]:
+def get_optional_customer(token: str = Depends(customer_oauth2_scheme), db: Session = Depends(get_db)) -> Optional[dict]:
     """
     Get current authenticated customer from JWT token, or None if not authenticated
     """
@@ -109,9 +139,12 @@ async def get_optional_customer(token: str = Depends(customer_oauth2_scheme), db
         return None
     
     # Verify customer exists
-    customer = db.query(Customer).filter(Customer.id == UUID(customer_id)).first()
-    if customer is None:
-        return None
+    cache_key = ("customer", customer_id)
+    if principal_cache.get(cache_key) is None:
+        customer = db.query(Customer).filter(Customer.id == UUID(customer_id)).first()
+        if customer is None:
+            return None
+        principal_cache.set(cache_key, True)
     
     return {
         "email": email,
@@ -119,7 +152,7 @@ async def get_optional_customer(token: str = Depends(customer_oauth2_scheme), db
     }
 
 
-async def get_current_driver(token: str = Depends(driver_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
+def get_current_driver(token: str = Depends(driver_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
     """
     Get current authenticated driver from JWT token
     """
@@ -140,9 +173,12 @@ async def get_current_driver(token: str = Depends(driver_oauth2_scheme), db: Ses
         raise credentials_exception
     
     # Verify driver exists and is active
-    driver = db.query(Driver).filter(Driver.id == UUID(driver_id)).first()
-    if driver is None or not driver.is_active:
-        raise credentials_exception
+    cache_key = ("driver", driver_id)
+    if principal_cache.get(cache_key) is None:
+        driver = db.query(Driver).filter(Driver.id == UUID(driver_id)).first()
+        if driver is None or not driver.is_active:
+            raise credentials_exception
+        principal_cache.set(cache_key, True)
     
     return {
         "email": email,
@@ -150,7 +186,7 @@ async def get_current_driver(token: str = Depends(driver_oauth2_scheme), db: Ses
     }
 
 
-async def get_current_admin(credentials: HTTPAuthorizationCredentials | None = Depends(admin_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
+def get_current_admin(credentials: HTTPAuthorizationCredentials | None = Depends(admin_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
     """
     Get current authenticated admin user from JWT token
     """
@@ -179,22 +215,27 @@ async def get_current_admin(credentials: HTTPAuthorizationCredentials | None = D
         raise credentials_exception
     
     # Verify admin user exists and is active
-    try:
-        admin = db.query(AdminUser).filter(AdminUser.id == UUID(admin_id)).first()
-        if admin is None or not admin.is_active:
+    cache_key = ("admin", admin_id)
+    cached = principal_cache.get(cache_key)
+    if cached is None:
+        try:
+            admin = db.query(AdminUser).filter(AdminUser.id == UUID(admin_id)).first()
+            if admin is None or not admin.is_active:
+                raise credentials_exception
+        except Exception:
             raise credentials_exception
-    except Exception:
-        raise credentials_exception
+        cached = {"permissions": admin.permissions}
+        principal_cache.set(cache_key, cached)
     
     return {
         "email": email,
         "admin_id": admin_id,
         "role": role,
-        "permissions": admin.permissions
+        "permissions": cached["permissions"]
     }
 
 
-async def get_current_chef(token: str = Depends(chef_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
+def get_current_chef(token: str = Depends(chef_oauth2_scheme), db: Session = Depends(get_db)) -> dict:
     """
     Get current authenticated chef from JWT token
     """
@@ -215,9 +256,12 @@ async def get_current_chef(token: str = Depends(chef_oauth2_scheme), db: Session
         raise credentials_exception
     
     # Verify chef exists and is active
-    chef = db.query(Chef).filter(Chef.id == UUID(chef_id)).first()
-    if chef is None or not chef.is_active:
-        raise credentials_exception
+    cache_key = ("chef", chef_id)
+    if principal_cache.get(cache_key) is None:
+        chef = db.query(Chef).filter(Chef.id == UUID(chef_id)).first()
+        if chef is None or not chef.is_active:
+            raise credentials_exception
+        principal_cache.set(cache_key, True)
     
     return {
         "email": email,
@@ -1,13 +1,14 @@
 """
 Admin activity log endpoints
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.models.admin import AdminActivityLog, AdminUser
 from app.api.v1.dependencies import get_current_admin
+from app.api.v1.pagination import keyset, page, capped_count, set_page_headers
 
 router = APIRouter()
 
@@ -15,8 +16,11 @@ router = APIRouter()
 @router.get("", response_model=List[dict])
 @router.get("/", response_model=List[dict])
 async def get_activity_logs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Send X-Total-Count (capped)"),
     action_filter: Optional[str] = None,
     entity_type_filter: Optional[str] = None,
     admin_id: Optional[str] = None,
@@ -35,7 +39,8 @@ async def get_activity_logs(
     if admin_id:
         query = query.filter(AdminActivityLog.admin_id == UUID(admin_id))
     
-    logs = query.order_by(AdminActivityLog.created_at.desc()).offset(skip).limit(limit).all()
+    logs, next_cursor = page(keyset(query, AdminActivityLog.created_at, AdminActivityLog.id, cursor, limit, skip).all(), limit)
+    set_page_headers(response, next_cursor, db.scalar(capped_count(query)) if include_total else None)
     
     result = []
     for log in logs:
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, extract, case
 from datetime import datetime, timedelta, date
 from typing import Optional
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.vendor import Vendor
 from app.models.customer import Customer
 from app.models.product import Product
@@ -23,7 +23,7 @@ async def get_analytics_overview(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get comprehensive analytics overview"""
     # Default to last 30 days if not provided
@@ -410,7 +410,7 @@ async def get_revenue_analytics(
     end_date: Optional[str] = Query(None),
     group_by: str = Query("day", regex="^(day|week|month)$"),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get revenue analytics with date range"""
     if not start_date:
@@ -503,7 +503,7 @@ async def get_period_comparison(
     period2_start: str = Query(...),
     period2_end: str = Query(...),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Compare two time periods"""
     try:
@@ -586,7 +586,7 @@ async def get_sales_report(
     start_date: str = Query(...),
     end_date: str = Query(...),
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Generate detailed sales report"""
     start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
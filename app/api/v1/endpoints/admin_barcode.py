@@ -2,7 +2,7 @@
 Admin barcode management and control endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, or_
 from typing import List, Optional
 from datetime import datetime
@@ -39,13 +39,11 @@ async def get_barcode_settings(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Get settings from platform_settings table if exists, otherwise return defaults
-    from app.models.platform_settings import PlatformSettings
-    settings = db.query(PlatformSettings).filter(
-        PlatformSettings.setting_type == "barcode"
-    ).first()
+    from app.core.refdata import platform_settings
+    settings = platform_settings(db, "barcode")
     
     if settings:
-        return settings.settings_data
+        return settings["settings"]
     else:
         # Return default settings
         return {
@@ -88,6 +86,8 @@ async def update_barcode_settings(
         db.add(settings)
     
     db.commit()
+    from app.core.refdata import reference_data
+    reference_data.invalidate("settings")
     
     return {"message": "Barcode settings updated successfully"}
 
@@ -128,7 +128,7 @@ async def get_all_products_with_barcodes(
         )
     
     total = query.count()
-    products = query.order_by(Product.created_at.desc()).offset(skip).limit(limit).all()
+    products = query.options(selectinload(Product.vendor)).order_by(Product.created_at.desc()).offset(skip).limit(limit).all()
     
     return {
         "products": [
@@ -1,7 +1,7 @@
 """
 Admin chat endpoints - chat with customers, vendors, and drivers
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from typing import List, Optional
@@ -11,6 +11,7 @@ from app.core.database import get_db
 from app.models.chat import ChatMessage
 from app.models.vendor import Vendor
 from app.api.v1.dependencies import get_current_admin
+from app.api.v1.pagination import keyset, page, set_page_headers
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -77,10 +78,12 @@ async def send_message(
 
 @router.get("/messages", response_model=List[ChatMessageResponse])
 async def get_messages(
+    response: Response,
     recipient_type: Optional[str] = Query(None, description="Filter by recipient type: 'customer', 'vendor', 'driver', or 'chef'"),
     recipient_id: Optional[str] = Query(None, description="Filter by specific recipient ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
     current_admin: dict = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -146,7 +149,10 @@ async def get_messages(
             )
         )
     
-    messages = query.order_by(ChatMessage.created_at.asc()).offset(skip).limit(limit).all()
+    messages, next_cursor = page(
+        keyset(query, ChatMessage.created_at, ChatMessage.id, cursor, limit, skip, descending=False).all(), limit
+    )
+    set_page_headers(response, next_cursor)
     
     # Mark messages as read
     for msg in messages:
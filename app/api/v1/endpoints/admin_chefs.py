@@ -7,7 +7,7 @@ from typing import List, Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.models.chef import Chef
-from app.api.v1.dependencies import get_current_admin
+from app.api.v1.dependencies import get_current_admin, invalidate_principal
 from sqlalchemy import or_, func
 
 router = APIRouter()
@@ -131,6 +131,7 @@ async def verify_chef(
     chef.is_active = True
     
     db.commit()
+    invalidate_principal("chef", chef.id)
     db.refresh(chef)
     
     return {"message": "Chef verified successfully", "chef_id": str(chef.id)}
@@ -153,6 +154,7 @@ async def reject_chef(
     chef.is_active = False
     
     db.commit()
+    invalidate_principal("chef", chef.id)
     
     return {"message": "Chef application rejected", "chef_id": str(chef.id)}
 
@@ -173,6 +175,7 @@ async def suspend_chef(
     chef.is_available = False
     
     db.commit()
+    invalidate_principal("chef", chef.id)
     
     return {"message": "Chef suspended successfully", "chef_id": str(chef.id)}
 
@@ -191,6 +194,7 @@ async def activate_chef(
     chef.is_active = True
     
     db.commit()
+    invalidate_principal("chef", chef.id)
     
     return {"message": "Chef activated successfully", "chef_id": str(chef.id)}
 
@@ -210,6 +214,7 @@ async def deactivate_chef(
     chef.is_available = False
     
     db.commit()
+    invalidate_principal("chef", chef.id)
     
     return {"message": "Chef deactivated successfully", "chef_id": str(chef.id)}
 
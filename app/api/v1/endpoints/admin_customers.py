@@ -1,7 +1,7 @@
 """
 Admin customer management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from typing import List, Optional
@@ -11,7 +11,8 @@ from app.core.database import get_db
 from app.models.vendor import Vendor
 from app.models.customer import Customer
 from app.models.order import Order
-from app.api.v1.dependencies import get_current_admin
+from app.api.v1.dependencies import get_current_admin, invalidate_principal
+from app.api.v1.pagination import keyset, page, capped_count, set_page_headers
 
 router = APIRouter()
 
@@ -19,9 +20,12 @@ router = APIRouter()
 @router.get("", response_model=List[dict])
 @router.get("/", response_model=List[dict])
 async def get_all_customers(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Send X-Total-Count (capped)"),
     current_admin: dict = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -39,8 +43,11 @@ async def get_all_customers(
             )
         )
     
+    page_query = keyset(query, Customer.created_at, Customer.id, cursor, limit, skip)
+    
     try:
-        customers = query.order_by(Customer.created_at.desc()).offset(skip).limit(limit).all()
+        customers, next_cursor = page(page_query.all(), limit)
+        set_page_headers(response, next_cursor, db.scalar(capped_count(query)) if include_total else None)
         
         # Get stats for each customer
         result = []
@@ -190,6 +197,7 @@ async def suspend_customer(
     )
     db.add(log)
     db.commit()
+    invalidate_principal("customer", customer.id)
     
     return {"message": "Customer suspended successfully"}
 
@@ -218,6 +226,7 @@ async def delete_customer(
     
     db.delete(customer)
     db.commit()
+    invalidate_principal("customer", customer_id)
     
     return {"message": "Customer deleted successfully"}
 
@@ -9,7 +9,7 @@ from datetime import datetime
 from uuid import UUID
 from app.core.database import get_db
 from app.models.driver import Driver
-from app.api.v1.dependencies import get_current_admin
+from app.api.v1.dependencies import get_current_admin, invalidate_principal
 from app.schemas.driver import DriverResponse
 
 router = APIRouter()
@@ -177,6 +177,7 @@ async def verify_driver(
     
     driver.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_principal("driver", driver.id)
     
     return {"message": f"Driver {verification_status} successfully", "driver_id": str(driver.id)}
 
@@ -209,6 +210,7 @@ async def toggle_driver_active(
         driver.is_available = False  # Can't be available if inactive
     driver.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_principal("driver", driver.id)
     
     return {"message": f"Driver {'activated' if driver.is_active else 'deactivated'}", "is_active": driver.is_active}
 
@@ -9,7 +9,7 @@ import csv
 import io
 import json
 from typing import Any, Dict, List
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.api.v1.dependencies import get_current_admin
 
 # Import all models
@@ -92,7 +92,7 @@ def export_table_to_csv_rows(db: Session, model_class: Any, table_name: str) ->
 @router.get("/master-export")
 async def master_export(
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Export all database data to a single CSV file.
@@ -1,7 +1,7 @@
 """
 Admin order management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from typing import List, Optional
@@ -14,6 +14,7 @@ from app.models.customer import Customer
 # Import Order after Product and Vendor to ensure relationships work
 from app.models.order import Order, OrderItem
 from app.api.v1.dependencies import get_current_admin
+from app.api.v1.pagination import keyset, page, capped_count, set_page_headers, decode_cursor
 
 router = APIRouter()
 
@@ -21,17 +22,22 @@ router = APIRouter()
 @router.get("", response_model=List[dict])
 @router.get("/", response_model=List[dict])
 async def get_all_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     status_filter: Optional[str] = None,
     vendor_id: Optional[str] = None,
     customer_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Send X-Total-Count (capped)"),
     current_admin: dict = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """Get all orders across all vendors"""
+    if cursor:
+        decode_cursor(cursor)  # 400 for a bad cursor, not the 500 below
     try:
-        query = db.query(Order).options(joinedload(Order.items))
+        query = db.query(Order)
         
         if status_filter:
             query = query.filter(Order.status == status_filter)
@@ -42,7 +48,11 @@ async def get_all_orders(
         if customer_id:
             query = query.filter(Order.customer_id == UUID(customer_id))
         
-        orders = query.order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+        orders, next_cursor = page(
+            keyset(query.options(joinedload(Order.items)), Order.created_at, Order.id, cursor, limit, skip).all(),
+            limit,
+        )
+        set_page_headers(response, next_cursor, db.scalar(capped_count(query)) if include_total else None)
         
         result = []
         for order in orders:
@@ -1,7 +1,7 @@
 """
 Admin product management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
 from typing import List, Optional
@@ -11,6 +11,8 @@ from app.core.database import get_db
 from app.models.vendor import Vendor
 from app.models.product import Product, Category
 from app.api.v1.dependencies import get_current_admin
+from app.api.v1.pagination import keyset, page, capped_count, set_page_headers
+from app.services import product_search
 
 router = APIRouter()
 
@@ -18,11 +20,14 @@ router = APIRouter()
 @router.get("", response_model=List[dict])
 @router.get("/", response_model=List[dict])
 async def get_all_products(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     vendor_id: Optional[str] = None,
     category_id: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Send X-Total-Count (capped)"),
     current_admin: dict = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -36,17 +41,18 @@ async def get_all_products(
         query = query.filter(Product.category_id == UUID(category_id))
     
     if search:
-        search_term = f"%{search}%"
         query = query.filter(
             or_(
-                Product.name.ilike(search_term),
-                Product.description.ilike(search_term),
-                Product.sku.ilike(search_term)
+                product_search.match(search),
+                Product.sku.ilike(f"%{search}%")
             )
         )
     
+    page_query = keyset(query, Product.created_at, Product.id, cursor, limit, skip)
+    
     try:
-        products = query.order_by(Product.created_at.desc()).offset(skip).limit(limit).all()
+        products, next_cursor = page(page_query.all(), limit)
+        set_page_headers(response, next_cursor, db.scalar(capped_count(query)) if include_total else None)
         
         result = []
         for product in products:
@@ -11,6 +11,7 @@ from app.core.database import get_db
 from app.models.promotion import Promotion
 from app.models.vendor import Vendor
 from app.api.v1.dependencies import get_current_admin
+from app.services.promotion_index import promotion_index
 
 router = APIRouter()
 
@@ -100,6 +101,7 @@ async def approve_promotion(
     promotion.approved_at = datetime.utcnow()
     promotion.is_active = True
     db.commit()
+    promotion_index.invalidate()
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -130,6 +132,7 @@ async def reject_promotion(
     promotion.approval_status = "rejected"
     promotion.is_active = False
     db.commit()
+    promotion_index.invalidate()
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -159,6 +162,7 @@ async def toggle_promotion_active(
     
     promotion.is_active = not promotion.is_active
     db.commit()
+    promotion_index.invalidate()
     
     return {"message": f"Promotion {'activated' if promotion.is_active else 'deactivated'} successfully"}
 
@@ -176,6 +180,7 @@ async def delete_promotion(
     
     db.delete(promotion)
     db.commit()
+    promotion_index.invalidate()
     
     return {"message": "Promotion deleted successfully"}
 
@@ -12,6 +12,8 @@ from app.models.vendor import Vendor
 from app.models.customer import Customer
 from app.models.product import Product
 from app.api.v1.dependencies import get_current_admin
+from app.core.refdata import reference_data
+from app.services import ratings
 
 router = APIRouter()
 
@@ -107,10 +109,12 @@ async def moderate_review(
 ):
     action = action_data.get("action")
     """Moderate a review"""
-    review = db.query(Review).filter(Review.id == UUID(review_id)).first()
+    # Row lock: concurrent moderation of one review must not count its rating twice
+    review = db.query(Review).filter(Review.id == UUID(review_id)).with_for_update().first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
+    was_public = review.is_public is True
     if action == "approve":
         review.is_public = True
         review.is_reported = False
@@ -124,7 +128,10 @@ async def moderate_review(
         review.is_abusive = False
         review.is_public = True
     
+    ratings.apply_visibility_change(db, review, was_public)
     db.commit()
+    # Vendor ratings are part of the cached vendor and store listings
+    reference_data.invalidate("vendors", "stores")
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -148,12 +155,15 @@ async def delete_review(
     db: Session = Depends(get_db)
 ):
     """Delete a review"""
-    review = db.query(Review).filter(Review.id == UUID(review_id)).first()
+    review = db.query(Review).filter(Review.id == UUID(review_id)).with_for_update().first()
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     
+    if review.is_public is True:
+        ratings.apply_review(db, review, -1)
     db.delete(review)
     db.commit()
+    reference_data.invalidate("vendors", "stores")
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -10,6 +10,9 @@ from uuid import UUID
 from app.core.database import get_db
 from app.models.platform_settings import PlatformSettings
 from app.api.v1.dependencies import get_current_admin
+from app.core.cache import all_cache_stats
+from app.core.refdata import platform_settings, reference_data
+from app.core.database import all_pool_status, replica_status
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -26,15 +29,13 @@ async def get_settings(
     db: Session = Depends(get_db)
 ):
     """Get platform settings by type"""
-    settings = db.query(PlatformSettings).filter(
-        PlatformSettings.setting_type == setting_type
-    ).first()
+    settings = platform_settings(db, setting_type)
     
     if settings:
         return {
-            "setting_type": settings.setting_type,
-            "settings": settings.settings_data,
-            "updated_at": settings.updated_at.isoformat() if settings.updated_at else None
+            "setting_type": setting_type,
+            "settings": settings["settings"],
+            "updated_at": settings["updated_at"].isoformat() if settings["updated_at"] else None
         }
     
     # Return default settings if not found
@@ -79,6 +80,7 @@ async def update_settings(
         db.add(settings)
     
     db.commit()
+    reference_data.invalidate("settings")
     db.refresh(settings)
     
     return {
@@ -115,6 +117,38 @@ async def get_all_settings(
     return result
 
 
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_admin: dict = Depends(get_current_admin)
+):
+    """Hit/miss counters for this worker's in-process caches (e.g. the authenticated-principal cache)"""
+    from app.services.promotion_index import promotion_index
+    from app.services.stock_reservations import reservation_index
+    return {
+        "caches": all_cache_stats(),
+        "reference_data": reference_data.stats(),
+        "promotion_index": promotion_index.stats(),
+        "stock_reservations": reservation_index.stats(),
+    }
+
+
+@router.get("/db/pool")
+async def get_pool_status(
+    current_admin: dict = Depends(get_current_admin)
+):
+    """Connection pool configuration and usage for this worker (size, checked out, overflow, pings)"""
+    from app.core.config import settings
+    return {
+        "pool_mode": settings.DB_POOL_MODE,
+        "pre_ping": settings.DB_PRE_PING,
+        "pgbouncer": settings.DB_PGBOUNCER,
+        "workers": settings.WEB_CONCURRENCY,
+        "max_connections_budget": settings.DB_MAX_CONNECTIONS,
+        "engines": all_pool_status(),
+        "replica": replica_status(),
+    }
+
+
 def get_default_settings(setting_type: str) -> dict:
     """Get default settings for a setting type"""
     defaults = {
@@ -7,7 +7,7 @@ from typing import List, Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.models.admin import AdminUser
-from app.api.v1.dependencies import get_current_admin
+from app.api.v1.dependencies import get_current_admin, invalidate_principal
 import bcrypt
 
 router = APIRouter()
@@ -110,6 +110,7 @@ async def update_admin_user(
         admin.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
     
     db.commit()
+    invalidate_principal("admin", admin.id)
     
     return {"message": "Admin user updated successfully"}
 
@@ -131,6 +132,7 @@ async def toggle_admin_active(
     
     admin.is_active = not admin.is_active
     db.commit()
+    invalidate_principal("admin", admin.id)
     
     return {"message": f"Admin user {'activated' if admin.is_active else 'deactivated'} successfully"}
 
@@ -152,6 +154,7 @@ async def delete_admin_user(
     
     db.delete(admin)
     db.commit()
+    invalidate_principal("admin", admin_id)
     
     return {"message": "Admin user deleted successfully"}
 
@@ -14,7 +14,8 @@ from app.models.product import Product
 # Import Order after Vendor to ensure relationship works
 from app.models.order import Order
 from app.models.payout import Payout
-from app.api.v1.dependencies import get_current_admin
+from app.api.v1.dependencies import get_current_admin, invalidate_principal
+from app.core.refdata import reference_data
 from app.schemas.vendor import VendorResponse
 
 router = APIRouter()
@@ -208,6 +209,8 @@ async def activate_vendor(
     
     vendor.status = "active"
     db.commit()
+    invalidate_principal("vendor", vendor.id)
+    reference_data.invalidate("vendors", "stores")
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -249,6 +252,8 @@ async def deactivate_vendor(
     
     vendor.status = "inactive"
     db.commit()
+    invalidate_principal("vendor", vendor.id)
+    reference_data.invalidate("vendors", "stores")
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -291,6 +296,8 @@ async def verify_vendor(
     vendor.verification_status = "verified"
     vendor.verified_at = datetime.utcnow()
     db.commit()
+    invalidate_principal("vendor", vendor.id)
+    reference_data.invalidate("vendors", "stores")
     
     # Log activity
     from app.models.admin import AdminActivityLog
@@ -422,6 +429,7 @@ async def update_vendor(
             setattr(vendor, field, value)
     
     db.commit()
+    reference_data.invalidate("vendors", "stores")
     
     # Log activity
     from app.models.admin import AdminActivityLog
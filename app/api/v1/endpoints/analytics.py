@@ -7,7 +7,7 @@ from sqlalchemy import func, and_, case, extract
 from typing import Optional, List
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 from app.schemas.dashboard import SalesReport, TopProduct
@@ -21,7 +21,7 @@ async def get_sales_report(
     start_date: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get detailed sales report for a date range"""
     from uuid import UUID
@@ -91,7 +91,7 @@ async def get_sales_trends(
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
     group_by: str = Query("day", description="Group by: day, week, month"),
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get sales trends over time"""
     from uuid import UUID
@@ -192,7 +192,7 @@ async def get_revenue_breakdown(
     start_date: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get revenue breakdown by category"""
     from uuid import UUID
@@ -239,7 +239,7 @@ async def get_product_performance(
     end_date: Optional[date] = None,
     limit: int = 20,
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get product performance analytics"""
     from uuid import UUID
@@ -291,7 +291,7 @@ async def get_fulfillment_metrics(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get order fulfillment metrics"""
     from uuid import UUID
@@ -342,7 +342,7 @@ async def get_period_comparison(
     period2_start: date = Query(..., description="Period 2 start date"),
     period2_end: date = Query(..., description="Period 2 end date"),
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Compare two time periods"""
     from uuid import UUID
@@ -3,11 +3,13 @@ Barcode management endpoints for admin and vendor
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.models.product import Product
 from app.api.v1.dependencies import get_current_admin, get_current_vendor
+from app.services import product_search
 import uuid
 
 router = APIRouter()
@@ -155,6 +157,7 @@ async def search_by_barcode(
     Search products by barcode (partial match)
     Admin can see all products, vendors can only see their own
     """
+    # Served by the barcode trigram index (migrations/add_product_search.sql)
     query = db.query(Product).filter(Product.barcode.ilike(f"%{barcode}%"))
     
     # If vendor, filter by vendor_id
@@ -162,6 +165,10 @@ async def search_by_barcode(
         vendor_id = UUID(current_vendor.get("vendor_id"))
         query = query.filter(Product.vendor_id == vendor_id)
     
+    if product_search.fulltext_enabled():
+        # Closest barcodes first (exact and long partial matches before short fragments)
+        query = query.order_by(func.similarity(Product.barcode, barcode).desc())
+    
     products = query.limit(50).all()
     
     return [
@@ -8,8 +8,9 @@ from typing import List, Optional
 from datetime import datetime, date
 from app.core.database import get_db
 from app.models.order import Order, OrderItem, OrderStatusHistory
-from app.schemas.order import OrderResponse, OrderUpdate, OrderListResponse
+from app.schemas.order import OrderResponse, OrderUpdate, OrderListResponse, BulkStatusUpdate, BulkStatusResponse
 from app.api.v1.dependencies import get_current_chef
+from app.services import order_transitions
 
 router = APIRouter()
 
@@ -57,6 +58,30 @@ async def get_chef_orders(
     return orders_list
 
 
+@router.post("/bulk-status", response_model=BulkStatusResponse)
+async def bulk_update_chef_order_status(
+    body: BulkStatusUpdate,
+    current_chef: dict = Depends(get_current_chef),
+    db: Session = Depends(get_db)
+):
+    """Move several orders to one status (accepted, ready or cancelled); skipped orders are reported per order."""
+    from uuid import UUID
+
+    if body.status not in order_transitions.CHEF_TRANSITIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported status. Use one of: {', '.join(order_transitions.CHEF_TRANSITIONS)}"
+        )
+    return order_transitions.apply(
+        db,
+        Order.chef_id == UUID(current_chef["chef_id"]),
+        body.order_ids,
+        body.status,
+        order_transitions.CHEF_TRANSITIONS,
+        cancellation_reason=body.cancellation_reason,
+    )
+
+
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_chef_order(
     order_id: str,
@@ -1,33 +1,95 @@
 """
 Customer cart and checkout endpoints
+
+Checkout is one transaction for the whole cart. The cart's products are loaded and locked in one
+`SELECT ... WHERE id = ANY(...) ORDER BY id FOR UPDATE`: concurrent checkouts lock shared products
+in the same order, so they queue instead of deadlocking, and each sees the stock the other left.
+Units other customers hold while paying (app/services/stock_reservations.py) are not available;
+the customer's own holds are consumed with the order.
+Stock is then taken with one conditional UPDATE (stock_quantity >= quantity) for all products, and
+orders, items and coupon usages are inserted in bulk. Either every order is created or none is.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import Integer, column, func, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from app.core.database import get_db
+from typing import Optional
+from uuid import UUID
+from app.core.database import get_async_db
+from app.models.chef import Chef
+from app.models.cuisine import Cuisine
+from app.models.customer import CustomerAddress
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 from app.models.vendor import Vendor
 from app.models.coupon import Coupon, CouponUsage
 from app.api.v1.dependencies import get_current_customer
+from app.services import idempotency, stock_reservations
 from decimal import Decimal
 import uuid
 
 router = APIRouter()
 
 
+def _order_number() -> str:
+    return f"EZF-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
+
+
+def _coupon_discount(coupon, vendor_id: str, subtotal: Decimal, delivery_method: str) -> Decimal:
+    """Discount `coupon` gives on a vendor order of `subtotal`"""
+    # Check if coupon applies to this vendor/order
+    if coupon.applicable_to == "specific_vendors" and coupon.vendor_ids and str(vendor_id) not in coupon.vendor_ids:
+        return Decimal("0.00")
+    if coupon.discount_type == "percentage":
+        discount = subtotal * (Decimal(str(coupon.discount_value)) / Decimal("100"))
+        if coupon.max_discount_amount:
+            discount = min(discount, Decimal(str(coupon.max_discount_amount)))
+        return discount
+    if coupon.discount_type == "fixed_amount":
+        return min(Decimal(str(coupon.discount_value)), subtotal)
+    if coupon.discount_type == "free_shipping" and delivery_method == "delivery":
+        return Decimal("5.00")  # Free shipping discount
+    return Decimal("0.00")
+
+
+async def _take_stock(db: AsyncSession, quantities: dict) -> int:
+    """
+    Decrement every product's stock by its quantity in one UPDATE ... FROM (VALUES ...), only where
+    enough is left. Returns the number of products updated.
+    """
+    cart = values(
+        column("id", PGUUID(as_uuid=True)), column("quantity", Integer), name="cart"
+    ).data(list(quantities.items()))
+    updated = await db.scalars(
+        update(Product)
+        .where(Product.id == cart.c.id, Product.stock_quantity >= cart.c.quantity)
+        .values(stock_quantity=Product.stock_quantity - cart.c.quantity)
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    return len(updated.all())
+
+
 @router.post("/checkout", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: dict,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_customer: dict = Depends(get_current_customer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Create orders from cart items (vendor products and/or chef cuisines)."""
-    from uuid import UUID
-    from app.models.cuisine import Cuisine
-    from app.models.chef import Chef
+    """
+    Create orders from cart items (vendor products and/or chef cuisines).
+    With an Idempotency-Key header, a retried request returns the orders of the first one.
+    """
+    return await idempotency.run(
+        "checkout", current_customer["customer_id"], idempotency_key, order_data,
+        lambda: _place_orders(order_data, current_customer, db), response
+    )
+
 
+async def _place_orders(order_data: dict, current_customer: dict, db: AsyncSession) -> dict:
     customer_id = UUID(current_customer["customer_id"])
     items = order_data.get("items", [])
     delivery_method = order_data.get("delivery_method", "delivery")
@@ -38,9 +100,21 @@ async def create_order(
     if not items:
         raise HTTPException(status_code=400, detail="Cart is empty")
 
+    # Split items: product (vendor) vs cuisine (chef)
+    product_lines = []
+    for item in items:
+        if item.get("product_id"):
+            quantity = int(item.get("quantity", 1))
+            if quantity < 1:
+                raise HTTPException(status_code=400, detail=f"Invalid quantity for product {item['product_id']}")
+            product_lines.append((UUID(item["product_id"]), quantity))
+    cuisine_lines = [
+        (UUID(i["chef_id"]), UUID(i["cuisine_id"]), int(i.get("quantity", 1)))
+        for i in items if i.get("chef_id") and i.get("cuisine_id") and int(i.get("quantity", 1)) >= 1
+    ]
+
     # Create delivery address if delivery method is delivery and address is provided
     if delivery_method == "delivery" and address_data and not delivery_address_id:
-        from app.models.customer import CustomerAddress
         delivery_address = CustomerAddress(
             customer_id=customer_id,
             street_address=address_data.get("street_address", ""),
@@ -53,13 +127,31 @@ async def create_order(
             longitude=address_data.get("longitude")
         )
         db.add(delivery_address)
-        db.flush()
+        await db.flush()
         delivery_address_id = str(delivery_address.id)
 
-    # Validate and apply coupon if provided
+    # Total quantity per product (a product may be on several lines)
+    quantities = {}
+    for product_id, quantity in product_lines:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+    # Products first (locked, in id order), then the coupon: every checkout takes locks in that order
+    products = await stock_reservations.lock_products(db, list(quantities)) if quantities else {}
+    for product_id in quantities:
+        if product_id not in products:
+            raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
+    # Units other customers hold while paying are not available; this customer's own holds are
+    try:
+        await stock_reservations.check_available(db, products, quantities, customer_id)
+    except stock_reservations.InsufficientStock as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Validate and apply coupon if provided (locked: usage_limit holds under concurrent checkouts)
     coupon = None
     if coupon_code:
-        coupon = db.query(Coupon).filter(Coupon.code == coupon_code.upper().strip()).first()
+        coupon = (await db.scalars(
+            select(Coupon).where(Coupon.code == coupon_code.upper().strip()).with_for_update()
+        )).first()
         if coupon:
             now = datetime.utcnow()
             if not (coupon.is_active and coupon.approval_status == "approved" and
@@ -67,81 +159,77 @@ async def create_order(
                     (not coupon.usage_limit or coupon.usage_count < coupon.usage_limit)):
                 coupon = None
 
-    # Split items: product (vendor) vs cuisine (chef)
-    product_items = [i for i in items if i.get("product_id")]
-    cuisine_items = [i for i in items if i.get("chef_id") and i.get("cuisine_id")]
-
-    # Group product items by vendor
+    # Group product lines by vendor
     vendor_orders = {}
-    for item in product_items:
-        product_id = UUID(item["product_id"])
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Product {item['product_id']} not found")
-        if product.stock_quantity < item["quantity"]:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient stock for {product.name}. Available: {product.stock_quantity}"
-            )
-        vendor_id = str(product.vendor_id)
-        if vendor_id not in vendor_orders:
-            vendor_orders[vendor_id] = {
-                "vendor": db.query(Vendor).filter(Vendor.id == product.vendor_id).first(),
-                "items": []
-            }
-        vendor_orders[vendor_id]["items"].append({"product": product, "quantity": item["quantity"]})
+    for product_id, quantity in product_lines:
+        product = products[product_id]
+        vendor_orders.setdefault(str(product.vendor_id), []).append({"product": product, "quantity": quantity})
+    vendors = {}
+    if vendor_orders:
+        vendor_ids = [UUID(vendor_id) for vendor_id in vendor_orders]
+        vendors = {str(v.id): v for v in (await db.scalars(select(Vendor).where(Vendor.id.in_(vendor_ids)))).all()}
 
-    # Group cuisine items by chef
+    # Group cuisine lines by chef
+    cuisines, chefs = {}, {}
+    if cuisine_lines:
+        cuisine_ids = list({cuisine_id for _, cuisine_id, _ in cuisine_lines})
+        chef_ids = list({chef_id for chef_id, _, _ in cuisine_lines})
+        cuisines = {c.id: c for c in (await db.scalars(select(Cuisine).where(Cuisine.id.in_(cuisine_ids)))).all()}
+        chefs = {c.id: c for c in (await db.scalars(select(Chef).where(Chef.id.in_(chef_ids)))).all()}
     chef_orders = {}
-    for item in cuisine_items:
-        chef_id = UUID(item["chef_id"])
-        cuisine_id = UUID(item["cuisine_id"])
-        quantity = int(item.get("quantity", 1))
-        if quantity < 1:
-            continue
-        cuisine = db.query(Cuisine).filter(Cuisine.id == cuisine_id, Cuisine.chef_id == chef_id).first()
-        if not cuisine:
-            raise HTTPException(status_code=404, detail=f"Cuisine {item['cuisine_id']} not found for chef")
-        chef = db.query(Chef).filter(Chef.id == chef_id).first()
+    for chef_id, cuisine_id, quantity in cuisine_lines:
+        cuisine = cuisines.get(cuisine_id)
+        if not cuisine or cuisine.chef_id != chef_id:
+            raise HTTPException(status_code=404, detail=f"Cuisine {cuisine_id} not found for chef")
+        chef = chefs.get(chef_id)
         if not chef or not chef.is_active:
             raise HTTPException(status_code=400, detail="Chef is not available")
-        chef_id_str = str(chef_id)
-        if chef_id_str not in chef_orders:
-            chef_orders[chef_id_str] = {"chef": chef, "items": []}
-        chef_orders[chef_id_str]["items"].append({"cuisine": cuisine, "quantity": quantity})
+        chef_orders.setdefault(chef_id, []).append({"cuisine": cuisine, "quantity": quantity})
+
+    # Payment: Stripe or Helcim
+    helcim_transaction_id = order_data.get("helcim_transaction_id")
+    stripe_payment_intent_id = order_data.get("stripe_payment_intent_id")
+    payment_method = order_data.get("payment_method", "stripe" if stripe_payment_intent_id else "helcim" if helcim_transaction_id else "cash")
+    # When an order comes in from checkout, show as paid in vendor portal
+    payment_status = "paid"
+    shipping = Decimal("5.00") if delivery_method == "delivery" else Decimal("0.00")
 
-    created_orders = []
+    order_rows, item_rows, usage_rows, created_orders = [], [], [], []
 
-    # Create orders for each vendor
-    created_orders = []
-    for vendor_id, vendor_data in vendor_orders.items():
-        vendor = vendor_data["vendor"]
+    def add_order(lines: list, vendor_id=None, chef_id=None, **amounts) -> dict:
+        row = {
+            "id": uuid.uuid4(),
+            "order_number": _order_number(),
+            "vendor_id": vendor_id,
+            "chef_id": chef_id,
+            "store_id": None,
+            "customer_id": customer_id,
+            "status": "new",
+            "delivery_method": delivery_method,
+            "delivery_address_id": UUID(delivery_address_id) if delivery_address_id else None,
+            "gross_sales": amounts["subtotal"],
+            "payment_status": payment_status,
+            "payment_method": payment_method,
+            "helcim_transaction_id": helcim_transaction_id,
+            "stripe_payment_intent_id": stripe_payment_intent_id,
+            **amounts,
+        }
+        order_rows.append(row)
+        item_rows.extend(dict(line, order_id=row["id"]) for line in lines)
+        return row
+
+    # One order per vendor
+    for vendor_id, vendor_items in vendor_orders.items():
+        vendor = vendors[vendor_id]
         
         # Calculate totals
-        subtotal = sum(item["product"].price * item["quantity"] for item in vendor_data["items"])
+        subtotal = sum(item["product"].price * item["quantity"] for item in vendor_items)
         
         # Apply coupon discount if applicable
-        vendor_discount = Decimal("0.00")
-        if coupon:
-            # Check if coupon applies to this vendor/order
-            applicable = True
-            if coupon.applicable_to == "specific_vendors" and coupon.vendor_ids:
-                if str(vendor_id) not in coupon.vendor_ids:
-                    applicable = False
-            
-            if applicable:
-                if coupon.discount_type == "percentage":
-                    discount = subtotal * (Decimal(str(coupon.discount_value)) / Decimal("100"))
-                    if coupon.max_discount_amount:
-                        discount = min(discount, Decimal(str(coupon.max_discount_amount)))
-                    vendor_discount = discount
-                elif coupon.discount_type == "fixed_amount":
-                    vendor_discount = min(Decimal(str(coupon.discount_value)), subtotal)
-                elif coupon.discount_type == "free_shipping" and delivery_method == "delivery":
-                    vendor_discount = Decimal("5.00")  # Free shipping discount
+        vendor_discount = _coupon_discount(coupon, vendor_id, subtotal, delivery_method) if coupon else Decimal("0.00")
         
         tax_amount = (subtotal - vendor_discount) * Decimal("0.08")  # 8% tax on discounted amount
-        shipping_amount = Decimal("5.00") if delivery_method == "delivery" else Decimal("0.00")
+        shipping_amount = shipping
         
         # Apply free shipping discount
         if coupon and coupon.discount_type == "free_shipping" and delivery_method == "delivery":
@@ -155,152 +243,111 @@ async def create_order(
         else:
             commission_rate = Decimal("10.00")  # Default commission rate
         commission_amount = subtotal * (commission_rate / Decimal("100"))
-        net_payout = subtotal - commission_amount
         
-        # Generate order number
-        order_number = f"EZF-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
-        
-        # Payment: Stripe or Helcim
-        helcim_transaction_id = order_data.get("helcim_transaction_id")
-        stripe_payment_intent_id = order_data.get("stripe_payment_intent_id")
-        payment_method = order_data.get("payment_method", "stripe" if stripe_payment_intent_id else "helcim" if helcim_transaction_id else "cash")
-        is_paid = bool(helcim_transaction_id or stripe_payment_intent_id)
-        # When an order comes in from checkout, show as paid in vendor portal
-        payment_status = "paid"
-
-        order = Order(
-            order_number=order_number,
+        order = add_order(
+            [
+                {
+                    "product_id": item["product"].id,
+                    "cuisine_id": None,
+                    "product_name": item["product"].name,
+                    "product_price": item["product"].price,
+                    "quantity": item["quantity"],
+                    "subtotal": item["product"].price * item["quantity"],
+                }
+                for item in vendor_items
+            ],
             vendor_id=UUID(vendor_id),
-            customer_id=customer_id,
-            status="new",
-            delivery_method=delivery_method,
-            delivery_address_id=UUID(delivery_address_id) if delivery_address_id else None,
             subtotal=subtotal,
             tax_amount=tax_amount,
             shipping_amount=shipping_amount,
             discount_amount=vendor_discount,
             total_amount=total_amount,
-            gross_sales=subtotal,
             commission_rate=commission_rate,
             commission_amount=commission_amount,
-            net_payout=net_payout,
-            payment_status=payment_status,
-            payment_method=payment_method,
-            helcim_transaction_id=helcim_transaction_id,
-            stripe_payment_intent_id=stripe_payment_intent_id
+            net_payout=subtotal - commission_amount,
         )
         
-        db.add(order)
-        db.flush()
-        
-        # Create order items
-        for item_data in vendor_data["items"]:
-            product = item_data["product"]
-            quantity = item_data["quantity"]
-            
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=product.id,
-                product_name=product.name,
-                product_price=product.price,
-                quantity=quantity,
-                subtotal=product.price * quantity
-            )
-            db.add(order_item)
-            
-            # Update product stock
-            product.stock_quantity -= quantity
-        
         # Record coupon usage if coupon was applied
         if coupon and vendor_discount > 0:
-            coupon_usage = CouponUsage(
-                coupon_id=coupon.id,
-                order_id=order.id,
-                customer_id=customer_id,
-                discount_amount=vendor_discount,
-                order_total=total_amount
-            )
-            db.add(coupon_usage)
-            coupon.usage_count += 1
-        
-        db.commit()
-        db.refresh(order)
+            usage_rows.append({
+                "coupon_id": coupon.id,
+                "order_id": order["id"],
+                "customer_id": customer_id,
+                "discount_amount": vendor_discount,
+                "order_total": total_amount,
+            })
         
         created_orders.append({
-            "order_id": str(order.id),
-            "order_number": order.order_number,
+            "order_id": str(order["id"]),
+            "order_number": order["order_number"],
             "vendor_name": vendor.business_name,
             "chef_name": None,
             "total": float(total_amount)
         })
 
-    # Create orders for each chef (cuisine orders)
-    for chef_id_str, chef_data in chef_orders.items():
-        chef = chef_data["chef"]
-        subtotal = sum(item["cuisine"].price * item["quantity"] for item in chef_data["items"])
+    # One order per chef (cuisine orders)
+    for chef_id, chef_items in chef_orders.items():
+        chef = chefs[chef_id]
+        subtotal = sum(item["cuisine"].price * item["quantity"] for item in chef_items)
         tax_amount = subtotal * Decimal("0.08")
-        shipping_amount = Decimal("5.00") if delivery_method == "delivery" else Decimal("0.00")
-        total_amount = subtotal + tax_amount + shipping_amount
-        commission_rate = Decimal("0.00")
-        commission_amount = Decimal("0.00")
-        net_payout = subtotal
-        order_number = f"EZF-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
-        helcim_transaction_id = order_data.get("helcim_transaction_id")
-        stripe_payment_intent_id = order_data.get("stripe_payment_intent_id")
-        payment_method = order_data.get("payment_method", "stripe" if stripe_payment_intent_id else "helcim" if helcim_transaction_id else "cash")
-        payment_status = "paid"
-
-        order = Order(
-            order_number=order_number,
-            vendor_id=None,
-            chef_id=UUID(chef_id_str),
-            store_id=None,
-            customer_id=customer_id,
-            status="new",
-            delivery_method=delivery_method,
-            delivery_address_id=UUID(delivery_address_id) if delivery_address_id else None,
+        total_amount = subtotal + tax_amount + shipping
+        order = add_order(
+            [
+                {
+                    "product_id": None,
+                    "cuisine_id": item["cuisine"].id,
+                    "product_name": item["cuisine"].name,
+                    "product_price": item["cuisine"].price,
+                    "quantity": item["quantity"],
+                    "subtotal": item["cuisine"].price * item["quantity"],
+                }
+                for item in chef_items
+            ],
+            chef_id=chef_id,
             subtotal=subtotal,
             tax_amount=tax_amount,
-            shipping_amount=shipping_amount,
+            shipping_amount=shipping,
             discount_amount=Decimal("0.00"),
             total_amount=total_amount,
-            gross_sales=subtotal,
-            commission_rate=commission_rate,
-            commission_amount=commission_amount,
-            net_payout=net_payout,
-            payment_status=payment_status,
-            payment_method=payment_method,
-            helcim_transaction_id=helcim_transaction_id,
-            stripe_payment_intent_id=stripe_payment_intent_id
+            commission_rate=Decimal("0.00"),
+            commission_amount=Decimal("0.00"),
+            net_payout=subtotal,
         )
-        db.add(order)
-        db.flush()
-        for item_data in chef_data["items"]:
-            cuisine = item_data["cuisine"]
-            qty = item_data["quantity"]
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=None,
-                cuisine_id=cuisine.id,
-                product_name=cuisine.name,
-                product_price=cuisine.price,
-                quantity=qty,
-                subtotal=cuisine.price * qty
-            )
-            db.add(order_item)
-        db.commit()
-        db.refresh(order)
         chef_display_name = chef.chef_name or f"{chef.first_name} {chef.last_name}"
         created_orders.append({
-            "order_id": str(order.id),
-            "order_number": order.order_number,
+            "order_id": str(order["id"]),
+            "order_number": order["order_number"],
             "vendor_name": None,
             "chef_name": chef_display_name,
             "total": float(total_amount)
         })
 
-    return {
+    # Stock: the rows are locked, so this only falls short if a product changed outside checkout
+    if quantities and await _take_stock(db, quantities) != len(quantities):
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Stock changed during checkout, please try again")
+    if quantities:
+        await stock_reservations.consume(db, customer_id, list(quantities))
+
+    if order_rows:
+        await db.execute(insert(Order), order_rows)
+        await db.execute(insert(OrderItem), item_rows)
+    if usage_rows:
+        await db.execute(insert(CouponUsage), usage_rows)
+        await db.execute(
+            update(Coupon)
+            .where(Coupon.id == coupon.id)
+            .values(usage_count=func.coalesce(Coupon.usage_count, 0) + len(usage_rows))
+            .execution_options(synchronize_session=False)
+        )
+    result = {
         "message": "Orders created successfully",
         "orders": created_orders
     }
+    # With an Idempotency-Key, the key is completed in this transaction: a retry can't place them again
+    await idempotency.record(db, result)
+    await db.commit()
+    if quantities:
+        stock_reservations.reservation_index.invalidate()
 
+    return result
@@ -1,7 +1,7 @@
 """
 Customer chat endpoints - chat with admin
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from typing import List, Optional
@@ -10,6 +10,7 @@ from uuid import UUID
 from app.core.database import get_db
 from app.models.chat import ChatMessage
 from app.api.v1.dependencies import get_current_customer
+from app.api.v1.pagination import keyset, page, set_page_headers
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -78,8 +79,10 @@ async def send_message(
 
 @router.get("/messages", response_model=List[ChatMessageResponse])
 async def get_messages(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
     current_customer: dict = Depends(get_current_customer),
     db: Session = Depends(get_db)
 ):
@@ -87,7 +90,7 @@ async def get_messages(
     customer_id = UUID(current_customer["customer_id"])
     
     # Get messages where customer is sender or recipient
-    messages = db.query(ChatMessage).filter(
+    query = db.query(ChatMessage).filter(
         or_(
             and_(
                 ChatMessage.sender_type == "customer",
@@ -100,7 +103,11 @@ async def get_messages(
                 ChatMessage.sender_type == "admin"
             )
         )
-    ).order_by(ChatMessage.created_at.asc()).offset(skip).limit(limit).all()
+    )
+    messages, next_cursor = page(
+        keyset(query, ChatMessage.created_at, ChatMessage.id, cursor, limit, skip, descending=False).all(), limit
+    )
+    set_page_headers(response, next_cursor)
     
     # Mark messages as read
     for msg in messages:
@@ -8,6 +8,7 @@ from app.core.database import get_db
 from app.models.chef import Chef
 from app.schemas.chef import ChefResponse
 from sqlalchemy import func, or_
+from app.core import geo
 from uuid import UUID
 
 router = APIRouter()
@@ -19,11 +20,18 @@ async def get_chefs(
     cuisine: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     min_rating: Optional[float] = Query(None),
+    latitude: Optional[float] = Query(None),
+    longitude: Optional[float] = Query(None),
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers (default: as far as each chef travels)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
-    """Get verified chefs for customers to browse"""
+    """
+    Get verified chefs for customers to browse.
+    With latitude and longitude: only chefs whose service radius reaches the customer (and within
+    radius_km, if given), nearest first; otherwise by rating.
+    """
     query = db.query(Chef).filter(
         Chef.verification_status == "verified",
         Chef.is_active == True,
@@ -53,13 +61,26 @@ async def get_chefs(
     if min_rating:
         query = query.filter(Chef.average_rating >= min_rating)
     
-    total = query.count()
-    chefs = query.order_by(Chef.average_rating.desc(), Chef.total_reviews.desc()).offset(skip).limit(limit).all()
+    if latitude is not None and longitude is not None:
+        distance = geo.distance_km(Chef, latitude, longitude)
+        query = query.filter(
+            geo.within(Chef, latitude, longitude, radius_km or geo.MAX_RADIUS_KM),
+            distance <= func.coalesce(Chef.service_radius_km, 10.0)
+        )
+        total = query.count()
+        chefs = query.add_columns(distance).order_by(
+            geo.nearest(Chef, latitude, longitude), Chef.average_rating.desc()
+        ).offset(skip).limit(limit).all()
+    else:
+        total = query.count()
+        chefs = [(c, None) for c in query.order_by(
+            Chef.average_rating.desc(), Chef.total_reviews.desc()
+        ).offset(skip).limit(limit).all()]
     
     # Get featured cuisine for each chef
     from app.models.cuisine import Cuisine
     chef_list = []
-    for c in chefs:
+    for c, distance_km in chefs:
         # Get featured cuisine or first active cuisine
         featured_cuisine = db.query(Cuisine).filter(
             Cuisine.chef_id == c.id,
@@ -80,6 +101,7 @@ async def get_chefs(
             "average_rating": float(c.average_rating) if c.average_rating else None,
             "total_reviews": c.total_reviews,
             "service_radius_km": float(c.service_radius_km) if c.service_radius_km else None,
+            "distance_km": round(distance_km, 2) if distance_km is not None else None,
             "minimum_order_amount": float(c.minimum_order_amount) if c.minimum_order_amount else None,
             "gallery_images": c.gallery_images or [],
             "social_media_links": c.social_media_links
@@ -1,30 +1,37 @@
 """
 Customer order endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.models.order import Order, OrderItem
 from app.models.customer import Customer
 from app.models.product import Product
 from app.api.v1.dependencies import get_current_customer
-from app.schemas.order import OrderResponse, OrderItemResponse
+from app.api.v1.pagination import keyset, page, capped_count, set_page_headers
+from app.schemas.order import OrderResponse, OrderItemResponse, CustomerOrderOut
 
 router = APIRouter(redirect_slashes=False)
 
 
-@router.get("/")
-@router.get("")  # Also accept without trailing slash
+@router.get("/", response_model=List[CustomerOrderOut])
+@router.get("", response_model=List[CustomerOrderOut])  # Also accept without trailing slash
 async def get_customer_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Send X-Total-Count (capped)"),
     current_customer: dict = Depends(get_current_customer),
     db: Session = Depends(get_db)
 ):
-    """Get all orders for current customer. Returns JSON-safe list (no response_model to avoid serialization 500)."""
+    """
+    Get all orders for current customer. ORM orders go straight to CustomerOrderOut (from_attributes),
+    validated and encoded by pydantic-core instead of dicts built field by field.
+    """
     from uuid import UUID
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy.orm import joinedload, selectinload
 
     try:
         # Use the same customer record as auth (by id from JWT) so filter matches orders created at checkout
@@ -39,89 +46,17 @@ async def get_customer_orders(
         if not customer:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Customer not found")
 
-        orders = (
-            db.query(Order)
-            .options(joinedload(Order.items))
-            .filter(Order.customer_id == customer.id)
-            .order_by(Order.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = db.query(Order).filter(Order.customer_id == customer.id)
+        # Items joined, the delivery (Order.delivery) in one extra IN query for the page
+        orders, next_cursor = page(
+            keyset(
+                query.options(joinedload(Order.items), selectinload(Order.delivery)),
+                Order.created_at, Order.id, cursor, limit, skip,
+            ).all(),
+            limit,
         )
-
-        # Get delivery info for all orders (optional - delivery may not exist for all orders)
-        deliveries = {}
-        try:
-            from app.models.driver import Delivery, Driver
-            if orders:
-                order_ids = [order.id for order in orders]
-                delivery_list = db.query(Delivery).filter(Delivery.order_id.in_(order_ids)).all()
-                for delivery in delivery_list:
-                    deliveries[str(delivery.order_id)] = delivery
-        except Exception as e:
-            print(f"[customer_orders] Warning: could not load deliveries: {e}")
-
-        orders_list = []
-        for order in orders:
-            delivery = deliveries.get(str(order.id))
-            delivery_info = None
-            if delivery:
-                delivery_info = {
-                    "id": str(delivery.id),
-                    "driver_id": str(delivery.driver_id) if getattr(delivery, "driver_id", None) else None,
-                    "status": getattr(delivery, "status", None),
-                    "current_eta_minutes": getattr(delivery, "current_eta_minutes", None),
-                }
-
-            created_at = getattr(order, "created_at", None)
-            updated_at = getattr(order, "updated_at", None) or created_at
-
-            # Safely build items list - handle None or missing items
-            order_items = getattr(order, "items", None) or []
-
-            order_dict = {
-                "id": str(order.id),
-                "order_number": getattr(order, "order_number", "") or "",
-                "customer_id": str(order.customer_id) if getattr(order, "customer_id", None) else None,
-                "chef_id": str(order.chef_id) if getattr(order, "chef_id", None) else None,
-                "vendor_id": str(order.vendor_id) if getattr(order, "vendor_id", None) else None,
-                "status": getattr(order, "status", None) or "new",
-                "delivery_status": delivery_info.get("status") if delivery_info else None,
-                "delivery_method": getattr(order, "delivery_method", None) or "delivery",
-                "subtotal": _decimal_to_float(getattr(order, "subtotal", None)),
-                "tax_amount": _decimal_to_float(getattr(order, "tax_amount", None)),
-                "shipping_amount": _decimal_to_float(getattr(order, "shipping_amount", None)),
-                "discount_amount": _decimal_to_float(getattr(order, "discount_amount", None)),
-                "total_amount": _decimal_to_float(getattr(order, "total_amount", None)),
-                "gross_sales": _decimal_to_float(getattr(order, "gross_sales", None)),
-                "commission_rate": _decimal_to_float(getattr(order, "commission_rate", None)),
-                "commission_amount": _decimal_to_float(getattr(order, "commission_amount", None)),
-                "net_payout": _decimal_to_float(getattr(order, "net_payout", None)),
-                "payment_status": getattr(order, "payment_status", None) or "pending",
-                "special_instructions": getattr(order, "special_instructions", None),
-                "customer_notes": getattr(order, "customer_notes", None),
-                "created_at": created_at.isoformat() if created_at and hasattr(created_at, "isoformat") else str(created_at or ""),
-                "updated_at": updated_at.isoformat() if updated_at and hasattr(updated_at, "isoformat") else str(updated_at or ""),
-                "delivery": delivery_info,
-                "items": [
-                    {
-                        "id": str(item.id),
-                        "product_id": str(item.product_id) if getattr(item, "product_id", None) else None,
-                        "cuisine_id": str(item.cuisine_id) if getattr(item, "cuisine_id", None) else None,
-                        "product_name": getattr(item, "product_name", "") or "",
-                        "product_price": _decimal_to_float(getattr(item, "product_price", None)),
-                        "quantity": getattr(item, "quantity", 0) or 0,
-                        "subtotal": _decimal_to_float(getattr(item, "subtotal", None)),
-                        "is_substituted": getattr(item, "is_substituted", False),
-                        "is_out_of_stock": getattr(item, "is_out_of_stock", False),
-                        "quantity_fulfilled": getattr(item, "quantity_fulfilled", 0),
-                    }
-                    for item in order_items
-                ],
-            }
-            orders_list.append(order_dict)
-
-        return orders_list
+        set_page_headers(response, next_cursor, db.scalar(capped_count(query)) if include_total else None)
+        return orders
     except HTTPException:
         raise
     except Exception as e:
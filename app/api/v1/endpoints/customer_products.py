@@ -2,27 +2,109 @@
 Customer-facing product endpoints
 """
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from app.core.database import get_db
+from app.core.database import get_async_read_db
 from app.core.config import resolve_upload_url, resolve_upload_urls
 # Import Vendor FIRST to ensure it's available when Product relationships are initialized
 from app.models.vendor import Vendor
 from app.models.product import Product, Category
 from app.models.store import Store
-from sqlalchemy import or_, and_, func, text, distinct
+from app.api.v1.pagination import keyset, page, capped_count, total_fields
+from app.services import product_search
+from app.services.promotion_index import promotion_index
+from app.services.stock_reservations import reservation_index
+from sqlalchemy import or_, and_, func, text, distinct, select, case, tuple_
+from app.core.cache import TTLCache
+from app.core.refdata import reference_data
+from app.core.config import settings
+from datetime import datetime
 
 router = APIRouter()
 
+FACETS = ("category", "vendor", "price", "on_sale")
+PRICE_BUCKETS = [(0, 5), (5, 10), (10, 20), (20, 50), (50, None)]
+
+# Facet counts per filter combination: shoppers re-run the same filters while paging and sorting
+facet_cache = TTLCache(
+    "product_facets",
+    max_entries=settings.PRODUCT_FACETS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRODUCT_FACETS_CACHE_TTL_SECONDS,
+)
+
+
+def _rounded_rating(product: Product):
+    """Average of public reviews to 1 decimal place (e.g. 3.5, 4.2), None before the first review."""
+    # Denormalized on the product (app/services/ratings.py): no per-page aggregate over reviews
+    return round(float(product.average_rating), 1) if product.rating_count else None
+
+
+def _price_bucket_label(low, high) -> str:
+    return f"{low}-{high}" if high is not None else f"{low}+"
+
+
+def _facet_statement(query, requested: list, on_sale):
+    """
+    One grouped pass over the filtered products: GROUPING SETS gives each requested facet its own
+    group-by, and GROUPING(col) = 0 marks which facet a result row belongs to. `on_sale` is the
+    active-promotion index's on_sale_clause().
+    """
+    columns = {
+        "category": [Product.category_id.label("category_id"), Category.name.label("category_name")],
+        "vendor": [Product.vendor_id.label("vendor_id"), Vendor.business_name.label("vendor_name")],
+        "price": [case(
+            *[(Product.price < high, _price_bucket_label(low, high)) for low, high in PRICE_BUCKETS if high is not None],
+            else_=_price_bucket_label(*PRICE_BUCKETS[-1])
+        ).label("price_bucket")],
+        "on_sale": [on_sale.label("on_sale")],
+    }
+    if "category" in requested:
+        query = query.outerjoin(Category, Category.id == Product.category_id)
+    filtered = query.with_only_columns(*[c for facet in requested for c in columns[facet]]).subquery()
+    sets = [tuple_(*[filtered.c[c.name] for c in columns[facet]]) for facet in requested]
+    return select(
+        *[filtered.c[c.name] for facet in requested for c in columns[facet]],
+        *[func.grouping(filtered.c[columns[facet][0].name]).label(f"grouping_{facet}") for facet in requested],
+        func.count().label("count"),
+    ).group_by(func.grouping_sets(*sets))
+
+
+def _facet_results(rows, requested: list) -> dict:
+    facets = {facet: [] for facet in requested}
+    for row in rows:
+        facet = next(f for f in requested if getattr(row, f"grouping_{f}") == 0)
+        if facet == "category":
+            facets[facet].append({"id": str(row.category_id) if row.category_id else None,
+                                  "name": row.category_name, "count": row.count})
+        elif facet == "vendor":
+            facets[facet].append({"id": str(row.vendor_id), "name": row.vendor_name, "count": row.count})
+        elif facet == "price":
+            facets[facet].append({"bucket": row.price_bucket, "count": row.count})
+        else:
+            facets[facet].append({"value": bool(row.on_sale), "count": row.count})
+    for facet in ("category", "vendor"):
+        if facet in facets:
+            facets[facet].sort(key=lambda item: (-item["count"], item["name"] or ""))
+    if "price" in facets:
+        order = {_price_bucket_label(low, high): i for i, (low, high) in enumerate(PRICE_BUCKETS)}
+        facets["price"] = [
+            {**item, "min": PRICE_BUCKETS[order[item["bucket"]]][0], "max": PRICE_BUCKETS[order[item["bucket"]]][1]}
+            for item in sorted(facets["price"], key=lambda item: order[item["bucket"]])
+        ]
+    if "on_sale" in facets:
+        facets["on_sale"].sort(key=lambda item: not item["value"])
+    return facets
+
 
 @router.get("/categories")
 async def get_categories(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all categories (uses app DB so Render DATABASE_URL works)."""
     from sqlalchemy import text
-    try:
-        result = db.execute(text("""
+
+    async def load():
+        result = await db.execute(text("""
             SELECT id, name, slug, description, image_url
             FROM categories
             WHERE is_active = true
@@ -45,6 +127,9 @@ async def get_categories(
             except Exception:
                 continue
         return categories_list
+
+    try:
+        return await reference_data.get_or_load_async("categories", "customer", load)
     except Exception as e:
         import traceback
         print(f"ERROR fetching categories: {e}\n{traceback.format_exc()}")
@@ -65,298 +150,147 @@ async def get_products(
     city: Optional[str] = Query(None, description="Filter by city (e.g., Calgary, Edmonton). Use 'All' to show all cities."),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Count the total on cursor pages (capped)"),
+    search_rank: str = Query("relevance", pattern="^(relevance|newest)$",
+                             description="Order of search results: best match first, or newest first"),
+    facets: Optional[str] = Query(None, description="Comma-separated counts over all matches: category, vendor, price, on_sale"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get products for customers (only active products from active vendors)"""
-    # Check and revert expired promotions before fetching products
-    try:
-        from app.api.v1.endpoints.promotions import revert_expired_promotions
-        revert_expired_promotions(db)
-    except Exception as e:
-        # Log error but don't fail the request
-        print(f"Warning: Error reverting expired promotions: {str(e)}")
     from uuid import UUID
     
     try:
+        # Running promotions (discounted filter, on_sale facet, badges) from the in-memory index
+        now = datetime.utcnow()
+        active_promotions = await promotion_index.current(db)
+        # Units held by customers who are paying (in-memory index)
+        held_units = await reservation_index.current(db)
+        
         # Base query: all active products from active vendors
-        query = db.query(Product).join(
+        query = select(Product).join(
             Vendor, Product.vendor_id == Vendor.id
-        ).filter(
+        ).where(
             Product.status == "active",
             Vendor.status == "active"
         )
         
-        # Filter by city if provided (and not "All")
-        # BUT: Don't apply city filter if vendor_id is specified (viewing a specific store)
-        # Also skip if city is empty string or just whitespace
-        # When city is None, empty, or "All", show ALL products (no city filtering)
-        city_filter_applied = False
-        
-        # Normalize city parameter: handle None, empty string, "All", "all", etc.
+        # Normalize city parameter: None, empty, "All"/"all" mean no city filtering
         city_normalized = None
         if city:
             city_stripped = city.strip()
             if city_stripped and city_stripped.lower() != 'all':
                 city_normalized = city_stripped
         
+        # Don't apply the city filter when viewing a specific store (vendor_id).
+        # Products of active stores in the city, plus products with no store (available at all stores).
+        # Correlated EXISTS keeps this one statement, however many products the city has.
         if city_normalized and not vendor_id:
-            # Filter products by store city - only show products from stores in the selected city
-            city_filter = city_normalized
-            city_filter_applied = True
-            print(f"DEBUG: Filtering products by store city: '{city_filter}'")
-            
-            try:
-                # Get product IDs that belong to stores in the selected city
-                # Note: or_ is already imported at the top of the file
-                store_matching_products = db.query(Product.id).join(
-                    Store, Product.store_id == Store.id
-                ).filter(
-                    Product.status == "active",
-                    Store.is_active == True,
-                    Store.city.isnot(None),
-                    func.lower(Store.city).ilike(f"%{city_filter.lower()}%")
-                ).distinct()
-                
-                matching_product_ids = [str(p.id) for p in store_matching_products.all()]
-                print(f"DEBUG: Found {len(matching_product_ids)} products with stores in city '{city_filter}'")
-                
-                if matching_product_ids:
-                    # Filter the main query to only include:
-                    # 1. Products with matching store cities
-                    # 2. Products with store_id = NULL (available at all stores)
-                    matching_uuids = [UUID(pid) for pid in matching_product_ids]
-                    query = query.filter(
-                        or_(
-                            Product.id.in_(matching_uuids),
-                            Product.store_id.is_(None)  # Include products available at all stores
-                        )
-                    )
-                else:
-                    # No products with stores in this city, but still show products with store_id = NULL
-                    query = query.filter(Product.store_id.is_(None))
-                    print(f"DEBUG: No products found for city '{city_filter}', showing only products available at all stores")
-            except Exception as e:
-                print(f"DEBUG: Error in city filtering: {e}")
-                import traceback
-                traceback.print_exc()
-                # On error, don't filter (show all products) rather than showing nothing
-                city_filter_applied = False
-        
-        if not city_filter_applied:
-            # City is "All" or not provided - show ALL products from ALL stores
-            # No filtering by city - include products with any store_id (including NULL)
-            print(f"DEBUG: City filter is 'All' or not provided - showing ALL products from ALL stores (no city filtering)")
+            query = query.where(
+                or_(
+                    Product.store_id.is_(None),
+                    select(Store.id).where(
+                        Store.id == Product.store_id,
+                        Store.is_active == True,
+                        func.lower(Store.city).ilike(f"%{city_normalized.lower()}%")
+                    ).exists()
+                )
+            )
         
         if category_id:
             try:
-                query = query.filter(Product.category_id == UUID(category_id))
+                query = query.where(Product.category_id == UUID(category_id))
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid category ID")
         
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.description.ilike(search_term)
-                )
-            )
+            query = query.where(product_search.match(search))
         
         if min_price is not None:
-            query = query.filter(Product.price >= min_price)
+            query = query.where(Product.price >= min_price)
         
         if max_price is not None:
-            query = query.filter(Product.price <= max_price)
+            query = query.where(Product.price <= max_price)
         
         if vendor_id:
             try:
-                query = query.filter(Product.vendor_id == UUID(vendor_id))
+                query = query.where(Product.vendor_id == UUID(vendor_id))
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid vendor ID")
         
         if featured:
-            query = query.filter(Product.is_featured == True)
+            query = query.where(Product.is_featured == True)
         
         if new_arrivals:
             # Products created in the last 7 days only (newly stocked items are only "new" for 1 week)
-            from datetime import datetime, timedelta
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            query = query.filter(Product.created_at >= week_ago)
+            from datetime import timedelta
+            week_ago = now - timedelta(days=7)
+            query = query.where(Product.created_at >= week_ago)
         
         if discounted:
-            # Products with compare_at_price > price OR products with active promotions
-            from app.models.promotion import Promotion
-            from datetime import datetime
-            from sqlalchemy import and_
-            now = datetime.utcnow()
-            
-            # Get active promotions for all vendors
-            active_promotions = db.query(Promotion).filter(
-                Promotion.is_active == True,
-                Promotion.start_date <= now,
-                Promotion.end_date >= now
-            ).all()
-            
-            # Get product IDs from active promotions
-            promoted_product_ids = set()
-            for promo in active_promotions:
-                if promo.applies_to_all_products:
-                    # Get all products for this vendor
-                    vendor_products = db.query(Product.id).filter(
-                        Product.vendor_id == promo.vendor_id,
-                        Product.status == "active"
-                    ).all()
-                    promoted_product_ids.update([str(p.id) for p in vendor_products])
-                elif promo.product_ids:
-                    promoted_product_ids.update([str(pid) for pid in promo.product_ids])
-            
-            # Filter: products with compare_at_price > price OR products in active promotions
-            from uuid import UUID
-            if promoted_product_ids:
-                promoted_uuids = [UUID(pid) for pid in promoted_product_ids]
-                query = query.filter(
-                    or_(
-                        and_(
-                            Product.compare_at_price.isnot(None),
-                            Product.compare_at_price > Product.price
-                        ),
-                        Product.id.in_(promoted_uuids)
-                    )
-                )
-            else:
-                query = query.filter(
-                    Product.compare_at_price.isnot(None),
-                    Product.compare_at_price > Product.price
-                )
+            # Products with compare_at_price > price OR in a running promotion (vendor IN / id = ANY)
+            query = query.where(active_promotions.on_sale_clause(now))
         
         if low_stock:
             # Products with stock_quantity <= 10
-            query = query.filter(Product.stock_quantity <= 10, Product.stock_quantity > 0)
-        
-        # Debug: Log query details BEFORE counting
-        print(f"DEBUG: City parameter received: '{city}' (type: {type(city)})")
-        print(f"DEBUG: Vendor ID parameter: '{vendor_id}'")
-        print(f"DEBUG: City filter applied: {city_filter_applied}")
+            query = query.where(Product.stock_quantity <= 10, Product.stock_quantity > 0)
         
-        # Count total before pagination
-        total = query.count()
-        print(f"DEBUG: Total products after all filters (before pagination): {total}")
+        facet_counts = None
+        if facets:
+            wanted = {f.strip() for f in facets.split(",") if f.strip()}
+            unknown = sorted(wanted - set(FACETS))
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown facet(s): {', '.join(unknown)}")
+            requested = [f for f in FACETS if f in wanted]
+            signature = (category_id, search, min_price, max_price, vendor_id, featured, new_arrivals,
+                         discounted, low_stock, city_normalized, tuple(requested))
+            facet_counts = facet_cache.get(signature)
+            if facet_counts is None:
+                facet_counts = _facet_results((await db.execute(_facet_statement(query, requested, active_promotions.on_sale_clause(now)))).all(), requested)
+                facet_cache.set(signature, facet_counts)
         
-        # Debug: Check product distribution by store
-        if total > 0:
-            try:
-                product_sample = query.limit(100).all()
-                store_ids = {}
-                null_store_count = 0
-                for p in product_sample:
-                    if p.store_id:
-                        store_id_str = str(p.store_id)
-                        store_ids[store_id_str] = store_ids.get(store_id_str, 0) + 1
-                    else:
-                        null_store_count += 1
-                print(f"DEBUG: Product distribution - NULL store_id: {null_store_count}, Store IDs: {store_ids}")
-            except Exception as e:
-                print(f"DEBUG: Error checking product distribution: {e}")
-        
-        if total == 0 and city and city.lower() != 'all':
-            print(f"DEBUG: No products found for city '{city}'. Checking available cities...")
-            # Debug: Check what cities exist
-            try:
-                all_store_cities = db.query(func.distinct(Store.city)).filter(Store.city.isnot(None), Store.is_active == True).all()
-                all_vendor_cities = db.query(func.distinct(Vendor.city)).filter(Vendor.city.isnot(None), Vendor.status == "active").all()
-                print(f"DEBUG: Available store cities: {[c[0] for c in all_store_cities if c[0]]}")
-                print(f"DEBUG: Available vendor cities: {[c[0] for c in all_vendor_cities if c[0]]}")
-            except Exception as e:
-                print(f"DEBUG: Error checking cities: {e}")
-        
-        # Order by created_at descending to show newest first
-        products = query.order_by(Product.created_at.desc()).offset(skip).limit(limit).all()
+        total_capped = False
+        if cursor:
+            # Keyset page: no rows skipped, total only on request (capped)
+            rows = (await db.scalars(keyset(query, Product.created_at, Product.id, cursor, limit))).all()
+            products, next_cursor = page(rows, limit)
+            total = None
+            if include_total:
+                totals = total_fields(await db.scalar(capped_count(query)))
+                total, total_capped = totals["total"], totals["total_capped"]
+        else:
+            # Page and total in one round trip; an empty page (skip past the end) still needs a count
+            ranked = bool(search) and search_rank == "relevance" and product_search.fulltext_enabled()
+            if ranked:
+                paged = query.order_by(
+                    product_search.rank(search).desc(), Product.created_at.desc(), Product.id.desc()
+                ).offset(skip).limit(limit + 1)
+            else:
+                paged = keyset(query, Product.created_at, Product.id, None, limit, skip)
+            rows = (await db.execute(paged.add_columns(func.count().over().label("total")))).all()
+            products, next_cursor = page(rows, limit, key=lambda row: row[0])
+            products = [row[0] for row in products]
+            if ranked:
+                next_cursor = None  # cursors follow (created_at, id); page ranked results with skip
+            if rows:
+                total = rows[0].total
+            elif skip:
+                total = await db.scalar(select(func.count()).select_from(query.subquery()))
+            else:
+                total = 0
         
-        # Debug: Log what products are being returned
-        if products:
-            vendor_ids_in_results = list(set([str(p.vendor_id) for p in products]))
-            store_ids_in_results = list(set([str(p.store_id) for p in products if p.store_id]))
-            print(f"DEBUG: Returning {len(products)} products from {len(vendor_ids_in_results)} vendors, {len(store_ids_in_results)} stores")
+        # Search term highlighted in name/description (escaped HTML with <mark>), for the page only
+        product_highlights = {}
+        if search and products and product_search.fulltext_enabled():
+            for row in (await db.execute(product_search.highlights(search, [p.id for p in products]))).all():
+                product_highlights[str(row.id)] = {
+                    "name": product_search.as_html(row.name),
+                    "description": product_search.as_html(row.description),
+                }
         
         # Get vendor info for all products
         vendor_ids = [p.vendor_id for p in products]
-        vendors = {str(v.id): v for v in db.query(Vendor).filter(Vendor.id.in_(vendor_ids)).all()}
-        
-        # Get product ratings
-        from app.models.review import Review
-        from sqlalchemy import func
-        product_ids = [p.id for p in products]
-        product_ratings = {}
-        if product_ids:
-            try:
-                rating_data = db.query(
-                    Review.product_id,
-                    func.avg(Review.rating).label('average_rating'),
-                    func.count(Review.id).label('total_reviews')
-                ).filter(
-                    Review.product_id.in_(product_ids),
-                    Review.is_public == True
-                ).group_by(Review.product_id).all()
-                
-                for rating in rating_data:
-                    # Round average rating to 1 decimal place (e.g., 3.5, 4.2)
-                    avg_rating = float(rating.average_rating) if rating.average_rating else None
-                    if avg_rating is not None:
-                        avg_rating = round(avg_rating, 1)
-                    product_ratings[str(rating.product_id)] = {
-                        'average_rating': avg_rating,
-                        'total_reviews': rating.total_reviews or 0
-                    }
-            except Exception as e:
-                print(f"Error getting product ratings: {e}")
-        
-        # Get active promotions to mark products
-        from app.models.promotion import Promotion
-        from datetime import datetime
-        now = datetime.utcnow()
-        
-        # Get vendor IDs from the products we're returning
-        vendor_ids_in_results = list(set([p.vendor_id for p in products]))
-        
-        product_promotions = {}
-        try:
-            active_promotions = db.query(Promotion).filter(
-                Promotion.is_active == True,
-                Promotion.start_date <= now,
-                Promotion.end_date >= now,
-                Promotion.vendor_id.in_(vendor_ids_in_results)
-            ).all()
-            
-            # Create map of product IDs to promotions
-            for promo in active_promotions:
-                if promo.applies_to_all_products:
-                    vendor_products = db.query(Product.id).filter(
-                        Product.vendor_id == promo.vendor_id,
-                        Product.status == "active"
-                    ).all()
-                    for prod in vendor_products:
-                        pid_str = str(prod.id)
-                        if pid_str not in product_promotions:
-                            product_promotions[pid_str] = []
-                        product_promotions[pid_str].append({
-                            "id": str(promo.id),
-                            "name": str(promo.name).strip() if promo.name and str(promo.name).strip() else "Special Offer",
-                            "discount_type": promo.discount_type,
-                            "discount_value": float(promo.discount_value) if promo.discount_value else None
-                        })
-                elif promo.product_ids:
-                    for pid in promo.product_ids:
-                        pid_str = str(pid)
-                        if pid_str not in product_promotions:
-                            product_promotions[pid_str] = []
-                        product_promotions[pid_str].append({
-                            "id": str(promo.id),
-                            "name": str(promo.name).strip() if promo.name and str(promo.name).strip() else "Special Offer",
-                            "discount_type": promo.discount_type,
-                            "discount_value": float(promo.discount_value) if promo.discount_value else None
-                        })
-        except Exception as e:
-            print(f"Error getting promotions: {e}")
+        vendors = {str(v.id): v for v in (await db.scalars(select(Vendor).where(Vendor.id.in_(vendor_ids)))).all()}
         
         return {
         "products": [
@@ -372,14 +306,16 @@ async def get_products(
                 "vendor_id": str(p.vendor_id),
                 "store_id": str(p.store_id) if p.store_id else None,
                 "stock_quantity": p.stock_quantity,
+                "available_quantity": held_units.available(p, now),
                 "is_featured": p.is_featured,
                 "slug": p.slug,
                 "unit": p.unit,
                 "weight_kg": float(p.weight_kg) if p.weight_kg else None,
                 "is_newly_stocked": p.is_newly_stocked,
-                "promotions": product_promotions.get(str(p.id), []),  # Add active promotions
-                "average_rating": product_ratings.get(str(p.id), {}).get('average_rating'),
-                "total_reviews": product_ratings.get(str(p.id), {}).get('total_reviews', 0),
+                "promotions": active_promotions.promotions_for(p.id, p.vendor_id, now),  # Add active promotions
+                "average_rating": _rounded_rating(p),
+                "total_reviews": p.rating_count or 0,
+                "highlight": product_highlights.get(str(p.id)),
                 "vendor": {
                     "id": str(v.id),
                     "business_name": v.business_name
@@ -388,15 +324,20 @@ async def get_products(
             for p in products
         ],
         "total": total,
+        "total_capped": total_capped,
+        "next_cursor": next_cursor,
+        "facets": facet_counts,
         "skip": skip,
         "limit": limit
     }
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         error_msg = f"Error in get_products: {str(e)}"
         print(error_msg)
         traceback.print_exc()
-        from fastapi import HTTPException, status
+        from fastapi import status
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=error_msg
@@ -406,7 +347,7 @@ async def get_products(
 @router.get("/products/{product_id}", response_model=dict)
 async def get_product(
     product_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get a single product with vendor info"""
     from uuid import UUID
@@ -421,61 +362,23 @@ async def get_product(
     except (ValueError, TypeError):
         raise HTTPException(status_code=400, detail="Invalid product ID format")
     
-    product = db.query(Product).join(
+    product = (await db.scalars(select(Product).join(
         Vendor, Product.vendor_id == Vendor.id
-    ).filter(
+    ).where(
         Product.id == product_uuid,
         Product.status == "active",
         Vendor.status == "active"
-    ).first()
+    ))).first()
     
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    vendor = db.query(Vendor).filter(Vendor.id == product.vendor_id).first()
-    
-    # Get product ratings
-    from app.models.review import Review
-    from sqlalchemy import func
-    rating_data = db.query(
-        func.avg(Review.rating).label('average_rating'),
-        func.count(Review.id).label('total_reviews')
-    ).filter(
-        Review.product_id == product.id,
-        Review.is_public == True
-    ).first()
+    vendor = await db.get(Vendor, product.vendor_id)
     
-    # Round average rating to 1 decimal place (e.g., 3.5, 4.2)
-    average_rating = None
-    if rating_data and rating_data.average_rating:
-        average_rating = round(float(rating_data.average_rating), 1)
-    total_reviews = rating_data.total_reviews if rating_data else 0
-    
-    # Get active promotions for this product
-    from app.models.promotion import Promotion
-    from datetime import datetime
+    # Active promotions for this product (in-memory index)
     now = datetime.utcnow()
-    active_promotions = db.query(Promotion).filter(
-        Promotion.is_active == True,
-        Promotion.start_date <= now,
-        Promotion.end_date >= now,
-        Promotion.vendor_id == product.vendor_id
-    ).all()
-    
-    product_promotions = []
-    for promo in active_promotions:
-        applies = False
-        if promo.applies_to_all_products:
-            applies = True
-        elif promo.product_ids and product.id in promo.product_ids:
-            applies = True
-        
-        if applies:
-            product_promotions.append({
-                "name": str(promo.name).strip() if promo.name and str(promo.name).strip() else "Special Offer",
-                "discount_type": promo.discount_type,
-                "discount_value": float(promo.discount_value) if promo.discount_value else None
-            })
+    product_promotions = (await promotion_index.current(db)).promotions_for(product.id, product.vendor_id, now)
+    available_quantity = (await reservation_index.current(db)).available(product, now)
     
     return {
         "id": str(product.id),
@@ -496,6 +399,7 @@ async def get_product(
             "total_reviews": vendor.total_reviews
         },
         "stock_quantity": product.stock_quantity,
+        "available_quantity": available_quantity,
         "is_featured": product.is_featured,
         "is_newly_stocked": product.is_newly_stocked,
         "slug": product.slug,
@@ -503,28 +407,31 @@ async def get_product(
         "weight_kg": float(product.weight_kg) if product.weight_kg else None,
         "sku": product.sku,
         "barcode": product.barcode,
-        "average_rating": average_rating,
-        "total_reviews": total_reviews
+        "average_rating": _rounded_rating(product),
+        "total_reviews": product.rating_count or 0
     }
 
 
 @router.get("/vendors", response_model=List[dict])
 async def get_vendors(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all active vendors"""
-    vendors = db.query(Vendor).filter(Vendor.status == "active").all()
-    return [
-        {
-            "id": str(v.id),
-            "business_name": v.business_name,
-            "description": v.description,
-            "store_profile_image_url": v.store_profile_image_url,
-            "average_rating": float(v.average_rating) if v.average_rating else None,
-            "total_reviews": v.total_reviews,
-            "city": v.city,
-            "state": v.state
-        }
-        for v in vendors
-    ]
+    async def load():
+        vendors = (await db.scalars(select(Vendor).where(Vendor.status == "active"))).all()
+        return [
+            {
+                "id": str(v.id),
+                "business_name": v.business_name,
+                "description": v.description,
+                "store_profile_image_url": v.store_profile_image_url,
+                "average_rating": float(v.average_rating) if v.average_rating else None,
+                "total_reviews": v.total_reviews,
+                "city": v.city,
+                "state": v.state
+            }
+            for v in vendors
+        ]
+
+    return await reference_data.get_or_load_async("vendors", "active", load)
 
@@ -9,6 +9,8 @@ from app.models.review import Review
 from app.models.product import Product
 from app.models.order import Order, OrderItem
 from app.api.v1.dependencies import get_current_customer
+from app.core.refdata import reference_data
+from app.services import ratings
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -105,7 +107,11 @@ async def create_product_review(
     )
     
     db.add(review)
+    # New reviews are public: count them on the product and vendor in the same transaction
+    ratings.apply_review(db, review, 1)
     db.commit()
+    # Vendor ratings are part of the cached vendor and store listings
+    reference_data.invalidate("vendors", "stores")
     db.refresh(review)
     
     # Get customer name for response
@@ -4,162 +4,192 @@ Customer store browsing endpoints
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import Optional, List
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.vendor import Vendor
 from app.models.store import Store
-from sqlalchemy import func, and_
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
+from heapq import merge
+from itertools import islice
+from app.core import geo
+from app.core.refdata import reference_data
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[dict])
-async def get_stores(
-    latitude: Optional[float] = Query(None),
-    longitude: Optional[float] = Query(None),
-    radius_km: Optional[float] = Query(100, description="Search radius in kilometers"),
-    search: Optional[str] = Query(None),
-    region: Optional[str] = Query(None, description="Filter by region: West African, East African, North African, Central African, South African"),
-    city: Optional[str] = Query(None, description="Filter by city (e.g., Calgary, Edmonton, Red Deer)"),
-    db: Session = Depends(get_db)
-):
-    """Get all stores from all active vendors. If a vendor has no stores, show the vendor as a store."""
-    # Query stores from active vendors
-    store_query = db.query(Store).join(Vendor).filter(
-        Vendor.status == "active",
-        Store.is_active == True
-    )
-    
+def _store_conditions(search: Optional[str], city: Optional[str]) -> list:
+    """Store-level filters (Store joined to, or correlated with, its Vendor)."""
+    conditions = [Store.is_active == True]
     if search:
         search_term = f"%{search}%"
-        store_query = store_query.filter(
-            (Store.name.ilike(search_term)) |
-            (Vendor.business_name.ilike(search_term))
-        )
-    
+        conditions.append((Store.name.ilike(search_term)) | (Vendor.business_name.ilike(search_term)))
+    if city:
+        # Filter by city (case-insensitive)
+        conditions.append(Store.city.ilike(f"%{city}%"))
+    return conditions
+
+
+def _store_query(db: Session, search: Optional[str], region: Optional[str], city: Optional[str]):
+    """Stores from active vendors (vendor loaded in the same query)"""
+    store_query = db.query(Store).join(Vendor).options(contains_eager(Store.vendor)).filter(
+        Vendor.status == "active",
+        *_store_conditions(search, city)
+    )
     if region:
         store_query = store_query.filter(Vendor.region == region)
-    
-    if city and city.lower() != 'all':
-        # Filter by city (case-insensitive) - only if not "All"
-        store_query = store_query.filter(Store.city.ilike(f"%{city}%"))
-    
-    stores_list = store_query.all()
-    
-    # Also get vendors that don't have stores (to show them as stores)
-    vendor_query = db.query(Vendor).filter(Vendor.status == "active")
+    return store_query
+
+
+def _vendor_query(db: Session, search: Optional[str], region: Optional[str], city: Optional[str]):
+    """Active vendors with no store in _store_query() (shown as stores)"""
+    has_store = select(Store.id).where(Store.vendor_id == Vendor.id, *_store_conditions(search, city))
+    vendor_query = db.query(Vendor).filter(Vendor.status == "active", ~has_store.exists())
     
     if region:
         vendor_query = vendor_query.filter(Vendor.region == region)
     
-    if city and city.lower() != 'all':
-        # Filter vendors by city (case-insensitive) - only if not "All"
+    if city:
+        # Filter vendors by city (case-insensitive)
         vendor_query = vendor_query.filter(Vendor.city.ilike(f"%{city}%"))
     
     if search:
         search_term = f"%{search}%"
         vendor_query = vendor_query.filter(Vendor.business_name.ilike(search_term))
+    return vendor_query
+
+
+def _store_entry(store: Store) -> dict:
+    vendor = store.vendor
+    return {
+        "id": str(store.id),
+        "vendor_id": str(vendor.id),
+        "business_name": vendor.business_name,
+        "store_name": store.name,
+        "description": store.description or vendor.description,
+        "store_profile_image_url": store.profile_image_url or vendor.store_profile_image_url,
+        "store_banner_image_url": store.banner_image_url or vendor.store_banner_image_url,
+        "average_rating": float(store.average_rating) if store.average_rating else (float(vendor.average_rating) if vendor.average_rating else None),
+        "total_reviews": store.total_reviews or vendor.total_reviews,
+        "city": store.city,
+        "state": store.state,
+        "street_address": store.street_address,
+        "delivery_available": store.delivery_available,
+        "pickup_available": store.pickup_available,
+        "delivery_radius_km": float(store.delivery_radius_km) if store.delivery_radius_km else None,
+        "distance_km": None,  # per request, from the caller's coordinates
+        "operating_hours": store.operating_hours or vendor.operating_hours,
+        "minimum_order_amount": float(store.minimum_order_amount) if store.minimum_order_amount else None,
+        "delivery_fee": float(store.delivery_fee) if store.delivery_fee else None,
+        "estimated_prep_time_minutes": store.estimated_prep_time_minutes,
+        "store_tags": store.store_tags if store.store_tags else (vendor.store_tags if vendor.store_tags else []),
+        "store_features": store.store_features if store.store_features else (vendor.store_features if vendor.store_features else {}),
+        "specialties": store.specialties if store.specialties else (vendor.specialties if vendor.specialties else []),
+        "region": vendor.region,
+        "is_primary": store.is_primary
+    }
+
+
+def _vendor_entry(vendor: Vendor) -> dict:
+    # Use vendor ID as store ID for vendors without stores
+    return {
+        "id": str(vendor.id),  # Use vendor ID as store ID
+        "vendor_id": str(vendor.id),
+        "business_name": vendor.business_name,
+        "store_name": vendor.business_name,  # Use business name as store name
+        "description": vendor.description,
+        "store_profile_image_url": vendor.store_profile_image_url,
+        "store_banner_image_url": vendor.store_banner_image_url,
+        "average_rating": float(vendor.average_rating) if vendor.average_rating else None,
+        "total_reviews": vendor.total_reviews or 0,
+        "city": vendor.city,
+        "state": vendor.state,
+        "street_address": vendor.street_address,
+        "delivery_available": vendor.delivery_available if vendor.delivery_available is not None else True,
+        "pickup_available": vendor.pickup_available if vendor.pickup_available is not None else True,
+        "delivery_radius_km": float(vendor.delivery_radius_km) if vendor.delivery_radius_km else None,
+        "distance_km": None,  # per request, from the caller's coordinates
+        "operating_hours": vendor.operating_hours,
+        "minimum_order_amount": float(vendor.minimum_order_amount) if vendor.minimum_order_amount else None,
+        "delivery_fee": float(vendor.delivery_fee) if vendor.delivery_fee else None,
+        "estimated_prep_time_minutes": vendor.estimated_prep_time_minutes or 30,
+        "store_tags": vendor.store_tags if vendor.store_tags else [],
+        "store_features": vendor.store_features if vendor.store_features else {},
+        "specialties": vendor.specialties if vendor.specialties else [],
+        "region": vendor.region,
+        "is_primary": True  # Vendors without stores are treated as primary
+    }
+
+
+def _load_store_entries(db: Session, search: Optional[str], region: Optional[str], city: Optional[str]) -> list:
+    """
+    Active stores, plus vendors without stores shown as stores, sorted by name.
+    Independent of the caller's location, so the listing can be cached as reference data.
+    """
+    stores = [_store_entry(store) for store in _store_query(db, search, region, city).all()]
+    stores += [_vendor_entry(vendor) for vendor in _vendor_query(db, search, region, city).all()]
+    stores.sort(key=lambda x: x["store_name"] or "")
+    return stores
+
+
+def _nearby_store_entries(db: Session, latitude: float, longitude: float, radius_km: float, search: Optional[str],
+                          region: Optional[str], city: Optional[str], limit: Optional[int]) -> list:
+    """
+    Stores (and vendors without stores) within radius_km, nearest first, at most `limit` of them.
+    Each source is filtered, sorted and limited in SQL over its spatial index (app/core/geo.py);
+    the two sorted lists are then merged.
+    """
+    sources = []
+    for model, query, entry in (
+        (Store, _store_query(db, search, region, city), _store_entry),
+        (Vendor, _vendor_query(db, search, region, city), _vendor_entry),
+    ):
+        query = query.add_columns(geo.distance_km(model, latitude, longitude)).filter(
+            geo.within(model, latitude, longitude, radius_km)
+        ).order_by(geo.nearest(model, latitude, longitude))
+        if limit is not None:
+            query = query.limit(limit)
+        sources.append([dict(entry(row), distance_km=round(distance, 2)) for row, distance in query.all()])
     
-    all_vendors = vendor_query.all()
-    vendors_with_stores = {store.vendor_id for store in stores_list}
-    vendors_without_stores = [v for v in all_vendors if v.id not in vendors_with_stores]
-    
-    stores = []
-    from math import radians, cos, sin, asin, sqrt
-    
-    # Process actual stores
-    for store in stores_list:
-        vendor = store.vendor
-        # Calculate distance if both user and store have coordinates
-        distance = None
-        if latitude and longitude and store.latitude and store.longitude:
-            lat1, lon1 = radians(latitude), radians(longitude)
-            lat2, lon2 = radians(float(store.latitude)), radians(float(store.longitude))
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            distance = 6371 * c  # Earth radius in km
-        
-        stores.append({
-            "id": str(store.id),
-            "vendor_id": str(vendor.id),
-            "business_name": vendor.business_name,
-            "store_name": store.name,
-            "description": store.description or vendor.description,
-            "store_profile_image_url": store.profile_image_url or vendor.store_profile_image_url,
-            "store_banner_image_url": store.banner_image_url or vendor.store_banner_image_url,
-            "average_rating": float(store.average_rating) if store.average_rating else (float(vendor.average_rating) if vendor.average_rating else None),
-            "total_reviews": store.total_reviews or vendor.total_reviews,
-            "city": store.city,
-            "state": store.state,
-            "street_address": store.street_address,
-            "delivery_available": store.delivery_available,
-            "pickup_available": store.pickup_available,
-            "delivery_radius_km": float(store.delivery_radius_km) if store.delivery_radius_km else None,
-            "distance_km": round(distance, 2) if distance else None,
-            "operating_hours": store.operating_hours or vendor.operating_hours,
-            "minimum_order_amount": float(store.minimum_order_amount) if store.minimum_order_amount else None,
-            "delivery_fee": float(store.delivery_fee) if store.delivery_fee else None,
-            "estimated_prep_time_minutes": store.estimated_prep_time_minutes,
-            "store_tags": store.store_tags if store.store_tags else (vendor.store_tags if vendor.store_tags else []),
-            "store_features": store.store_features if store.store_features else (vendor.store_features if vendor.store_features else {}),
-            "specialties": store.specialties if store.specialties else (vendor.specialties if vendor.specialties else []),
-            "region": vendor.region,
-            "is_primary": store.is_primary
-        })
-    
-    # Process vendors without stores (show them as stores)
-    for vendor in vendors_without_stores:
-        # Calculate distance if both user and vendor have coordinates
-        distance = None
-        if latitude and longitude and vendor.latitude and vendor.longitude:
-            lat1, lon1 = radians(latitude), radians(longitude)
-            lat2, lon2 = radians(float(vendor.latitude)), radians(float(vendor.longitude))
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            distance = 6371 * c  # Earth radius in km
-        
-        # Use vendor ID as store ID for vendors without stores
-        stores.append({
-            "id": str(vendor.id),  # Use vendor ID as store ID
-            "vendor_id": str(vendor.id),
-            "business_name": vendor.business_name,
-            "store_name": vendor.business_name,  # Use business name as store name
-            "description": vendor.description,
-            "store_profile_image_url": vendor.store_profile_image_url,
-            "store_banner_image_url": vendor.store_banner_image_url,
-            "average_rating": float(vendor.average_rating) if vendor.average_rating else None,
-            "total_reviews": vendor.total_reviews or 0,
-            "city": vendor.city,
-            "state": vendor.state,
-            "street_address": vendor.street_address,
-            "delivery_available": vendor.delivery_available if vendor.delivery_available is not None else True,
-            "pickup_available": vendor.pickup_available if vendor.pickup_available is not None else True,
-            "delivery_radius_km": float(vendor.delivery_radius_km) if vendor.delivery_radius_km else None,
-            "distance_km": round(distance, 2) if distance else None,
-            "operating_hours": vendor.operating_hours,
-            "minimum_order_amount": float(vendor.minimum_order_amount) if vendor.minimum_order_amount else None,
-            "delivery_fee": float(vendor.delivery_fee) if vendor.delivery_fee else None,
-            "estimated_prep_time_minutes": vendor.estimated_prep_time_minutes or 30,
-            "store_tags": vendor.store_tags if vendor.store_tags else [],
-            "store_features": vendor.store_features if vendor.store_features else {},
-            "specialties": vendor.specialties if vendor.specialties else [],
-            "region": vendor.region,
-            "is_primary": True  # Vendors without stores are treated as primary
-        })
+    nearby = merge(*sources, key=lambda x: (x["distance_km"], x["store_name"] or ""))
+    return list(islice(nearby, limit))
+
+
+@router.get("/", response_model=List[dict])
+async def get_stores(
+    latitude: Optional[float] = Query(None),
+    longitude: Optional[float] = Query(None),
+    radius_km: Optional[float] = Query(100, gt=0, description="Search radius in kilometers (with latitude/longitude)"),
+    search: Optional[str] = Query(None),
+    region: Optional[str] = Query(None, description="Filter by region: West African, East African, North African, Central African, South African"),
+    city: Optional[str] = Query(None, description="Filter by city (e.g., Calgary, Edmonton, Red Deer)"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: every match)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get all stores from all active vendors. If a vendor has no stores, show the vendor as a store.
+    With latitude and longitude: only stores within radius_km, nearest first; otherwise sorted by name.
+    """
+    city = city.strip().lower() if city and city.strip().lower() != 'all' else None
+    end = skip + limit if limit is not None else None
     
-    # Sort by distance if available, otherwise by name
-    stores.sort(key=lambda x: (x["distance_km"] if x["distance_km"] is not None else float('inf'), x["store_name"]))
+    if latitude is not None and longitude is not None:
+        return _nearby_store_entries(db, latitude, longitude, radius_km or 100, search, region, city, end)[skip:]
     
-    return stores
+    if search:
+        entries = _load_store_entries(db, search, region, city)
+    else:
+        # Searches are too varied to cache; the plain listing (by region/city) is every page view
+        entries = reference_data.get_or_load(
+            "stores", ("listing", region, city), lambda: _load_store_entries(db, None, region, city)
+        )
+    return entries[skip:end]
 
 
 @router.get("/{store_id}", response_model=dict)
 async def get_store(
     store_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific store with full details. If store_id is a vendor_id (vendor has no stores), return vendor as store."""
     from uuid import UUID
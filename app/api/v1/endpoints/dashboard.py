@@ -7,7 +7,7 @@ from sqlalchemy import func, and_, case
 from typing import Optional
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 from app.models.vendor import Vendor
@@ -21,7 +21,7 @@ router = APIRouter()
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get dashboard statistics"""
     vendor_id = current_vendor["vendor_id"]
@@ -102,7 +102,7 @@ async def get_sales_report(
     start_date: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
     current_vendor: dict = Depends(get_current_vendor),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get sales report for a date range"""
     vendor_id = current_vendor["vendor_id"]
@@ -2,13 +2,15 @@
 Delivery tracking endpoints for GPS routing and ETA
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.driver import Driver, Delivery
 from app.models.order import Order
 from app.models.customer import CustomerAddress
@@ -16,25 +18,24 @@ from app.api.v1.dependencies import get_current_driver, get_current_customer
 from app.schemas.driver import LocationUpdate, TrackingDataResponse
 from app.services.maps_service import maps_service
 
-router = APIRouter()
+# Mounted under /driver and /customer (app/api/v1 ROUTERS): each lazy-loads with its own group
+driver_router = APIRouter()
+customer_router = APIRouter()
 
 
-@router.post("/driver/deliveries/{delivery_id}/update-location", response_model=dict)
+@driver_router.post("/deliveries/{delivery_id}/update-location", response_model=dict)
 async def update_driver_location(
     delivery_id: str,
     location_data: LocationUpdate,
     current_driver: dict = Depends(get_current_driver),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update driver's current location and recalculate ETA"""
     try:
         # Get delivery
-        delivery = db.query(Delivery).filter(
-            Delivery.id == UUID(delivery_id),
-            Delivery.driver_id == UUID(current_driver["driver_id"])
-        ).first()
+        delivery = await db.get(Delivery, UUID(delivery_id))
         
-        if not delivery:
+        if not delivery or str(delivery.driver_id) != current_driver["driver_id"]:
             raise HTTPException(status_code=404, detail="Delivery not found")
         
         # Update delivery location
@@ -44,15 +45,16 @@ async def update_driver_location(
             delivery.last_location_update = datetime.utcnow()
         
         # Update driver's current location
-        driver = db.query(Driver).filter(Driver.id == UUID(current_driver["driver_id"])).first()
+        driver = await db.get(Driver, UUID(current_driver["driver_id"]))
         if driver:
             driver.current_location_latitude = Decimal(str(location_data.latitude))
             driver.current_location_longitude = Decimal(str(location_data.longitude))
             driver.last_location_update = datetime.utcnow()
         
-        # Calculate ETA if we have delivery coordinates
+        # Calculate ETA if we have delivery coordinates (Maps client is blocking HTTP: keep it off the event loop)
         if delivery.delivery_latitude and delivery.delivery_longitude:
-            eta_minutes = maps_service.calculate_eta(
+            eta_minutes = await run_in_threadpool(
+                maps_service.calculate_eta,
                 float(location_data.latitude),
                 float(location_data.longitude),
                 float(delivery.delivery_latitude),
@@ -64,7 +66,8 @@ async def update_driver_location(
                 
                 # Also update route details if not set
                 if hasattr(delivery, 'route_polyline') and not delivery.route_polyline:
-                    route_details = maps_service.get_route_details(
+                    route_details = await run_in_threadpool(
+                        maps_service.get_route_details,
                         float(location_data.latitude),
                         float(location_data.longitude),
                         float(delivery.delivery_latitude),
@@ -78,8 +81,7 @@ async def update_driver_location(
                         if hasattr(delivery, 'route_duration_seconds'):
                             delivery.route_duration_seconds = route_details.get('duration_seconds')
         
-        db.commit()
-        db.refresh(delivery)
+        await db.commit()
         
         return {
             "message": "Location updated",
@@ -89,30 +91,30 @@ async def update_driver_location(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update location: {str(e)}")
 
 
-@router.get("/customer/deliveries/{delivery_id}/tracking", response_model=TrackingDataResponse)
+@customer_router.get("/deliveries/{delivery_id}/tracking", response_model=TrackingDataResponse)
 async def get_tracking_data(
     delivery_id: str,
     current_customer: dict = Depends(get_current_customer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get real-time tracking data for customer"""
     try:
         # Get delivery with order
-        delivery = db.query(Delivery).filter(Delivery.id == UUID(delivery_id)).first()
+        delivery = await db.get(Delivery, UUID(delivery_id))
         if not delivery:
             raise HTTPException(status_code=404, detail="Delivery not found")
         
         # Verify customer owns the order
-        order = db.query(Order).filter(Order.id == delivery.order_id).first()
+        order = await db.get(Order, delivery.order_id)
         if not order or str(order.customer_id) != current_customer["customer_id"]:
             raise HTTPException(status_code=403, detail="Access denied")
         
         # Get driver info
-        driver = db.query(Driver).filter(Driver.id == delivery.driver_id).first()
+        driver = await db.get(Driver, delivery.driver_id)
         
         # Get customer delivery address
         customer_location = None
@@ -132,7 +134,8 @@ async def get_tracking_data(
             
             # Recalculate ETA if we have both locations
             if customer_location and maps_service.is_available():
-                eta_minutes = maps_service.calculate_eta(
+                eta_minutes = await run_in_threadpool(
+                    maps_service.calculate_eta,
                     float(delivery.current_latitude),
                     float(delivery.current_longitude),
                     float(delivery.delivery_latitude),
@@ -140,12 +143,13 @@ async def get_tracking_data(
                 )
                 if eta_minutes is not None and hasattr(delivery, 'current_eta_minutes'):
                     delivery.current_eta_minutes = eta_minutes
-                    db.commit()
+                    await db.commit()
         
         # Calculate distance if we have both locations
         distance_km = None
         if driver_location and customer_location and maps_service.is_available():
-            distance_km = maps_service.get_distance_km(
+            distance_km = await run_in_threadpool(
+                maps_service.get_distance_km,
                 driver_location["lat"],
                 driver_location["lng"],
                 customer_location["lat"],
@@ -169,7 +173,7 @@ async def get_tracking_data(
         raise HTTPException(status_code=500, detail=f"Failed to get tracking data: {str(e)}")
 
 
-@router.get("/driver/deliveries/{delivery_id}/route", response_model=dict)
+@driver_router.get("/deliveries/{delivery_id}/route", response_model=dict)
 async def get_delivery_route(
     delivery_id: str,
     current_driver: dict = Depends(get_current_driver),
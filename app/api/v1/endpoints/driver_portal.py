@@ -2,14 +2,16 @@
 Driver portal endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, select
 from typing import List, Optional
 from datetime import datetime, timedelta
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.driver import Driver, Delivery
 from app.models.order import Order, OrderStatus
 from app.models.customer import CustomerAddress
+from app.models.vendor import Vendor
 from app.api.v1.dependencies import get_current_driver
 from app.schemas.driver import (
     DriverResponse, DriverProfileUpdate, DeliveryResponse, DeliveryAddressDisplay,
@@ -57,39 +59,8 @@ async def get_driver_profile(
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
     
-    return DriverResponse(
-        id=str(driver.id),
-        email=driver.email,
-        phone=driver.phone,
-        first_name=driver.first_name,
-        last_name=driver.last_name,
-        street_address=driver.street_address,
-        city=driver.city,
-        state=driver.state,
-        postal_code=driver.postal_code,
-        country=driver.country,
-        vehicle_type=driver.vehicle_type,
-        vehicle_make=driver.vehicle_make,
-        vehicle_model=driver.vehicle_model,
-        vehicle_year=driver.vehicle_year,
-        vehicle_color=driver.vehicle_color,
-        license_plate=driver.license_plate,
-        driver_license_number=driver.driver_license_number,
-        verification_status=driver.verification_status,
-        is_active=driver.is_active,
-        is_available=driver.is_available,
-        total_deliveries=driver.total_deliveries,
-        completed_deliveries=driver.completed_deliveries,
-        average_rating=float(driver.average_rating) if driver.average_rating else None,
-        total_earnings=float(driver.total_earnings) if driver.total_earnings else None,
-        delivery_radius_km=float(driver.delivery_radius_km) if driver.delivery_radius_km else None,
-        preferred_delivery_zones=driver.preferred_delivery_zones or [],
-        bank_account_name=driver.bank_account_name,
-        bank_account_number=driver.bank_account_number,
-        bank_routing_number=driver.bank_routing_number,
-        bank_name=driver.bank_name,
-        created_at=driver.created_at
-    )
+    # response_model validates the ORM object directly (DriverResponse has from_attributes)
+    return driver
 
 
 @router.put("/me", response_model=DriverResponse)
@@ -112,55 +83,24 @@ async def update_driver_profile(
     db.commit()
     db.refresh(driver)
     
-    return DriverResponse(
-        id=str(driver.id),
-        email=driver.email,
-        phone=driver.phone,
-        first_name=driver.first_name,
-        last_name=driver.last_name,
-        street_address=driver.street_address,
-        city=driver.city,
-        state=driver.state,
-        postal_code=driver.postal_code,
-        country=driver.country,
-        vehicle_type=driver.vehicle_type,
-        vehicle_make=driver.vehicle_make,
-        vehicle_model=driver.vehicle_model,
-        vehicle_year=driver.vehicle_year,
-        vehicle_color=driver.vehicle_color,
-        license_plate=driver.license_plate,
-        driver_license_number=driver.driver_license_number,
-        verification_status=driver.verification_status,
-        is_active=driver.is_active,
-        is_available=driver.is_available,
-        total_deliveries=driver.total_deliveries,
-        completed_deliveries=driver.completed_deliveries,
-        average_rating=float(driver.average_rating) if driver.average_rating else None,
-        total_earnings=float(driver.total_earnings) if driver.total_earnings else None,
-        delivery_radius_km=float(driver.delivery_radius_km) if driver.delivery_radius_km else None,
-        preferred_delivery_zones=driver.preferred_delivery_zones or [],
-        bank_account_name=driver.bank_account_name,
-        bank_account_number=driver.bank_account_number,
-        bank_routing_number=driver.bank_routing_number,
-        bank_name=driver.bank_name,
-        created_at=driver.created_at
-    )
+    # response_model validates the ORM object directly (DriverResponse has from_attributes)
+    return driver
 
 
 @router.put("/availability", response_model=dict)
 async def update_availability(
     is_available: bool = Query(...),
     current_driver: dict = Depends(get_current_driver),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update driver availability status"""
-    driver = db.query(Driver).filter(Driver.id == UUID(current_driver["driver_id"])).first()
+    driver = await db.get(Driver, UUID(current_driver["driver_id"]))
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
     
     driver.is_available = is_available
     driver.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {"message": "Availability updated", "is_available": is_available}
 
@@ -168,22 +108,22 @@ async def update_availability(
 @router.get("/dashboard/stats", response_model=dict)
 async def get_dashboard_stats(
     current_driver: dict = Depends(get_current_driver),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Dashboard stats computed from actual Delivery records for accuracy."""
     driver_id = UUID(current_driver["driver_id"])
-    base = db.query(Delivery).filter(Delivery.driver_id == driver_id)
-    total_deliveries = base.count()
-    completed_deliveries = base.filter(Delivery.status == "delivered").count()
-    active_deliveries = base.filter(
+    base = select(func.count(Delivery.id)).where(Delivery.driver_id == driver_id)
+    total_deliveries = await db.scalar(base)
+    completed_deliveries = await db.scalar(base.where(Delivery.status == "delivered"))
+    active_deliveries = await db.scalar(base.where(
         Delivery.status.in_(["accepted", "picked_up", "in_transit"])
-    ).count()
-    earnings_row = db.query(func.coalesce(func.sum(Delivery.driver_earnings), 0)).filter(
+    ))
+    earnings_row = await db.scalar(select(func.coalesce(func.sum(Delivery.driver_earnings), 0)).where(
         Delivery.driver_id == driver_id,
         Delivery.status == "delivered"
-    ).scalar()
+    ))
     total_earnings = float(earnings_row) if earnings_row is not None else 0.0
-    driver = db.query(Driver).filter(Driver.id == driver_id).first()
+    driver = await db.get(Driver, driver_id)
     average_rating = float(driver.average_rating) if driver and driver.average_rating is not None else None
     return {
         "total_deliveries": total_deliveries,
@@ -199,10 +139,10 @@ async def update_location(
     latitude: float,
     longitude: float,
     current_driver: dict = Depends(get_current_driver),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update driver's current location"""
-    driver = db.query(Driver).filter(Driver.id == UUID(current_driver["driver_id"])).first()
+    driver = await db.get(Driver, UUID(current_driver["driver_id"]))
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
     
@@ -210,7 +150,7 @@ async def update_location(
     driver.current_location_longitude = Decimal(str(longitude))
     driver.last_location_update = datetime.utcnow()
     driver.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {"message": "Location updated"}
 
@@ -218,28 +158,27 @@ async def update_location(
 @router.get("/available-orders", response_model=List[dict])
 async def get_available_orders(
     current_driver: dict = Depends(get_current_driver),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get orders available for delivery (ready status, no driver assigned)"""
-    driver = db.query(Driver).filter(Driver.id == UUID(current_driver["driver_id"])).first()
+    driver = await db.get(Driver, UUID(current_driver["driver_id"]))
     if not driver or not driver.is_available:
         return []
     
     # Get orders that are ready for pickup and don't have a driver assigned
-    orders = db.query(Order).filter(
+    # (vendor is eager-loaded: async sessions can't lazy-load order.vendor)
+    orders = (await db.scalars(select(Order).options(selectinload(Order.vendor)).where(
         Order.status == "ready",
         Order.delivery_method == "delivery",
         Order.driver_id.is_(None)
-    ).all()
+    ))).all()
     
     from app.models.chef import Chef
     result = []
     for order in orders:
         delivery_address = None
         if order.delivery_address_id:
-            delivery_address = db.query(CustomerAddress).filter(
-                CustomerAddress.id == order.delivery_address_id
-            ).first()
+            delivery_address = await db.get(CustomerAddress, order.delivery_address_id)
         # Pickup: vendor (store) or chef
         if order.vendor_id and order.vendor:
             pickup_name = order.vendor.business_name
@@ -248,7 +187,7 @@ async def get_available_orders(
             pickup_state = order.vendor.state or ""
             pickup_postal = order.vendor.postal_code or ""
         elif order.chef_id:
-            chef = db.query(Chef).filter(Chef.id == order.chef_id).first()
+            chef = await db.get(Chef, order.chef_id)
             pickup_name = (chef.chef_name or f"{chef.first_name} {chef.last_name}") if chef else "Chef"
             pickup_street = chef.street_address if chef else ""
             pickup_city = chef.city if chef else ""
@@ -327,8 +266,8 @@ def _do_accept_delivery(order_id: str, body: Optional[dict], current_driver: dic
     # Pickup coords from vendor if available
     pickup_lat = pickup_lon = None
     try:
-        if order.vendor_id and order.vendor:
-            v = order.vendor
+        v = db.get(Vendor, order.vendor_id) if order.vendor_id else None
+        if v:
             if v.latitude is not None and v.longitude is not None:
                 pickup_lat = v.latitude
                 pickup_lon = v.longitude
@@ -433,23 +372,23 @@ async def reject_delivery(
 async def get_my_deliveries(
     status_filter: Optional[str] = Query(None),
     current_driver: dict = Depends(get_current_driver),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get driver's deliveries with order number and delivery address."""
-    query = db.query(Delivery).filter(
+    query = select(Delivery).where(
         Delivery.driver_id == UUID(current_driver["driver_id"])
     )
     if status_filter:
-        query = query.filter(Delivery.status == status_filter)
-    deliveries = query.order_by(Delivery.created_at.desc()).all()
+        query = query.where(Delivery.status == status_filter)
+    deliveries = (await db.scalars(query.order_by(Delivery.created_at.desc()))).all()
     if not deliveries:
         return []
     order_ids = [d.order_id for d in deliveries]
-    orders = {o.id: o for o in db.query(Order).filter(Order.id.in_(order_ids)).all()}
+    orders = {o.id: o for o in (await db.scalars(select(Order).where(Order.id.in_(order_ids)))).all()}
     address_ids = [o.delivery_address_id for o in orders.values() if getattr(o, 'delivery_address_id', None)]
     addresses = {}
     if address_ids:
-        for addr in db.query(CustomerAddress).filter(CustomerAddress.id.in_(address_ids)).all():
+        for addr in (await db.scalars(select(CustomerAddress).where(CustomerAddress.id.in_(address_ids)))).all():
             addresses[addr.id] = addr
     out = []
     for d in deliveries:
@@ -2,8 +2,7 @@
 Marketing recipe and meal plan endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
@@ -14,6 +13,7 @@ from app.models.product import Product
 from app.models.vendor import Vendor
 from app.models.store import Store
 from app.api.v1.dependencies import get_current_admin
+from app.services import product_search
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -695,15 +695,11 @@ async def get_products_for_recipes(
         query = query.filter(Product.vendor_id == vendor_id)
     
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Product.name.ilike(search_term),
-                Product.description.ilike(search_term)
-            )
-        )
+        query = query.filter(product_search.match(search))
+        if product_search.fulltext_enabled():
+            query = query.order_by(product_search.rank(search).desc())
     
-    products = query.order_by(Product.name).limit(limit).all()
+    products = query.options(selectinload(Product.vendor)).order_by(Product.name).limit(limit).all()
     
     result = []
     for p in products:
@@ -1,7 +1,7 @@
 """
 Order management endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_
 from typing import List, Optional
@@ -10,111 +10,59 @@ from uuid import UUID
 from app.core.database import get_db
 from app.models.order import Order, OrderItem, OrderStatusHistory
 from app.models.product import Product
-from app.models.vendor import Vendor
-from app.models.driver import Delivery
-from app.schemas.order import OrderResponse, OrderUpdate, OrderListResponse
+from app.schemas.order import (
+    OrderResponse, OrderUpdate, OrderListResponse, VendorOrderOut, VendorOrderDriverOut,
+    BulkStatusUpdate, BulkStatusResponse
+)
 from app.api.v1.dependencies import get_current_vendor
+from app.api.v1.pagination import keyset, page, capped_count, set_page_headers
+from app.services import order_transitions
+from app.services.order_enrichment import OrderBatch
 
 router = APIRouter()
 
 
-def _decimal(val):
-    """Convert Decimal to float for JSON; leave None as None."""
-    if val is None:
-        return None
-    try:
-        return float(val)
-    except (TypeError, ValueError):
-        return None
-
-
-def _order_to_response(order, db: Session, vendor_id: UUID):
-    """Build JSON-serializable order dict for vendor (used by GET and PUT so responses don't fail)."""
-    from app.models.driver import Driver, Delivery
-    driver_info = None
-    delivery_info = None
+def _order_to_response(order, batch: OrderBatch) -> VendorOrderOut:
+    """Order detail for the vendor (used by GET and PUT), validated from the ORM objects."""
+    batch.attach_deliveries()
+    # Items, and the delivery from Order.delivery
+    result = VendorOrderOut.model_validate(order)
     if order.driver_id:
-        driver = db.query(Driver).filter(Driver.id == order.driver_id).first()
+        driver = batch.driver(order.driver_id)
         if driver:
-            driver_info = {
-                "id": str(driver.id),
-                "name": f"{driver.first_name} {driver.last_name}",
-                "phone": driver.phone,
-                "vehicle_type": driver.vehicle_type,
-                "license_plate": driver.license_plate
-            }
-        delivery = db.query(Delivery).filter(Delivery.order_id == order.id).first()
-        if delivery:
-            delivery_info = {
-                "id": str(delivery.id),
-                "status": delivery.status,
-                "accepted_at": delivery.accepted_at.isoformat() if delivery.accepted_at else None,
-                "picked_up_at": delivery.actual_pickup_time.isoformat() if delivery.actual_pickup_time else None,
-                "delivered_at": delivery.actual_delivery_time.isoformat() if delivery.actual_delivery_time else None,
-                "estimated_pickup_time": delivery.estimated_pickup_time.isoformat() if delivery.estimated_pickup_time else None,
-                "estimated_delivery_time": delivery.estimated_delivery_time.isoformat() if delivery.estimated_delivery_time else None,
-                "distance_km": float(delivery.distance_km) if delivery.distance_km else None
-            }
-    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
-    vendor_commission_rate = float(vendor.commission_rate) if vendor and vendor.commission_rate is not None else None
-    gross = _decimal(order.gross_sales)
-    # Show commission from vendor's current Admin rate so vendor portal matches Admin
-    if vendor_commission_rate is not None and gross is not None:
-        commission_rate = vendor_commission_rate
-        commission_amount = round(gross * (vendor_commission_rate / 100), 2)
-        net_payout = round(gross - commission_amount, 2)
+            result.driver = VendorOrderDriverOut(
+                id=driver.id,
+                name=f"{driver.first_name} {driver.last_name}",
+                phone=driver.phone,
+                vehicle_type=driver.vehicle_type,
+                license_plate=driver.license_plate
+            )
     else:
-        commission_rate = _decimal(order.commission_rate)
-        commission_amount = _decimal(order.commission_amount)
-        net_payout = _decimal(order.net_payout)
-    return {
-        "id": str(order.id),
-        "order_number": order.order_number,
-        "customer_id": str(order.customer_id) if order.customer_id else None,
-        "status": order.status,
-        "delivery_method": order.delivery_method,
-        "subtotal": _decimal(order.subtotal),
-        "tax_amount": _decimal(order.tax_amount),
-        "shipping_amount": _decimal(order.shipping_amount),
-        "discount_amount": _decimal(order.discount_amount),
-        "total_amount": _decimal(order.total_amount),
-        "gross_sales": gross,
-        "commission_rate": commission_rate,
-        "commission_amount": commission_amount,
-        "net_payout": net_payout,
-        "payment_status": order.payment_status,
-        "special_instructions": order.special_instructions,
-        "customer_notes": order.customer_notes,
-        "driver_id": str(order.driver_id) if order.driver_id else None,
-        "driver": driver_info,
-        "delivery": delivery_info,
-        "ready_at": order.ready_at.isoformat() if order.ready_at else None,
-        "picked_up_at": order.picked_up_at.isoformat() if order.picked_up_at else None,
-        "delivered_at": order.delivered_at.isoformat() if order.delivered_at else None,
-        "created_at": order.created_at.isoformat() if hasattr(order.created_at, "isoformat") else order.created_at,
-        "updated_at": order.updated_at.isoformat() if order.updated_at and hasattr(order.updated_at, "isoformat") else order.updated_at,
-        "vendor_commission_rate": vendor_commission_rate,
-        "items": [
-            {
-                "id": str(item.id),
-                "product_id": str(item.product_id) if item.product_id else None,
-                "product_name": item.product_name,
-                "product_price": _decimal(item.product_price),
-                "quantity": item.quantity,
-                "subtotal": _decimal(item.subtotal),
-                "is_substituted": item.is_substituted,
-                "is_out_of_stock": item.is_out_of_stock,
-                "quantity_fulfilled": item.quantity_fulfilled
-            }
-            for item in order.items
-        ]
-    }
+        # Delivery details only once a driver is assigned
+        result.delivery = None
+    vendor_commission_rate = batch.commission_rate
+    # Show commission from vendor's current Admin rate so vendor portal matches Admin
+    if vendor_commission_rate is not None and result.gross_sales is not None:
+        result.commission_rate = vendor_commission_rate
+        result.commission_amount = round(result.gross_sales * (vendor_commission_rate / 100), 2)
+        result.net_payout = round(result.gross_sales - result.commission_amount, 2)
+    result.vendor_commission_rate = vendor_commission_rate
+    return result
+
+
+def _reloaded_response(db: Session, order, vendor_id: UUID) -> VendorOrderOut:
+    """Detail response after a committed change: the order and its items in one query."""
+    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
+    return _order_to_response(order, OrderBatch(db, [order], vendor_id))
 
 
 @router.get("/", response_model=List[OrderListResponse])
 async def get_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
+    include_total: bool = Query(False, description="Send X-Total-Count (capped)"),
     status_filter: Optional[str] = Query(None, alias="status"),
     delivery_method: Optional[str] = Query(None, description="Filter by delivery_method: pickup or delivery"),
     start_date: Optional[date] = None,
@@ -137,15 +85,9 @@ async def get_orders(
     if end_date:
         query = query.filter(func.date(Order.created_at) <= end_date)
 
-    orders = query.order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
-    order_ids = [o.id for o in orders]
-    deliveries_by_order = {}
-    try:
-        if order_ids:
-            for d in db.query(Delivery).filter(Delivery.order_id.in_(order_ids)).all():
-                deliveries_by_order[d.order_id] = d
-    except Exception:
-        pass
+    orders, next_cursor = page(keyset(query, Order.created_at, Order.id, cursor, limit, skip).all(), limit)
+    set_page_headers(response, next_cursor, db.scalar(capped_count(query)) if include_total else None)
+    batch = OrderBatch(db, orders, vendor_id)
 
     orders_list = []
     for order in orders:
@@ -154,8 +96,8 @@ async def get_orders(
         if method == "delivery":
             if order.status == "ready" and not order.driver_id:
                 delivery_status = "awaiting_driver"
-            elif order.driver_id and order.id in deliveries_by_order:
-                delivery_status = deliveries_by_order[order.id].status
+            elif order.driver_id and batch.delivery(order) is not None:
+                delivery_status = batch.delivery(order).status
             else:
                 delivery_status = order.status if order.status in ("picked_up", "delivered") else None
         order_dict = {
@@ -173,7 +115,34 @@ async def get_orders(
     return orders_list
 
 
-@router.get("/{order_id}")
+@router.post("/bulk-status", response_model=BulkStatusResponse)
+async def bulk_update_status(
+    body: BulkStatusUpdate,
+    current_vendor: dict = Depends(get_current_vendor),
+    db: Session = Depends(get_db)
+):
+    """
+    Move several orders to one status (accepted, picking, ready, picked_up or cancelled) in one
+    transaction. Orders that can't make the transition are skipped and reported per order.
+    """
+    if body.status not in order_transitions.VENDOR_TRANSITIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported status. Use one of: {', '.join(order_transitions.VENDOR_TRANSITIONS)}"
+        )
+    user_id = current_vendor.get("user_id")
+    return order_transitions.apply(
+        db,
+        Order.vendor_id == UUID(current_vendor["vendor_id"]),
+        body.order_ids,
+        body.status,
+        order_transitions.VENDOR_TRANSITIONS,
+        changed_by=UUID(str(user_id)) if user_id else None,
+        cancellation_reason=body.cancellation_reason,
+    )
+
+
+@router.get("/{order_id}", response_model=VendorOrderOut)
 async def get_order(
     order_id: str,
     current_vendor: dict = Depends(get_current_vendor),
@@ -188,10 +157,10 @@ async def get_order(
     ).first()
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
-    return _order_to_response(order, db, vendor_id)
+    return _order_to_response(order, OrderBatch(db, [order], vendor_id))
 
 
-@router.put("/{order_id}/accept")
+@router.put("/{order_id}/accept", response_model=VendorOrderOut)
 async def accept_order(
     order_id: str,
     current_vendor: dict = Depends(get_current_vendor),
@@ -228,14 +197,12 @@ async def accept_order(
         notes="Order accepted by vendor"
     )
     db.add(status_history)
-    
+
     db.commit()
-    db.refresh(order)
-    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
-    return _order_to_response(order, db, UUID(current_vendor["vendor_id"]))
+    return _reloaded_response(db, order, UUID(current_vendor["vendor_id"]))
 
 
-@router.put("/{order_id}/start-picking")
+@router.put("/{order_id}/start-picking", response_model=VendorOrderOut)
 async def start_picking(
     order_id: str,
     current_vendor: dict = Depends(get_current_vendor),
@@ -267,12 +234,10 @@ async def start_picking(
     )
     db.add(status_history)
     db.commit()
-    db.refresh(order)
-    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
-    return _order_to_response(order, db, UUID(current_vendor["vendor_id"]))
+    return _reloaded_response(db, order, UUID(current_vendor["vendor_id"]))
 
 
-@router.put("/{order_id}/mark-ready")
+@router.put("/{order_id}/mark-ready", response_model=VendorOrderOut)
 async def mark_order_ready(
     order_id: str,
     current_vendor: dict = Depends(get_current_vendor),
@@ -305,12 +270,10 @@ async def mark_order_ready(
     )
     db.add(status_history)
     db.commit()
-    db.refresh(order)
-    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
-    return _order_to_response(order, db, UUID(current_vendor["vendor_id"]))
+    return _reloaded_response(db, order, UUID(current_vendor["vendor_id"]))
 
 
-@router.put("/{order_id}/complete")
+@router.put("/{order_id}/complete", response_model=VendorOrderOut)
 async def complete_order(
     order_id: str,
     current_vendor: dict = Depends(get_current_vendor),
@@ -353,12 +316,10 @@ async def complete_order(
     )
     db.add(status_history)
     db.commit()
-    db.refresh(order)
-    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
-    return _order_to_response(order, db, UUID(current_vendor["vendor_id"]))
+    return _reloaded_response(db, order, UUID(current_vendor["vendor_id"]))
 
 
-@router.put("/{order_id}/cancel")
+@router.put("/{order_id}/cancel", response_model=VendorOrderOut)
 async def cancel_order(
     order_id: str,
     cancellation_reason: Optional[str] = None,
@@ -394,12 +355,10 @@ async def cancel_order(
     )
     db.add(status_history)
     db.commit()
-    db.refresh(order)
-    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
-    return _order_to_response(order, db, UUID(current_vendor["vendor_id"]))
+    return _reloaded_response(db, order, UUID(current_vendor["vendor_id"]))
 
 
-@router.put("/{order_id}")
+@router.put("/{order_id}", response_model=VendorOrderOut)
 async def update_order(
     order_id: str,
     order_update: OrderUpdate,
@@ -419,7 +378,5 @@ async def update_order(
     for field, value in update_data.items():
         setattr(order, field, value)
     db.commit()
-    db.refresh(order)
-    order = db.query(Order).options(joinedload(Order.items)).filter(Order.id == order.id).first()
-    return _order_to_response(order, db, UUID(current_vendor["vendor_id"]))
+    return _reloaded_response(db, order, UUID(current_vendor["vendor_id"]))
 
@@ -2,18 +2,19 @@
 Payment processing endpoints: Stripe and Helcim.
 Stripe works embedded (no iframe blocking); Helcim can block on some origins.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 from decimal import Decimal
 from uuid import UUID
-import httpx
+import hashlib
 import json
-import stripe
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_async_db
 from app.core.config import settings
 from app.api.v1.dependencies import get_current_customer
 from app.models.order import Order
+from app.services import idempotency, stock_reservations
 
 router = APIRouter()
 
@@ -24,7 +25,7 @@ HELCIM_API_URL = settings.HELCIM_API_URL or "https://api.helcim.com/v2"
 @router.get("/config")
 async def get_payment_config(db: Session = Depends(get_db)):
     """Get payment configuration (gateway, enabled gateways, and whether payments are suspended on customer side)."""
-    from app.models.platform_settings import PlatformSettings
+    from app.core.refdata import platform_settings
     gateway = (settings.PAYMENT_GATEWAY or "stripe").lower()
     sk = (settings.STRIPE_SECRET_KEY or "")
     res = {
@@ -34,9 +35,9 @@ async def get_payment_config(db: Session = Depends(get_db)):
         "test_mode": getattr(settings, "HELCIM_TEST_MODE", False),
         "payments_suspended": False,
     }
-    payment_settings = db.query(PlatformSettings).filter(PlatformSettings.setting_type == "payment").first()
-    if payment_settings and isinstance(getattr(payment_settings, "settings_data", None), dict):
-        res["payments_suspended"] = bool(payment_settings.settings_data.get("payments_suspended", False))
+    payment_settings = platform_settings(db, "payment")
+    if payment_settings and isinstance(payment_settings["settings"], dict):
+        res["payments_suspended"] = bool(payment_settings["settings"].get("payments_suspended", False))
     if settings.STRIPE_PUBLISHABLE_KEY:
         res["stripe_publishable_key"] = settings.STRIPE_PUBLISHABLE_KEY
     if sk:
@@ -48,13 +49,15 @@ async def get_payment_config(db: Session = Depends(get_db)):
 async def create_payment_intent(
     order_data: dict,
     current_customer: dict = Depends(get_current_customer),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a payment intent for the requested gateway (or configured default).
     - Stripe: returns client_secret and payment_intent_id for Stripe.js / Elements.
     - Helcim: returns checkoutToken and secretToken for HelcimPay.js iframe.
     Request body may include "gateway": "stripe" | "helcim" to match the customer's choice on checkout.
+    With "items" (the checkout cart), their stock is held for the customer until checkout or
+    "reservation_expires_at" (400 if not available, and no intent is created).
     """
     requested = (order_data.get("gateway") or "").strip().lower()
     gateway = requested if requested in ("stripe", "helcim") else (settings.PAYMENT_GATEWAY or "stripe").lower()
@@ -66,10 +69,41 @@ async def create_payment_intent(
 
     print(f"[Payments] create-payment-intent called: gateway={gateway}, amount_cents={amount_cents}")
 
+    customer_id = UUID(current_customer["customer_id"])
+    quantities = {}
+    for item in order_data.get("items") or []:
+        if item.get("product_id") and int(item.get("quantity", 1)) >= 1:
+            product_id = UUID(item["product_id"])
+            quantities[product_id] = quantities.get(product_id, 0) + int(item.get("quantity", 1))
+
+    # Hold the stock before the customer pays for it
+    reserved_until = None
+    if quantities:
+        try:
+            reserved_until = await stock_reservations.reserve(db, customer_id, quantities)
+        except stock_reservations.InsufficientStock as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        intent = await _create_gateway_intent(gateway, order_data, total_amount, amount_cents)
+    except Exception:
+        if reserved_until is not None:
+            await stock_reservations.release(db, customer_id)
+        raise
+    if reserved_until is not None:
+        intent["reservation_expires_at"] = reserved_until.isoformat()
+    return intent
+
+
+async def _create_gateway_intent(gateway: str, order_data: dict, total_amount, amount_cents: int) -> dict:
+    """Stripe PaymentIntent or HelcimPay.js session for the amount"""
+    import httpx  # deferred: payment clients are only imported on first use
+
     # ----- Stripe -----
     if gateway == "stripe":
         if not settings.STRIPE_SECRET_KEY:
             raise HTTPException(status_code=503, detail="Stripe is not configured. Please contact support.")
+        import stripe
         stripe.api_key = settings.STRIPE_SECRET_KEY
         try:
             intent = stripe.PaymentIntent.create(
@@ -103,7 +137,6 @@ async def create_payment_intent(
         )
     
     try:
-        customer_id = UUID(current_customer["customer_id"])
         amount = round(float(order_data.get("total_amount", 0)), 2)
         
         headers = {
@@ -164,7 +197,6 @@ async def create_payment_intent(
 
 def _validate_helcim_hash(raw_data: dict, secret_token: str, helcim_hash: str) -> bool:
     """Validate HelcimPay.js transaction response hash (sha256(json_data + secretToken))."""
-    import hashlib
     # Try canonical JSON (sort_keys) first; some integrations use key order from response
     for sort_keys in (True, False):
         cleaned = json.dumps(raw_data, separators=(",", ":"), sort_keys=sort_keys)
@@ -224,12 +256,25 @@ async def validate_helcim_response(
 async def process_payment(
     payment_data: dict,
     request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_customer: dict = Depends(get_current_customer),
     db: Session = Depends(get_db)
 ):
     """
-    Process a payment with Helcim using card token
+    Process a payment with Helcim using card token.
+    With an Idempotency-Key header, a retried request returns the first one's result without
+    charging again (the key is also passed on to Helcim).
     """
+    return await idempotency.run(
+        "helcim_payment", current_customer["customer_id"], idempotency_key, payment_data,
+        lambda: _process_payment(payment_data, request, current_customer, db, idempotency_key), response
+    )
+
+
+async def _process_payment(payment_data: dict, request: Request, current_customer: dict, db: Session,
+                           client_key: Optional[str]) -> dict:
+    import httpx
     if settings.PAYMENT_GATEWAY != "helcim":
         raise HTTPException(
             status_code=400,
@@ -272,8 +317,12 @@ async def process_payment(
         
         import uuid
         
-        # Generate idempotency key (required by Helcim API v2)
-        idempotency_key = str(uuid.uuid4()).replace("-", "")[:25]
+        # Idempotency key (required by Helcim API v2, 25 characters): derived from the client's
+        # Idempotency-Key so Helcim also refuses a second charge for it, else random
+        if client_key:
+            idempotency_key = hashlib.sha256(f"{current_customer['customer_id']}:{client_key}".encode()).hexdigest()[:25]
+        else:
+            idempotency_key = str(uuid.uuid4()).replace("-", "")[:25]
         
         headers = {
             "api-token": settings.HELCIM_API_TOKEN,
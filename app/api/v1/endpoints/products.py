@@ -154,7 +154,9 @@ async def get_categories(
 ):
     """Get all categories for vendor product form (no auth required)."""
     from sqlalchemy import text
-    try:
+    from app.core.refdata import reference_data
+
+    def load():
         result = db.execute(text("""
             SELECT id, name, slug, description, image_url
             FROM categories
@@ -176,6 +178,9 @@ async def get_categories(
             except Exception:
                 continue
         return categories_list
+
+    try:
+        return reference_data.get_or_load("categories", "vendor_form", load)
     except Exception as e:
         import traceback
         print(f"ERROR fetching categories: {e}\n{traceback.format_exc()}")
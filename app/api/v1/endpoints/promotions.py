@@ -8,29 +8,40 @@ from datetime import datetime
 from app.core.database import get_db
 from app.models.promotion import Promotion
 from app.models.product import Product
-from app.schemas.promotion import PromotionCreate, PromotionUpdate, PromotionResponse
+from app.schemas.promotion import PromotionCreate, PromotionUpdate, PromotionResponse, PromotionMaintenanceResponse
 from app.api.v1.dependencies import get_current_vendor
+from app.services.promotion_pricing import apply_promotion_to_products, revert_promotion_prices
+from app.services.promotion_index import promotion_index
 
 router = APIRouter()
 
 
-@router.post("/maintenance/revert-expired", response_model=dict)
-async def revert_expired_promotions_endpoint(
-    db: Session = Depends(get_db)
-):
-    """Maintenance endpoint to revert prices for expired promotions (can be called by cron job)"""
+@router.post("/maintenance/revert-expired", response_model=PromotionMaintenanceResponse)
+async def revert_expired_promotions_endpoint():
+    """
+    Run the promotion scheduler now: revert expired promotions and apply started ones (can be called
+    by cron job). Reports promotion and product row counts; skipped when a worker is already running it.
+    """
+    from app.services import promotion_scheduler
     try:
-        reverted_count = revert_expired_promotions(db)
-        return {
-            "message": "Expired promotions processed successfully",
-            "reverted_count": reverted_count
-        }
+        result = await promotion_scheduler.run_once_async()
     except Exception as e:
-        from fastapi import HTTPException, status
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error reverting expired promotions: {str(e)}"
         )
+    if result is None:
+        return PromotionMaintenanceResponse(
+            message="Promotion maintenance is already running on another worker",
+            skipped=True,
+        )
+    return PromotionMaintenanceResponse(
+        message="Expired promotions processed successfully",
+        reverted_count=result["reverted"],
+        applied_count=result["applied"],
+        products_reverted=result["products_reverted"],
+        products_discounted=result["products_discounted"],
+    )
 
 
 @router.get("/", response_model=List[PromotionResponse])
@@ -158,6 +169,7 @@ async def create_promotion(
     try:
         db.add(promotion)
         db.commit()
+        promotion_index.invalidate()
         db.refresh(promotion)
         
         # Apply promotion to products if approved
@@ -195,142 +207,6 @@ async def create_promotion(
         )
 
 
-def revert_promotion_prices(promotion, old_product_ids, old_applies_to_all, db):
-    """Revert prices for products that were previously affected by this promotion"""
-    from uuid import UUID
-    from decimal import Decimal
-    
-    # Get old products that were affected
-    if old_applies_to_all:
-        old_products = db.query(Product).filter(
-            Product.vendor_id == promotion.vendor_id,
-            Product.status == "active",
-            Product.compare_at_price.isnot(None)  # Only products that have compare_at_price (were discounted)
-        ).all()
-    elif old_product_ids:
-        old_products = db.query(Product).filter(
-            Product.id.in_(old_product_ids),
-            Product.vendor_id == promotion.vendor_id,
-            Product.status == "active",
-            Product.compare_at_price.isnot(None)
-        ).all()
-    else:
-        return
-    
-    # Revert prices: set price back to compare_at_price, clear compare_at_price
-    for product in old_products:
-        if product.compare_at_price:
-            product.price = product.compare_at_price
-            product.compare_at_price = None
-    
-    db.commit()
-
-
-def revert_expired_promotions(db):
-    """Check for expired promotions and revert their prices"""
-    from datetime import datetime
-    from uuid import UUID
-    
-    now = datetime.utcnow()
-    
-    # Find all promotions that have expired (end_date passed) and are approved
-    expired_promotions = db.query(Promotion).filter(
-        Promotion.end_date < now,
-        Promotion.is_active == True,  # Only check active promotions
-        Promotion.approval_status == "approved"  # Only revert approved promotions
-    ).all()
-    
-    reverted_count = 0
-    for promotion in expired_promotions:
-        # Get products that were affected by this promotion
-        if promotion.applies_to_all_products:
-            products = db.query(Product).filter(
-                Product.vendor_id == promotion.vendor_id,
-                Product.status == "active",
-                Product.compare_at_price.isnot(None)
-            ).all()
-        elif promotion.product_ids:
-            products = db.query(Product).filter(
-                Product.id.in_(promotion.product_ids),
-                Product.vendor_id == promotion.vendor_id,
-                Product.status == "active",
-                Product.compare_at_price.isnot(None)
-            ).all()
-        else:
-            continue
-        
-        # Revert prices for these products
-        for product in products:
-            if product.compare_at_price:
-                product.price = product.compare_at_price
-                product.compare_at_price = None
-        
-        # Mark promotion as inactive
-        promotion.is_active = False
-        reverted_count += 1
-    
-    if reverted_count > 0:
-        db.commit()
-    
-    return reverted_count
-
-
-def apply_promotion_to_products(promotion, db):
-    """Apply promotion discount to products"""
-    from uuid import UUID
-    from decimal import Decimal
-    from datetime import datetime
-    
-    # Only apply if promotion is active, approved, and within date range
-    now = datetime.utcnow()
-    if not (promotion.is_active and promotion.approval_status == "approved" and now >= promotion.start_date and now <= promotion.end_date):
-        return
-    
-    # Get products to apply promotion to
-    if promotion.applies_to_all_products:
-        products = db.query(Product).filter(
-            Product.vendor_id == promotion.vendor_id,
-            Product.status == "active"
-        ).all()
-    elif promotion.product_ids:
-        # product_ids is already an array of UUIDs, use directly
-        products = db.query(Product).filter(
-            Product.id.in_(promotion.product_ids),
-            Product.vendor_id == promotion.vendor_id,
-            Product.status == "active"
-        ).all()
-    else:
-        return
-    
-    # Apply discount to each product
-    for product in products:
-        # Get the base price (use compare_at_price if exists, otherwise use current price)
-        # This handles cases where product was already discounted by another promotion
-        base_price = float(product.compare_at_price) if product.compare_at_price else float(product.price)
-        
-        if promotion.discount_type == "percentage" and promotion.discount_value:
-            discount_amount = base_price * (float(promotion.discount_value) / 100)
-            new_price = base_price - discount_amount
-        elif promotion.discount_type == "fixed_amount" and promotion.discount_value:
-            new_price = base_price - float(promotion.discount_value)
-        else:
-            continue
-        
-        # Ensure price doesn't go negative
-        if new_price < 0:
-            new_price = 0
-        
-        # Update product: set compare_at_price to base price, price to discounted
-        # This way customer sees the discount
-        if not product.compare_at_price or float(product.compare_at_price) < base_price:
-            product.compare_at_price = Decimal(str(base_price))
-        
-        # Always update price to discounted price
-        product.price = Decimal(str(new_price))
-    
-    db.commit()
-
-
 @router.get("/{promotion_id}", response_model=PromotionResponse)
 async def get_promotion(
     promotion_id: str,
@@ -413,6 +289,7 @@ async def update_promotion(
     
     try:
         db.commit()
+        promotion_index.invalidate()
         db.refresh(promotion)
         
         # First, revert prices for old products if promotion scope changed
@@ -481,5 +358,6 @@ async def delete_promotion(
     
     db.delete(promotion)
     db.commit()
+    promotion_index.invalidate()
     return None
 
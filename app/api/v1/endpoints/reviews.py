@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
 from app.models.review import Review
+from app.models.vendor import Vendor
 from app.schemas.review import ReviewResponse, ReviewResponseUpdate
 from app.api.v1.dependencies import get_current_vendor
 
@@ -154,24 +155,16 @@ async def get_review_stats(
     
     vendor_id = UUID(current_vendor["vendor_id"])
     
-    total_reviews = db.query(func.count(Review.id)).filter(
-        Review.vendor_id == vendor_id,
-        Review.is_public == True
-    ).scalar() or 0
+    # Totals are denormalized on the vendor (app/services/ratings.py)
+    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
+    total_reviews = (vendor.total_reviews or 0) if vendor else 0
+    avg_rating = vendor.average_rating if vendor and total_reviews else 0
     
-    avg_rating = db.query(func.avg(Review.rating)).filter(
+    rating_distribution = {rating: 0 for rating in range(1, 6)}
+    rating_distribution.update(db.query(Review.rating, func.count(Review.id)).filter(
         Review.vendor_id == vendor_id,
         Review.is_public == True
-    ).scalar() or 0
-    
-    rating_distribution = {}
-    for rating in range(1, 6):
-        count = db.query(func.count(Review.id)).filter(
-            Review.vendor_id == vendor_id,
-            Review.rating == rating,
-            Review.is_public == True
-        ).scalar() or 0
-        rating_distribution[rating] = count
+    ).group_by(Review.rating).all())
     
     return {
         "total_reviews": total_reviews,
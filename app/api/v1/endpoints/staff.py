@@ -8,7 +8,7 @@ from app.core.database import get_db
 from app.models.vendor import VendorUser
 from app.core.security import get_password_hash
 from app.schemas.staff import StaffCreate, StaffUpdate, StaffResponse
-from app.api.v1.dependencies import get_current_vendor
+from app.api.v1.dependencies import get_current_vendor, invalidate_principal
 
 router = APIRouter()
 
@@ -218,5 +218,6 @@ async def delete_staff(
     
     db.delete(staff)
     db.commit()
+    invalidate_principal("vendor", staff_id)
     return None
 
@@ -21,14 +21,18 @@ def _upload_url(path: str) -> str:
     return f"{base}{path}" if base else path
 
 
-# Create upload directories if they don't exist
+# Upload directories are created on first write, not at import (keeps cold start free of disk I/O)
 UPLOAD_BASE_DIR = Path(settings.UPLOAD_DIR)
 PRODUCT_UPLOAD_DIR = UPLOAD_BASE_DIR / "products"
-PRODUCT_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 ADS_UPLOAD_DIR = UPLOAD_BASE_DIR / "ads"
-ADS_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 RECIPES_UPLOAD_DIR = UPLOAD_BASE_DIR / "recipes"
-RECIPES_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+CHEF_UPLOAD_DIR = UPLOAD_BASE_DIR / "chefs"
+
+
+def _upload_path(directory: Path, filename: str) -> Path:
+    """Path for a new upload, creating its directory if needed."""
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / filename
 
 
 @router.post("/products", response_model=dict)
@@ -57,7 +61,7 @@ async def upload_product_image(
     # Generate unique filename
     file_ext = Path(file.filename).suffix or ".jpg"
     unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = PRODUCT_UPLOAD_DIR / unique_filename
+    file_path = _upload_path(PRODUCT_UPLOAD_DIR, unique_filename)
     
     # Save file
     try:
@@ -108,7 +112,7 @@ async def upload_multiple_product_images(
         # Generate unique filename
         file_ext = Path(file.filename).suffix or ".jpg"
         unique_filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = PRODUCT_UPLOAD_DIR / unique_filename
+        file_path = _upload_path(PRODUCT_UPLOAD_DIR, unique_filename)
         
         # Save file
         try:
@@ -179,7 +183,7 @@ async def upload_ad_media(
     # Generate unique filename
     file_ext = Path(file.filename).suffix or (".mp4" if file.content_type in allowed_video_types else ".jpg")
     unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = ADS_UPLOAD_DIR / unique_filename
+    file_path = _upload_path(ADS_UPLOAD_DIR, unique_filename)
     
     # Save file
     try:
@@ -253,7 +257,7 @@ async def upload_recipe_image(
         )
     file_ext = Path(file.filename).suffix or ".jpg"
     unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = RECIPES_UPLOAD_DIR / unique_filename
+    file_path = _upload_path(RECIPES_UPLOAD_DIR, unique_filename)
     try:
         with open(file_path, "wb") as f:
             f.write(file_content)
@@ -280,10 +284,6 @@ async def get_recipe_image(filename: str):
     return FileResponse(path=str(file_path), media_type="image/jpeg")
 
 
-# Create chef upload directory
-CHEF_UPLOAD_DIR = UPLOAD_BASE_DIR / "chefs"
-CHEF_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 
 @router.post("/image", response_model=dict)
 @router.post("/chefs", response_model=dict)
@@ -312,7 +312,7 @@ async def upload_image(
     # Generate unique filename
     file_ext = Path(file.filename).suffix or ".jpg"
     unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = CHEF_UPLOAD_DIR / unique_filename
+    file_path = _upload_path(CHEF_UPLOAD_DIR, unique_filename)
     
     # Save file
     try:
@@ -1,7 +1,7 @@
 """
 Vendor chat endpoints - chat with admin and driver
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from typing import List, Optional
@@ -10,6 +10,7 @@ from uuid import UUID
 from app.core.database import get_db
 from app.models.chat import ChatMessage
 from app.api.v1.dependencies import get_current_vendor
+from app.api.v1.pagination import keyset, page, set_page_headers
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -84,10 +85,12 @@ async def send_message(
 
 @router.get("/messages", response_model=List[ChatMessageResponse])
 async def get_messages(
+    response: Response,
     recipient_type: Optional[str] = Query(None, description="Filter by recipient type: 'admin' or 'driver'"),
     recipient_id: Optional[str] = Query(None, description="Filter by specific recipient ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset paging; skip is ignored)"),
     current_vendor: dict = Depends(get_current_vendor),
     db: Session = Depends(get_db)
 ):
@@ -143,7 +146,10 @@ async def get_messages(
             )
         )
     
-    messages = query.order_by(ChatMessage.created_at.asc()).offset(skip).limit(limit).all()
+    messages, next_cursor = page(
+        keyset(query, ChatMessage.created_at, ChatMessage.id, cursor, limit, skip, descending=False).all(), limit
+    )
+    set_page_headers(response, next_cursor)
     
     # Mark messages as read
     for msg in messages:
@@ -11,23 +11,22 @@ from app.core.database import get_db
 from app.models.order import Order
 from app.models.driver import Driver, Delivery
 from app.models.vendor import Vendor
-from app.models.customer import Customer
 from app.api.v1.dependencies import get_current_vendor
+from app.services.order_enrichment import OrderBatch
 
 router = APIRouter()
 
 
-def _delivery_row(order, delivery, db: Session):
+def _delivery_row(order, delivery, batch: OrderBatch):
     """Build a single delivery list row from Order and optional Delivery."""
     customer_name = None
     customer_phone = None
-    if order.customer_id:
-        customer = db.query(Customer).filter(Customer.id == order.customer_id).first()
-        if customer:
-            customer_name = f"{customer.first_name} {customer.last_name}"
-            customer_phone = customer.phone
+    customer = batch.customer(order.customer_id)
+    if customer:
+        customer_name = f"{customer.first_name} {customer.last_name}"
+        customer_phone = customer.phone
     if delivery:
-        driver = db.query(Driver).filter(Driver.id == delivery.driver_id).first()
+        driver = batch.driver(delivery.driver_id)
         return {
             "id": str(delivery.id),
             "order_id": str(delivery.order_id),
@@ -79,6 +78,12 @@ def _delivery_row(order, delivery, db: Session):
     }
 
 
+def _created_at(order, delivery) -> str:
+    """The row's created_at as _delivery_row returns it ("" when unknown)."""
+    created_at = delivery.created_at if delivery else order.ready_at
+    return created_at.isoformat() if created_at else ""
+
+
 @router.get("/", response_model=List[dict])
 async def get_vendor_deliveries(
     skip: int = 0,
@@ -102,39 +107,31 @@ async def get_vendor_deliveries(
         .order_by(Order.ready_at.desc().nullslast())
         .all()
     )
-    # 2) Deliveries (orders that have a Delivery record)
+    # 2) Deliveries (orders that have a Delivery record), each with its order
     delivery_query = (
-        db.query(Delivery)
+        db.query(Delivery, Order)
         .join(Order, Delivery.order_id == Order.id)
         .filter(Order.vendor_id == vendor_id)
     )
     if status_filter and status_filter not in (None, "all", "awaiting_driver"):
         delivery_query = delivery_query.filter(Delivery.status == status_filter)
-    all_deliveries = delivery_query.order_by(Delivery.created_at.desc()).all()
-    orders_with_delivery = {d.order_id: d for d in all_deliveries}
+    delivered = delivery_query.order_by(Delivery.created_at.desc()).all()
+    orders_with_delivery = {d.order_id for d, _ in delivered}
+    awaiting = [(order, None) for order in awaiting_orders if order.id not in orders_with_delivery]
 
-    result = []
     if status_filter == "awaiting_driver":
-        for order in awaiting_orders:
-            if order.id not in orders_with_delivery:
-                result.append(_delivery_row(order, None, db))
-        return result[skip : skip + limit]
-    if status_filter and status_filter not in (None, "all"):
-        for delivery in all_deliveries:
-            order = db.query(Order).filter(Order.id == delivery.order_id).first()
-            if order:
-                result.append(_delivery_row(order, delivery, db))
-        return result[skip : skip + limit]
-    # All: combine awaiting_driver + assigned deliveries, sort by date desc, then paginate
-    for order in awaiting_orders:
-        if order.id not in orders_with_delivery:
-            result.append(_delivery_row(order, None, db))
-    for delivery in all_deliveries:
-        order = db.query(Order).filter(Order.id == delivery.order_id).first()
-        if order:
-            result.append(_delivery_row(order, delivery, db))
-    result.sort(key=lambda r: (r["created_at"] or ""), reverse=True)
-    return result[skip : skip + limit]
+        rows = awaiting
+    elif status_filter and status_filter not in (None, "all"):
+        rows = [(order, delivery) for delivery, order in delivered]
+    else:
+        # All: combine awaiting_driver + assigned deliveries, sort by date desc (row created_at)
+        rows = awaiting + [(order, delivery) for delivery, order in delivered]
+        rows.sort(key=lambda row: _created_at(*row), reverse=True)
+    rows = rows[skip : skip + limit]
+
+    # Customers and drivers of the page: one query each
+    batch = OrderBatch(db, [order for order, _ in rows], vendor_id, deliveries=[d for _, d in rows if d])
+    return [_delivery_row(order, delivery, batch) for order, delivery in rows]
 
 
 @router.get("/stats", response_model=dict)
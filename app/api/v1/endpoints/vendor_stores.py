@@ -11,6 +11,7 @@ from app.core.database import get_db
 from app.models.store import Store
 from app.models.vendor import Vendor
 from app.api.v1.dependencies import get_current_vendor
+from app.core.refdata import reference_data
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -200,6 +201,7 @@ async def create_store(
     
     db.add(store)
     db.commit()
+    reference_data.invalidate("stores")
     db.refresh(store)
     
     return {
@@ -285,6 +287,7 @@ async def update_store(
         store.is_primary = False
     
     db.commit()
+    reference_data.invalidate("stores")
     db.refresh(store)
     
     return {"message": "Store updated successfully"}
@@ -322,6 +325,7 @@ async def delete_store(
     
     db.delete(store)
     db.commit()
+    reference_data.invalidate("stores")
     
     return {"message": "Store deleted successfully"}
 
@@ -7,6 +7,7 @@ from app.core.database import get_db
 from app.models.vendor import Vendor
 from app.schemas.vendor import VendorResponse, VendorUpdate
 from app.api.v1.dependencies import get_current_vendor
+from app.core.refdata import reference_data
 
 router = APIRouter()
 
@@ -108,6 +109,7 @@ async def update_vendor_info(
         vendor.go_live_at = datetime.utcnow()
     
     db.commit()
+    reference_data.invalidate("vendors", "stores")
     db.refresh(vendor)
     
     # Convert to response format
@@ -0,0 +1,103 @@
+"""
+Keyset (cursor) pagination for listings sorted by (created_at, id)
+
+Offset paging makes Postgres read and discard `skip` rows on every deep page. A cursor encodes the
+sort key of the last row served, so the next page is an index range scan that starts right after it:
+
+    GET /api/v1/admin/orders?limit=50                       -> rows + next cursor
+    GET /api/v1/admin/orders?limit=50&cursor=<next cursor>  -> the following 50
+
+`skip` keeps working for existing clients and is ignored when `cursor` is given. List responses carry
+the cursor in the X-Next-Cursor header (absent on the last page); dict responses in "next_cursor".
+Totals are opt-in (`include_total=true`) and counted up to PAGINATION_TOTAL_CAP rows.
+Rows with a NULL created_at never match a cursor and only show up on offset pages.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, select, tuple_
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_CAPPED_HEADER = "X-Total-Count-Capped"
+# For CORSMiddleware(expose_headers=...): browsers hide other response headers from scripts
+PAGINATION_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_CAPPED_HEADER]
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset(query, created_at_column, id_column, cursor: Optional[str], limit: int, skip: int = 0,
+           descending: bool = True):
+    """
+    Order `query` (a Query or a select()) by (created_at, id) and fetch one row past `limit`,
+    starting after `cursor` if given, else after `skip` rows. Pass the rows to page() to split
+    off the next cursor.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        key = tuple_(created_at_column, id_column)
+        query = query.where(key < (created_at, row_id) if descending else key > (created_at, row_id))
+    if descending:
+        query = query.order_by(created_at_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(created_at_column.asc(), id_column.asc())
+    query = query.limit(limit + 1)
+    return query if cursor or not skip else query.offset(skip)
+
+
+def page(rows: list, limit: int, key=lambda row: row) -> Tuple[list, Optional[str]]:
+    """(first `limit` rows, cursor after the last of them or None on the last page)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = key(rows[-1])
+    if last.created_at is None:
+        return rows, None
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def capped_count(query, cap: Optional[int] = None):
+    """
+    select() counting at most cap + 1 rows of `query` (a Query or a select() without eager loads):
+    beyond the cap, how many more rows there are isn't worth a full scan.
+    """
+    cap = settings.PAGINATION_TOTAL_CAP if cap is None else cap
+    statement = getattr(query, "statement", query).order_by(None).limit(cap + 1)
+    return select(func.count()).select_from(statement.subquery())
+
+
+def total_fields(count: int, cap: Optional[int] = None) -> dict:
+    """{"total": ..., "total_capped": ...} for dict responses."""
+    cap = settings.PAGINATION_TOTAL_CAP if cap is None else cap
+    return {"total": min(count, cap), "total_capped": count > cap}
+
+
+def set_page_headers(response: Response, next_cursor: Optional[str], count: Optional[int] = None,
+                     cap: Optional[int] = None) -> None:
+    """Cursor (and total, when counted) for list responses."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if count is not None:
+        totals = total_fields(count, cap)
+        response.headers[TOTAL_COUNT_HEADER] = str(totals["total"])
+        if totals["total_capped"]:
+            response.headers[TOTAL_CAPPED_HEADER] = "true"
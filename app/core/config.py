@@ -16,6 +16,30 @@ class Settings(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASSWORD: str = ""
     
+    # Read replica for GET-only reporting/catalog routes (get_read_db); unset = everything on the primary
+    DATABASE_READ_URL: Optional[str] = None
+    DB_READ_MAX_LAG_SECONDS: float = 10.0  # fall back to the primary when the replica is further behind
+    DB_READ_LAG_CHECK_SECONDS: float = 5.0  # how often each worker measures replica lag
+    DB_READ_CONNECT_TIMEOUT_SECONDS: int = 3  # an unreachable replica fails fast and reads fall back
+    
+    # Connection pools (per engine; each worker has a sync and an async engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30  # wait for a free connection before erroring
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # replace connections older than this (-1 = never)
+    # Total connections this instance may open; when set, overrides DB_POOL_SIZE/DB_MAX_OVERFLOW and is
+    # split across WEB_CONCURRENCY workers and their two engines
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    WEB_CONCURRENCY: int = 1  # uvicorn/gunicorn worker count (Render sets this env var)
+    # "queue" = SQLAlchemy pool; "null" = no client pool, a connection per session (let PgBouncer pool)
+    DB_POOL_MODE: str = "queue"
+    # Behind PgBouncer in transaction mode: disable asyncpg server-side prepared statement caches
+    DB_PGBOUNCER: bool = False
+    # Liveness check at checkout: "always" (pool_pre_ping, a round trip per checkout),
+    # "idle" (only connections idle >= DB_PRE_PING_IDLE_SECONDS) or "off" (rely on pool_recycle)
+    DB_PRE_PING: str = "idle"
+    DB_PRE_PING_IDLE_SECONDS: int = 30
+    
     # Application
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
@@ -54,6 +78,68 @@ class Settings(BaseSettings):
     # Google OAuth (for Sign in with Google on customer/vendor/chef/driver)
     GOOGLE_OAUTH_CLIENT_ID: Optional[str] = None
     
+    # Authenticated-principal cache (skips the per-request user lookup in get_current_*; 0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Prometheus-style /metrics endpoint (per-route latency, SQL counts, pool gauges). Off by default:
+    # it exposes route, pool and replica details; when on, scrapers must send "Authorization: Bearer
+    # <METRICS_TOKEN>" (leave the token empty only if /metrics is reachable from the internal network alone)
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+    
+    # N+1 query detection: "off", "warn" (log repeated statement shapes + call sites) or "strict" (raise)
+    NPLUSONE_MODE: str = "off"
+    NPLUSONE_THRESHOLD: int = 5
+    # Make Order.vendor / Product.vendor / OrderItem.product lazy="raise" (tests/staging): lazy per-row loads fail loudly
+    ORM_LAZY_RAISE: bool = False
+    
+    # Import endpoint modules per route group on first request instead of at startup (fast cold start)
+    LAZY_ROUTERS: bool = False
+    
+    # Listing totals (include_total / cursor pages) stop counting past this many rows and report the cap
+    PAGINATION_TOTAL_CAP: int = 10000
+    
+    # Product search: "ilike" (legacy scan) or "fulltext" (tsvector + pg_trgm); switch to fulltext only
+    # once migrations/add_product_search.sql has run, or every product search fails
+    PRODUCT_SEARCH_MODE: str = "ilike"
+    
+    # /customer/products?facets=... counts, cached per filter combination (0 disables)
+    PRODUCT_FACETS_CACHE_TTL_SECONDS: int = 30
+    PRODUCT_FACETS_CACHE_MAX_ENTRIES: int = 2000
+    
+    # Categories, stores, vendors and platform settings (app/core/refdata.py); writes invalidate immediately
+    REFDATA_CACHE_TTL_SECONDS: int = 300
+    REFDATA_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Promotion start/end price changes (app/services/promotion_scheduler.py): one worker at a time via
+    # a scheduler_leases row, waking at the next boundary or after this many seconds at most
+    PROMOTION_SCHEDULER_ENABLED: bool = True
+    PROMOTION_SCHEDULER_INTERVAL_SECONDS: int = 60
+    # Lease length: longer than any run (a longer run could overlap the next worker's; both are idempotent)
+    PROMOTION_SCHEDULER_LEASE_SECONDS: int = 600
+    # Promotion price changes update at most this many products per statement (and transaction)
+    PROMOTION_PRICE_CHUNK_SIZE: int = 5000
+    # Active-promotion index for the storefront (app/services/promotion_index.py); writes rebuild it at once
+    PROMOTION_INDEX_TTL_SECONDS: int = 60
+    
+    # Stock held per customer from payment-intent creation until checkout (app/services/stock_reservations.py)
+    STOCK_RESERVATION_TTL_SECONDS: int = 600
+    # Background sweep marking expired holds (availability ignores them at once either way)
+    STOCK_RESERVATION_SWEEP_INTERVAL_SECONDS: int = 30
+    # Per-worker index of held units for storefront availability; this worker's writes refresh it at once
+    STOCK_RESERVATION_INDEX_TTL_SECONDS: int = 5
+    
+    # Idempotency-Key on checkout and payments (app/services/idempotency.py): how long a key's result is kept
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    # A retry arriving while the first request still runs waits this long for its result (then 409)
+    IDEMPOTENCY_WAIT_SECONDS: int = 30
+    # An in-progress key not completed after this long is taken to be abandoned (worker died) and re-run
+    IDEMPOTENCY_LOCK_SECONDS: int = 120
+    # Per-worker LRU of completed results in front of the table
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_CACHE_TTL_SECONDS: int = 600
+    
     # Debug
     DEBUG: bool = False
 
@@ -2,10 +2,17 @@
 Database connection and session management
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from urllib.parse import quote_plus
+import uuid
+from typing import Optional
 from app.core.config import settings
+from app.core.metrics import instrument_engine, registered_engines
+from app.core.pool import ReplicaMonitor, install_idle_ping, pool_status
+from app.core.nplusone import install_nplusone_detector
 
 # Use DATABASE_URL if set (e.g. Render, Railway), otherwise build from DB_* vars
 if getattr(settings, "DATABASE_URL", None):
@@ -14,20 +21,117 @@ else:
     encoded_password = quote_plus(settings.DB_PASSWORD)
     DATABASE_URL = f"postgresql://{settings.DB_USER}:{encoded_password}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
-# Create engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,
-    max_overflow=20
-)
+
+def to_async_url(url: str) -> str:
+    """
+    Rewrite a sync Postgres URL (postgres://, postgresql://, postgresql+psycopg2://)
+    for the asyncpg driver. asyncpg takes `ssl=` instead of libpq's `sslmode=`.
+    """
+    _, rest = url.split("://", 1)
+    return f"postgresql+asyncpg://{rest}".replace("sslmode=", "ssl=")
+
+
+def pool_sizing(workers: int) -> tuple:
+    """
+    (pool_size, max_overflow) per engine. With DB_MAX_CONNECTIONS set, that budget is shared by
+    all workers of the instance and by the sync and async engines of each worker, so adding
+    workers never overruns Postgres max_connections. Otherwise DB_POOL_SIZE / DB_MAX_OVERFLOW apply.
+    """
+    if settings.DB_MAX_CONNECTIONS:
+        per_engine = max(2, settings.DB_MAX_CONNECTIONS // max(1, workers) // 2)
+        pool_size = max(1, per_engine // 3)
+        return pool_size, per_engine - pool_size
+    return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+
+def engine_options(is_async: bool = False, connect_timeout: Optional[int] = None) -> dict:
+    """create_engine()/create_async_engine() keyword arguments from the DB_POOL_* settings."""
+    options = {"pool_pre_ping": settings.DB_PRE_PING == "always"}
+    connect_args = {}
+    if connect_timeout:
+        connect_args["timeout" if is_async else "connect_timeout"] = connect_timeout
+    if settings.DB_POOL_MODE == "null":
+        # No client-side pool: every session opens/closes a connection (PgBouncer does the pooling)
+        options["poolclass"] = NullPool
+    else:
+        pool_size, max_overflow = pool_sizing(settings.WEB_CONCURRENCY)
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    if settings.DB_PGBOUNCER and is_async:
+        # Transaction pooling hands each transaction a different server connection, so asyncpg's
+        # server-side prepared statements would be missing or collide: disable the caches and give
+        # any statement asyncpg still prepares a unique name.
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+# Create engine (psycopg2 doesn't use server-side prepared statements, so it is PgBouncer-safe as is)
+engine = create_engine(DATABASE_URL, **engine_options())
+
+# Async engine for routes that must not block the event loop (customer catalog, checkout, driver pings)
+async_engine = create_async_engine(to_async_url(DATABASE_URL), **engine_options(is_async=True))
+
+# Optional read replica for GET-only routes; reads fall back to the primary when it lags or is down
+read_engine = async_read_engine = replica_monitor = None
+if settings.DATABASE_READ_URL:
+    read_timeout = settings.DB_READ_CONNECT_TIMEOUT_SECONDS
+    read_engine = create_engine(settings.DATABASE_READ_URL, **engine_options(connect_timeout=read_timeout))
+    async_read_engine = create_async_engine(
+        to_async_url(settings.DATABASE_READ_URL), **engine_options(is_async=True, connect_timeout=read_timeout)
+    )
+    replica_monitor = ReplicaMonitor("read", settings.DB_READ_MAX_LAG_SECONDS, settings.DB_READ_LAG_CHECK_SECONDS)
+
+# Per-request statement count / DB time, pool gauges for /metrics, idle pings, N+1 detection
+_engines = [("sync", engine), ("async", async_engine.sync_engine)]
+if read_engine is not None:
+    _engines += [("read", read_engine), ("async_read", async_read_engine.sync_engine)]
+for _name, _sync_engine in _engines:
+    instrument_engine(_sync_engine, _name)
+    if settings.DB_PRE_PING == "idle" and settings.DB_POOL_MODE != "null":
+        install_idle_ping(_sync_engine, _name, settings.DB_PRE_PING_IDLE_SECONDS)
+    install_nplusone_detector(_sync_engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: attributes can't be lazily reloaded after commit in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Replica sessions are tagged (session.info["replica"]) so code can skip writes on them
+ReadSessionLocal = AsyncReadSessionLocal = None
+if read_engine is not None:
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"replica": True})
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False, info={"replica": True}
+    )
+
+
+def all_pool_status() -> list:
+    """Pool configuration and counters for every engine of this worker."""
+    return [pool_status(name, sync_engine) for name, sync_engine in registered_engines()]
+
+
+def replica_status() -> Optional[dict]:
+    return replica_monitor.status() if replica_monitor is not None else None
+
+
 # Base class for models
 Base = declarative_base()
 
+# Loader strategy for high fan-out many-to-one relationships (Order.vendor, Product.vendor, ...).
+# ORM_LAZY_RAISE=true turns an accidental per-row lazy load into an error instead of an N+1.
+RELATIONSHIP_LAZY = "raise" if settings.ORM_LAZY_RAISE else "select"
+
 
 def get_db():
     """
@@ -40,3 +144,40 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+    Use this in `async def` routes so queries await instead of blocking the event loop.
+    Lazy relationship loads are not available: use selectinload/joinedload or explicit queries.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """
+    Dependency for GET-only routes: a session on the read replica (DATABASE_READ_URL) when it is
+    reachable and within DB_READ_MAX_LAG_SECONDS, otherwise on the primary. Never write with it.
+    """
+    factory = SessionLocal
+    if replica_monitor is not None:
+        replica_monitor.refresh(read_engine)
+        if replica_monitor.route():
+            factory = ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """Async counterpart of get_read_db for `async def` routes on AsyncSession."""
+    factory = AsyncSessionLocal
+    if replica_monitor is not None:
+        await replica_monitor.refresh_async(async_read_engine)
+        if replica_monitor.route():
+            factory = AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
@@ -0,0 +1,47 @@
+"""
+Distance queries in SQL over latitude/longitude columns (stores, vendors, chefs)
+
+Built on Postgres' cube and earthdistance extensions: migrations/add_geo_indexes.sql creates them
+and a GiST index on ll_to_earth(latitude, longitude) per table. The expressions below repeat that
+index expression exactly, so the planner can use it:
+
+  - within(model, lat, lon, radius_km): earth_box() @> point is the bounding-box prefilter (a GiST
+    range scan), earth_distance() <= radius the exact great-circle check on what it returns;
+  - nearest(model, lat, lon): ORDER BY point <-> origin, a GiST k-nearest-neighbour scan. <-> is the
+    straight-line distance through the earth, which orders points like the great-circle distance;
+  - distance_km(model, lat, lon): the great-circle distance, for the response.
+
+Rows without coordinates never match within() and sort last in nearest().
+"""
+from sqlalchemy import Float, and_, cast, func, literal
+
+# service_radius_km / delivery_radius_km are DECIMAL(5, 2): no radius is larger
+MAX_RADIUS_KM = 1000
+
+
+def _point(model):
+    # Must match the indexed expression in migrations/add_geo_indexes.sql
+    return func.ll_to_earth(cast(model.latitude, Float), cast(model.longitude, Float))
+
+
+def _origin(latitude: float, longitude: float):
+    return func.ll_to_earth(literal(latitude, Float), literal(longitude, Float))
+
+
+def distance_km(model, latitude: float, longitude: float):
+    """Great-circle distance from (latitude, longitude) to the row, in km."""
+    return func.earth_distance(_point(model), _origin(latitude, longitude)) / 1000
+
+
+def within(model, latitude: float, longitude: float, radius_km: float):
+    """Rows within radius_km of (latitude, longitude)."""
+    radius_m = literal(radius_km * 1000, Float)
+    return and_(
+        func.earth_box(_origin(latitude, longitude), radius_m).op("@>")(_point(model)),
+        func.earth_distance(_point(model), _origin(latitude, longitude)) <= radius_m,
+    )
+
+
+def nearest(model, latitude: float, longitude: float):
+    """ORDER BY term, nearest first."""
+    return _point(model).op("<->")(_origin(latitude, longitude))
@@ -1,7 +1,6 @@
 """
 Verify Google OAuth2 ID token and return payload (email, sub, name, etc.).
 """
-import httpx
 from typing import Optional
 from app.core.config import settings
 
@@ -14,6 +13,7 @@ async def verify_google_id_token(id_token: str) -> Optional[dict]:
     client_id = getattr(settings, "GOOGLE_OAUTH_CLIENT_ID", None)
     if not client_id:
         return None
+    import httpx  # deferred: only needed when Google sign-in is used
     try:
         async with httpx.AsyncClient() as client:
             r = await client.get(
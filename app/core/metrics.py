@@ -0,0 +1,250 @@
+"""
+Request and SQL instrumentation, rendered as Prometheus text on /metrics
+
+- MetricsMiddleware times every request and labels it by route template (not raw path).
+- instrument_engine() hooks before/after_cursor_execute so each request knows how many
+  statements it ran and how long it spent in the database.
+- Pool gauges and in-process cache counters are read at scrape time.
+All values are per worker process.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.cache import all_cache_stats
+from app.core.refdata import reference_data
+from app.core.pool import ping_stats, replica_monitors
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+
+
+class RequestStats:
+    """SQL activity of the request currently being served."""
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+
+# Holds a mutable RequestStats so work done in the threadpool (sync deps/routes) is counted too
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues) -> None:
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, (bucket_counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {bucket_count}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {count}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {count}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route template",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+REQUEST_STATEMENTS = Histogram(
+    "db_statements_per_request", "SQL statements executed per request",
+    ("method", "route"), STATEMENT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per request",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+
+# (name, sync engine) pairs registered by instrument_engine()
+_engines = []
+
+
+def instrument_engine(sync_engine, name: str) -> None:
+    """Count statements and DB time per request; also exposes the engine's pool on /metrics."""
+    _engines.append((name, sync_engine))
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        start = getattr(context, "_metrics_start", None)
+        if stats is None or start is None:
+            return
+        stats.statements += 1
+        stats.db_time += time.perf_counter() - start
+
+
+def registered_engines() -> list:
+    """(name, sync engine) for every instrumented engine."""
+    return list(_engines)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: records latency, statement count and DB time for each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_stats.reset(token)
+            route = scope.get("route")
+            # Route template keeps label cardinality bounded (/orders/{order_id}, not every id)
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            REQUEST_LATENCY.observe(elapsed, method, route_label, str(status_code))
+            REQUEST_STATEMENTS.observe(stats.statements, method, route_label)
+            REQUEST_DB_TIME.observe(stats.db_time, method, route_label)
+
+
+def _pool_lines() -> list:
+    gauges = {
+        "db_pool_size": ("Configured pool size", "size"),
+        "db_pool_checked_out": ("Connections currently checked out", "checkedout"),
+        "db_pool_checked_in": ("Idle connections in the pool", "checkedin"),
+        "db_pool_overflow": ("Connections opened beyond pool_size (negative = unused capacity)", "overflow"),
+    }
+    lines = []
+    for metric, (help_text, method) in gauges.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for name, sync_engine in _engines:
+            reader = getattr(sync_engine.pool, method, None)
+            if reader is not None:
+                lines.append(f'{metric}{{engine="{name}"}} {reader()}')
+    for metric, attr, help_text in (
+        ("db_pool_idle_pings_total", "pings", "Liveness pings of connections idle past DB_PRE_PING_IDLE_SECONDS"),
+        ("db_pool_stale_connections_total", "stale", "Pooled connections found dead at checkout and replaced"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{engine="{name}"}} {getattr(stats, attr)}' for name, stats in ping_stats.items()]
+    if replica_monitors:
+        lines += ["# HELP db_replica_lag_seconds Last measured replica lag (-1 = unreachable)",
+                  "# TYPE db_replica_lag_seconds gauge"]
+        lines += [f'db_replica_lag_seconds{{replica="{name}"}} '
+                  f'{m.lag_seconds if m.lag_seconds is not None else -1}' for name, m in replica_monitors.items()]
+        lines += ["# HELP db_read_routing_total Reads from get_read_db by target (fallbacks go to the primary)",
+                  "# TYPE db_read_routing_total counter"]
+        for name, m in replica_monitors.items():
+            lines.append(f'db_read_routing_total{{replica="{name}",target="replica"}} {m.replica_reads}')
+            lines.append(f'db_read_routing_total{{replica="{name}",target="primary"}} {m.primary_fallbacks}')
+    return lines
+
+
+def _cache_lines() -> list:
+    stats = all_cache_stats()
+    lines = []
+    for metric, kind, key, help_text in (
+        ("cache_hits_total", "counter", "hits", "In-process cache hits"),
+        ("cache_misses_total", "counter", "misses", "In-process cache misses"),
+        ("cache_evictions_total", "counter", "evictions", "Entries evicted to respect max_entries"),
+        ("cache_entries", "gauge", "size", "Entries currently cached"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{cache="{_escape(s["name"])}"}} {s[key]}' for s in stats]
+    refdata = reference_data.stats()
+    for metric, kind, key, help_text in (
+        ("refdata_hits_total", "counter", "hits", "Reference-data lookups served from cache"),
+        ("refdata_misses_total", "counter", "misses", "Reference-data lookups loaded from the database"),
+        ("refdata_stale_total", "counter", "stale", "Cached entries found outdated by a newer version and reloaded"),
+        ("refdata_invalidations_total", "counter", "invalidations", "Write-triggered invalidations"),
+        ("refdata_max_age_served_seconds", "gauge", "max_age_served_seconds", "Oldest entry age served from cache"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{namespace="{name}"}} {ns[key]}' for name, ns in refdata.items()]
+    return lines
+
+
+def _reservation_lines() -> list:
+    # Imported here: the service imports the models, which need app.core.database (which imports this)
+    from app.services.stock_reservations import reservation_index, reservation_stats
+    lines = []
+    for metric, attr, help_text in (
+        ("stock_reservations_created_total", "created", "Stock holds placed at payment-intent creation"),
+        ("stock_reservations_consumed_total", "consumed", "Holds turned into orders at checkout"),
+        ("stock_reservations_released_total", "released", "Holds replaced by a newer intent or dropped on payment failure"),
+        ("stock_reservations_expired_total", "expired", "Holds marked expired by this worker's sweep"),
+        ("stock_reservation_sweeps_total", "sweeps", "Expiry sweeps run by this worker"),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter",
+                  f"{metric} {getattr(reservation_stats, attr)}"]
+    lines += ["# HELP stock_reservations_active Active holds in this worker's reservation index",
+              "# TYPE stock_reservations_active gauge",
+              f"stock_reservations_active {reservation_index.stats()['active_reservations']}"]
+    return lines
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format."""
+    lines = []
+    for histogram in (REQUEST_LATENCY, REQUEST_STATEMENTS, REQUEST_DB_TIME):
+        lines += histogram.render()
+    lines += _pool_lines()
+    lines += _cache_lines()
+    lines += _reservation_lines()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,147 @@
+"""
+N+1 query detector
+
+Fingerprints every SQL statement executed during a request (literals and bind
+parameters stripped, IN-lists collapsed) and flags statement shapes repeated
+`NPLUSONE_THRESHOLD` times or more - the signature of a per-row query in a loop.
+
+NPLUSONE_MODE:
+  off     - no tracking (default)
+  warn    - log each repeated shape with its count and the app call site that crossed the threshold
+  strict  - raise NPlusOneError at the offending statement (use in tests/staging so CI fails)
+
+Call sites are found by walking the stack to the first frame in app/ outside app/core.
+Queries issued through AsyncSession run in a greenlet whose stack stops at SQLAlchemy,
+so their call site is reported as unknown; the statement shape still identifies them.
+"""
+import logging
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = str(Path(__file__).resolve().parent.parent)
+_CORE_DIR = str(Path(__file__).resolve().parent)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_POSTCOMPILE = re.compile(r"\(?\s*__\[POSTCOMPILE_\w+\]\s*\)?")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in strict mode when a statement shape repeats past the threshold within one request."""
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape: same query with different ids -> same fingerprint."""
+    shape = _STRING.sub("?", statement)
+    shape = _POSTCOMPILE.sub("(?)", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def _call_site() -> str:
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        filename = frame.filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_CORE_DIR):
+            return f"{Path(filename).relative_to(Path(_APP_DIR).parent)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class QueryAudit:
+    """Statement shapes seen during one unit of work (usually a request)."""
+
+    def __init__(self, threshold: int, strict: bool, label: str = ""):
+        self.threshold = threshold
+        self.strict = strict
+        self.label = label
+        self.shapes = Counter()
+        self.flagged = {}
+
+    def record(self, statement: str) -> None:
+        shape = normalize_sql(statement)
+        self.shapes[shape] += 1
+        if self.shapes[shape] == self.threshold:
+            site = _call_site()
+            self.flagged[shape] = site
+            if self.strict:
+                raise NPlusOneError(
+                    f"{self.label or 'query'}: statement repeated {self.threshold}x at {site}: {shape[:300]}"
+                )
+
+    def violations(self) -> list:
+        """[(shape, total count, call site)] for every shape that crossed the threshold."""
+        return [(shape, self.shapes[shape], site) for shape, site in self.flagged.items()]
+
+    def log(self) -> None:
+        for shape, count, site in self.violations():
+            logger.warning("N+1 suspected in %s: %d x %s (first flagged at %s)", self.label, count, shape[:300], site)
+
+
+_current_audit: ContextVar[Optional[QueryAudit]] = ContextVar("nplusone_audit", default=None)
+
+
+def install_nplusone_detector(sync_engine) -> None:
+    """Feed executed statements to the active QueryAudit (no-op when none is active)."""
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        audit = _current_audit.get()
+        if audit is not None:
+            audit.record(statement)
+
+
+@contextmanager
+def detect_nplusone(threshold: Optional[int] = None, strict: bool = True, label: str = "block"):
+    """
+    Audit the statements run inside the block, e.g. in a test:
+
+        with detect_nplusone(threshold=3):
+            client.get("/api/v1/orders/")
+    """
+    audit = QueryAudit(threshold or settings.NPLUSONE_THRESHOLD, strict, label)
+    token = _current_audit.set(audit)
+    try:
+        yield audit
+    finally:
+        _current_audit.reset(token)
+        if not strict:
+            audit.log()
+
+
+class NPlusOneMiddleware:
+    """Pure ASGI middleware: one QueryAudit per HTTP request, logged at the end in warn mode."""
+
+    def __init__(self, app, threshold: int, strict: bool):
+        self.app = app
+        self.threshold = threshold
+        self.strict = strict
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        audit = QueryAudit(self.threshold, self.strict, f"{scope.get('method', '')} {scope.get('path', '')}")
+        token = _current_audit.set(audit)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_audit.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                audit.label = f"{scope.get('method', '')} {route.path}"
+            audit.log()
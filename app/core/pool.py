@@ -0,0 +1,156 @@
+"""
+Connection pool helpers: cheaper pre-ping, pool status for admins/metrics, replica lag tracking
+"""
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DisconnectionError
+
+
+class PingStats:
+    """Liveness checks done at checkout by install_idle_ping(), per engine."""
+    __slots__ = ("pings", "stale")
+
+    def __init__(self):
+        self.pings = 0
+        self.stale = 0
+
+
+# engine name -> PingStats
+ping_stats = {}
+
+
+def install_idle_ping(sync_engine, name: str, idle_seconds: float) -> None:
+    """
+    Ping a pooled connection at checkout only if it sat idle for `idle_seconds` or more.
+    pool_pre_ping costs a round trip on every checkout; connections that were just returned
+    are almost never dead, idle ones are the ones Postgres, PgBouncer or a load balancer closes.
+    A failed ping raises DisconnectionError, so the pool discards it and checks out another.
+    """
+    stats = ping_stats.setdefault(name, PingStats())
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        stats.pings += 1
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            stats.stale += 1
+            raise DisconnectionError(f"Idle connection failed liveness check: {e}")
+
+
+def pool_status(name: str, sync_engine) -> dict:
+    """Configuration and live counters of one engine's pool."""
+    pool = sync_engine.pool
+    status = {"engine": name, "pool_class": type(pool).__name__, "pre_ping": bool(getattr(pool, "_pre_ping", False))}
+    for key, method in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"),
+                        ("overflow", "overflow")):
+        reader = getattr(pool, method, None)
+        status[key] = reader() if reader is not None else None
+    status["max_overflow"] = getattr(pool, "_max_overflow", None)
+    status["timeout_seconds"] = getattr(pool, "_timeout", None)
+    status["recycle_seconds"] = getattr(pool, "_recycle", None)
+    stats = ping_stats.get(name)
+    status["idle_pings"] = stats.pings if stats else None
+    status["stale_connections_replaced"] = stats.stale if stats else None
+    return status
+
+
+# name -> ReplicaMonitor, for /metrics and the admin pool endpoint
+replica_monitors = {}
+
+
+class ReplicaMonitor:
+    """
+    Tracks read-replica lag so reads fall back to the primary when the replica is behind or down.
+    Lag is measured at most every `check_interval_seconds` per worker; while a check is running,
+    other requests use the last known state.
+    """
+
+    # 0 on a primary or a caught-up replica (an idle primary otherwise looks like it's lagging)
+    LAG_SQL = text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+        "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, name: str, max_lag_seconds: float, check_interval_seconds: float):
+        self.name = name
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds = None
+        self.healthy = False
+        self.last_error = None
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._checked_at = None
+        self._checking = False
+        self._lock = threading.Lock()
+        replica_monitors[name] = self
+
+    def _begin_check(self) -> bool:
+        with self._lock:
+            due = self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval_seconds
+            if not due or self._checking:
+                return False
+            self._checking = True
+            return True
+
+    def _record(self, lag, error=None) -> None:
+        with self._lock:
+            self.lag_seconds = float(lag) if lag is not None else None
+            self.healthy = error is None and self.lag_seconds <= self.max_lag_seconds
+            self.last_error = str(error)[:200] if error is not None else None
+            self._checked_at = time.monotonic()
+            self._checking = False
+
+    def refresh(self, sync_engine) -> None:
+        if not self._begin_check():
+            return
+        try:
+            with sync_engine.connect() as connection:
+                lag = connection.execute(self.LAG_SQL).scalar()
+        except Exception as e:
+            self._record(None, e)
+        else:
+            self._record(lag)
+
+    async def refresh_async(self, async_engine) -> None:
+        if not self._begin_check():
+            return
+        try:
+            async with async_engine.connect() as connection:
+                lag = (await connection.execute(self.LAG_SQL)).scalar()
+        except Exception as e:
+            self._record(None, e)
+        else:
+            self._record(lag)
+
+    def route(self) -> bool:
+        """True to read from the replica, False to fall back to the primary (counted either way)."""
+        if self.healthy:
+            self.replica_reads += 1
+            return True
+        self.primary_fallbacks += 1
+        return False
+
+    def status(self) -> dict:
+        return {
+            "replica": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "last_error": self.last_error,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
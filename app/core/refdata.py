@@ -0,0 +1,118 @@
+"""
+Reference-data cache: categories, stores, vendors and platform settings
+
+These tables change a few times a day but are read on every storefront page view. Entries live in
+one TTLCache (bounded, LRU, per worker) and are tagged with the version of their namespace:
+invalidate("stores") bumps the version, so entries loaded before the write are never served again.
+Versions are per worker: the worker that handled the write is fresh at once, the others within
+REFDATA_CACHE_TTL_SECONDS. Categories have no write endpoint and rely on the TTL alone.
+
+Per namespace, /metrics reports hits, misses, stale lookups (an entry whose load raced an
+invalidation, caught by its version and reloaded) and the age of the oldest entry served.
+"""
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+NAMESPACES = ("categories", "stores", "vendors", "settings")
+
+_MISS = object()
+
+
+class NamespaceStats:
+    __slots__ = ("version", "hits", "misses", "stale", "invalidations", "max_age_served")
+
+    def __init__(self):
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.invalidations = 0
+        self.max_age_served = 0.0
+
+
+class ReferenceDataCache:
+    """Versioned get-or-load cache over one bounded TTLCache, keyed (namespace, key)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.entries = TTLCache("reference_data", max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.namespaces = {name: NamespaceStats() for name in NAMESPACES}
+        self._lock = threading.Lock()
+
+    def _lookup(self, namespace: str, key: Hashable):
+        """(value or _MISS, version to store a fresh load under)."""
+        ns = self.namespaces[namespace]
+        entry = self.entries.get((namespace, key))
+        with self._lock:
+            if entry is not None and entry[0] == ns.version:
+                ns.hits += 1
+                ns.max_age_served = max(ns.max_age_served, time.monotonic() - entry[1])
+                return entry[2], ns.version
+            if entry is not None:
+                ns.stale += 1
+            ns.misses += 1
+            return _MISS, ns.version
+
+    def _store(self, namespace: str, key: Hashable, version: int, value: Any) -> None:
+        # Loaded under `version`: if an invalidation happened meanwhile, it is already stale
+        self.entries.set((namespace, key), (version, time.monotonic(), value))
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value, version = self._lookup(namespace, key)
+        if value is _MISS:
+            value = loader()
+            self._store(namespace, key, version, value)
+        return value
+
+    async def get_or_load_async(self, namespace: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value, version = self._lookup(namespace, key)
+        if value is _MISS:
+            value = await loader()
+            self._store(namespace, key, version, value)
+        return value
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Call after committing a write to these tables."""
+        with self._lock:
+            for namespace in namespaces:
+                ns = self.namespaces[namespace]
+                ns.version += 1
+                ns.invalidations += 1
+        dropped = set(namespaces)
+        self.entries.invalidate_where(lambda k: k[0] in dropped)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "version": ns.version,
+                    "hits": ns.hits,
+                    "misses": ns.misses,
+                    "stale": ns.stale,
+                    "invalidations": ns.invalidations,
+                    "max_age_served_seconds": round(ns.max_age_served, 3),
+                }
+                for name, ns in self.namespaces.items()
+            }
+
+
+reference_data = ReferenceDataCache(
+    max_entries=settings.REFDATA_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.REFDATA_CACHE_TTL_SECONDS,
+)
+
+
+def platform_settings(db, setting_type: str):
+    """
+    PlatformSettings row for `setting_type` as {"settings": ..., "updated_at": datetime or None},
+    or None when the type has never been saved. Callers must not mutate the returned dict.
+    """
+    def load():
+        from app.models.platform_settings import PlatformSettings
+        row = db.query(PlatformSettings).filter(PlatformSettings.setting_type == setting_type).first()
+        return {"settings": row.settings_data, "updated_at": row.updated_at} if row else None
+
+    return reference_data.get_or_load("settings", setting_type, load)
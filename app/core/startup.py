@@ -0,0 +1,152 @@
+"""
+Cold-start support: lazy API router loading and the --profile-startup report
+
+LAZY_ROUTERS=true skips importing the ~70 endpoint modules at startup. LazyRouterMiddleware
+imports a route group (first path segment under /api/v1: "customer", "admin", "driver", ...)
+the first time a request for it arrives, and splices its routes in ahead of the static mounts.
+Requests for the OpenAPI schema load every group so /api/docs stays complete.
+"""
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+
+# Filled in while the app starts (app.main, app.api.v1.build_api_router)
+startup_timings = {
+    "app_import_seconds": None,
+    "router_build_seconds": 0.0,
+    "endpoint_imports": {},
+}
+
+
+class LazyRouters:
+    """Route groups of the v1 API, each imported and mounted into `app` on first use."""
+
+    def __init__(self, app, prefix: str):
+        self.app = app
+        self.prefix = prefix
+        self.loaded = set()
+        self._lock = threading.Lock()
+
+    def ensure(self, groups) -> None:
+        from app.api.v1 import ROUTE_GROUPS, build_api_router
+        from fastapi import APIRouter
+        from starlette.routing import Mount
+
+        missing = [g for g in groups if g in ROUTE_GROUPS and g not in self.loaded]
+        if not missing:
+            return
+        with self._lock:
+            missing = [g for g in missing if g not in self.loaded]
+            if not missing:
+                return
+            wrapper = APIRouter()
+            wrapper.include_router(build_api_router(missing), prefix=self.prefix)
+            routes = self.app.router.routes
+            # Before any Mount: /api/v1/uploads/... endpoints must win over the static uploads mount
+            position = next((i for i, route in enumerate(routes) if isinstance(route, Mount)), len(routes))
+            routes[position:position] = wrapper.routes
+            self.app.openapi_schema = None
+            self.loaded.update(missing)
+
+    def ensure_all(self) -> None:
+        from app.api.v1 import ROUTE_GROUPS
+        self.ensure(sorted(ROUTE_GROUPS))
+
+
+class LazyRouterMiddleware:
+    """Pure ASGI middleware: loads the route group a request needs before routing happens."""
+
+    def __init__(self, app, routers: LazyRouters, openapi_url: str):
+        self.app = app
+        self.routers = routers
+        self.openapi_url = openapi_url
+        self._api_prefix = routers.prefix + "/"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path.startswith(self._api_prefix):
+                self.routers.ensure((path[len(self._api_prefix):].split("/", 1)[0],))
+            elif path == self.openapi_url:
+                self.routers.ensure_all()
+        await self.app(scope, receive, send)
+
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def _measure_in_subprocess() -> None:
+    """Child side of profile_startup(): import the app cold, build all routers, print timings."""
+    import app.main as main_module
+    if main_module.lazy_routers is not None:
+        start = time.perf_counter()
+        main_module.lazy_routers.ensure_all()
+        startup_timings["first_full_load_seconds"] = time.perf_counter() - start
+    print(json.dumps(startup_timings))
+
+
+def profile_startup(top: int = 25) -> dict:
+    """
+    Import app.main in a fresh interpreter under `-X importtime` and report where the time goes:
+    total app import, router build, each endpoint module, the slowest imports and top-level packages.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "from app.core.startup import _measure_in_subprocess; _measure_in_subprocess()"],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing app.main failed:\n{completed.stderr[-4000:]}")
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    modules = []
+    package_self_us = defaultdict(int)
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = int(match.group(1)), int(match.group(2)), match.group(3)
+        modules.append((name, self_us, cumulative_us))
+        package_self_us[name.split(".")[0]] += self_us
+
+    report = {
+        "app_import_ms": round(timings["app_import_seconds"] * 1000, 1) if timings["app_import_seconds"] else None,
+        "router_build_ms": round(timings["router_build_seconds"] * 1000, 1),
+        "first_full_load_ms": round(timings["first_full_load_seconds"] * 1000, 1)
+        if "first_full_load_seconds" in timings else None,
+        "endpoint_modules": sorted(
+            ((name, round(seconds * 1000, 1)) for name, seconds in timings["endpoint_imports"].items()),
+            key=lambda item: item[1], reverse=True,
+        ),
+        "slowest_imports": [
+            (name, round(cumulative / 1000, 1)) for name, _, cumulative in
+            sorted(modules, key=lambda m: m[2], reverse=True)[:top]
+        ],
+        "packages": sorted(
+            ((name, round(us / 1000, 1)) for name, us in package_self_us.items()),
+            key=lambda item: item[1], reverse=True,
+        )[:top],
+    }
+    return report
+
+
+def print_startup_report(report: dict, top: int = 25) -> None:
+    print("Startup profile")
+    print(f"  import app.main         {report['app_import_ms']} ms")
+    print(f"  router build            {report['router_build_ms']} ms "
+          f"({len(report['endpoint_modules'])} endpoint modules)")
+    if report["first_full_load_ms"] is not None:
+        print(f"  lazy: load all groups   {report['first_full_load_ms']} ms (paid on first requests instead)")
+    sections = (
+        ("Endpoint modules (ms, incl. first-time shared imports)", report["endpoint_modules"][:top]),
+        ("Slowest imports (cumulative ms)", report["slowest_imports"]),
+        ("Top-level packages (self ms)", report["packages"]),
+    )
+    for title, rows in sections:
+        print(f"\n{title}:")
+        for name, ms in rows:
+            print(f"  {ms:>9.1f}  {name}")
@@ -1,11 +1,24 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
+import secrets
+import time
+from typing import Optional
+
+_import_start = time.perf_counter()
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
-from app.api.v1 import api_router
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.nplusone import NPlusOneMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.startup import LazyRouters, LazyRouterMiddleware, startup_timings
+from app.api.v1 import build_api_router
+from app.api.v1.pagination import PAGINATION_HEADERS
+from app.services.idempotency import REPLAYED_HEADER
 from pathlib import Path
 
 # Import all models to ensure SQLAlchemy relationships are resolved
@@ -16,9 +29,16 @@ app = FastAPI(
     description="API for EAZyfoods multi-vendor grocery delivery marketplace",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    # orjson-encoded JSON for every route (app/core/responses.py)
+    default_response_class=FastJSONResponse
 )
 
+# LAZY_ROUTERS=true: endpoint modules are imported per route group on first request (fast cold start)
+lazy_routers = LazyRouters(app, "/api/v1") if settings.LAZY_ROUTERS else None
+if lazy_routers is not None:
+    app.add_middleware(LazyRouterMiddleware, routers=lazy_routers, openapi_url=app.openapi_url)
+
 # CORS middleware (cors_origins_list parses comma-separated CORS_ORIGINS env)
 origins = settings.cors_origins_list
 if "*" in origins:
@@ -28,6 +48,7 @@ if "*" in origins:
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=PAGINATION_HEADERS + [REPLAYED_HEADER],
     )
 else:
     app.add_middleware(
@@ -36,15 +57,57 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=PAGINATION_HEADERS + [REPLAYED_HEADER],
+    )
+
+# N+1 detection for tests/staging (NPLUSONE_MODE=warn|strict)
+if settings.NPLUSONE_MODE in ("warn", "strict"):
+    app.add_middleware(
+        NPlusOneMiddleware,
+        threshold=settings.NPLUSONE_THRESHOLD,
+        strict=settings.NPLUSONE_MODE == "strict",
     )
 
+# Per-route latency, SQL statement count and DB time (added last so it wraps CORS too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routes
-app.include_router(api_router, prefix="/api/v1")
+if lazy_routers is None:
+    app.include_router(build_api_router(), prefix="/api/v1")
 
-# Mount static files for uploaded images
+# Mount static files for uploaded images (directory is created at startup, not import)
 upload_dir = Path(settings.UPLOAD_DIR)
-upload_dir.mkdir(exist_ok=True)
-app.mount("/api/v1/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
+app.mount("/api/v1/uploads", StaticFiles(directory=str(upload_dir), check_dir=False), name="uploads")
+
+
+@app.on_event("startup")
+async def ensure_upload_dir():
+    upload_dir.mkdir(exist_ok=True)
+
+
+@app.on_event("startup")
+async def start_promotion_scheduler():
+    from app.services import promotion_scheduler
+    promotion_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_promotion_scheduler():
+    from app.services import promotion_scheduler
+    await promotion_scheduler.stop()
+
+
+@app.on_event("startup")
+async def start_reservation_sweeper():
+    from app.services import stock_reservations
+    stock_reservations.start()
+
+
+@app.on_event("shutdown")
+async def stop_reservation_sweeper():
+    from app.services import stock_reservations
+    await stock_reservations.stop()
 
 
 @app.on_event("startup")
@@ -73,3 +136,16 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(authorization: Optional[str] = Header(None)):
+        """Prometheus text metrics for this worker (bearer METRICS_TOKEN when set)"""
+        if settings.METRICS_TOKEN and not secrets.compare_digest(
+            authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+        ):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+startup_timings["app_import_seconds"] = time.perf_counter() - _import_start
@@ -67,9 +67,10 @@ class Chef(Base):
     social_media_links = Column(JSON)  # {"facebook": "url", "instagram": "url", "youtube": "url"}
     website_url = Column(String(255))
     
-    # Ratings
+    # Ratings of public reviews, kept current by app/services/ratings.py
     average_rating = Column(DECIMAL(3, 2), default=0.0)
     total_reviews = Column(Integer, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
     
     # Gallery
     gallery_images = Column(JSON)  # Array of image URLs showcasing their food
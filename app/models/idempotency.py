@@ -0,0 +1,29 @@
+"""
+Idempotency key database model
+"""
+from sqlalchemy import Column, String, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+import uuid
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """First result of a request sent with an Idempotency-Key header (app/services/idempotency.py)"""
+    __tablename__ = "idempotency_keys"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    scope = Column(String(50), nullable=False)  # endpoint, e.g. checkout, helcim_payment
+    principal_id = Column(String(64), nullable=False)  # customer the key belongs to
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of the request body
+    status = Column(String(20), default="in_progress", nullable=False)  # in_progress, completed
+    response_body = Column(JSONB)  # set when completed
+    locked_until = Column(DateTime, nullable=False)  # an in_progress claim older than this was abandoned
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime)
+    
+    __table_args__ = (
+        UniqueConstraint("scope", "principal_id", "key", name="uq_idempotency_keys_scope_principal_key"),
+    )
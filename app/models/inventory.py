@@ -65,3 +65,16 @@ class ExpiryAlert(Base):
     vendor = relationship("Vendor", backref="expiry_alerts")
     product = relationship("Product", backref="expiry_alerts")
 
+
+
+class StockReservation(Base):
+    """Units held for a customer between payment-intent creation and checkout (app/services/stock_reservations.py)"""
+    __tablename__ = "stock_reservations"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"), nullable=False)
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    status = Column(String(20), default="active", nullable=False)  # active, consumed, released, expired
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
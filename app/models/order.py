@@ -6,7 +6,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
-from app.core.database import Base
+from app.core.database import Base, RELATIONSHIP_LAZY
 import enum
 
 
@@ -88,7 +88,7 @@ class Order(Base):
     
     # Relationships - use string reference to avoid circular imports
     # Note: Vendor model must be imported before Order is used in queries
-    vendor = relationship("Vendor", backref="orders", lazy="select")
+    vendor = relationship("Vendor", backref="orders", lazy=RELATIONSHIP_LAZY)
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     status_history = relationship("OrderStatusHistory", back_populates="order", cascade="all, delete-orphan")
 
@@ -118,7 +118,7 @@ class OrderItem(Base):
     
     # Relationships - use string references to avoid circular imports
     order = relationship("Order", back_populates="items")
-    product = relationship("app.models.product.Product", foreign_keys=[product_id], lazy="select")
+    product = relationship("app.models.product.Product", foreign_keys=[product_id], lazy=RELATIONSHIP_LAZY)
 
 
 class OrderStatusHistory(Base):
@@ -6,7 +6,7 @@ from sqlalchemy.dialects.postgresql import UUID, DATE
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
-from app.core.database import Base
+from app.core.database import Base, RELATIONSHIP_LAZY
 
 
 class Category(Base):
@@ -73,6 +73,11 @@ class Product(Base):
     is_featured = Column(Boolean, default=False)
     is_newly_stocked = Column(Boolean, default=False)
     
+    # Ratings of public reviews, kept current by app/services/ratings.py
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+    average_rating = Column(DECIMAL(3, 2))  # NULL until the first review
+    
     # SEO
     slug = Column(String(200), nullable=False)
     
@@ -82,7 +87,9 @@ class Product(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # search_vector (generated tsvector) is deliberately not mapped: see app/services/product_search.py
+    
     # Relationships - using lazy loading and string references to avoid circular import issues
-    vendor = relationship("app.models.vendor.Vendor", lazy="select")  # Full path to avoid import issues
+    vendor = relationship("app.models.vendor.Vendor", lazy=RELATIONSHIP_LAZY)  # Full path to avoid import issues
     category = relationship("Category", foreign_keys=[category_id], lazy="select")
 
@@ -40,6 +40,7 @@ class Promotion(Base):
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
     is_active = Column(Boolean, default=True)
+    prices_applied_at = Column(DateTime)  # When the discount was written to product prices (None: not yet)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,14 @@
+"""
+Scheduler lease database model
+"""
+from sqlalchemy import Column, String, DateTime
+from app.core.database import Base
+
+
+class SchedulerLease(Base):
+    """Which worker runs a background job until locked_until (app/services/promotion_scheduler.py)"""
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String(50), primary_key=True)  # job, e.g. promotion_scheduler
+    holder = Column(String(64), nullable=False)  # id of the run holding the lease
+    locked_until = Column(DateTime, nullable=False)  # database time; free once past
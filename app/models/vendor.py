@@ -78,9 +78,10 @@ class Vendor(Base):
     bank_routing_number = Column(String(50))
     bank_name = Column(String(200))
     
-    # Ratings
+    # Ratings of public reviews, kept current by app/services/ratings.py
     average_rating = Column(DECIMAL(3, 2), default=0.0)
     total_reviews = Column(Integer, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,10 +1,11 @@
 """
 Driver schemas
 """
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from typing import Optional, List, Dict
 from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 
 
 class DriverSignup(BaseModel):
@@ -27,8 +28,7 @@ class DriverSignup(BaseModel):
     driver_license_number: Optional[str] = None
     preferred_delivery_zones: Optional[List[str]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DriverLogin(BaseModel):
@@ -37,7 +37,7 @@ class DriverLogin(BaseModel):
 
 
 class DriverResponse(BaseModel):
-    id: str
+    id: UUID
     email: str
     phone: str
     first_name: str
@@ -69,8 +69,12 @@ class DriverResponse(BaseModel):
     bank_name: Optional[str] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @field_validator("preferred_delivery_zones", mode="before")
+    @classmethod
+    def _zones(cls, value):
+        return value or []
 
 
 class DriverProfileUpdate(BaseModel):
@@ -96,8 +100,7 @@ class DriverProfileUpdate(BaseModel):
     bank_name: Optional[str] = None
     is_available: Optional[bool] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DeliveryAddressDisplay(BaseModel):
@@ -135,8 +138,7 @@ class DeliveryResponse(BaseModel):
     last_location_update: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DeliveryAcceptRequest(BaseModel):
@@ -1,10 +1,11 @@
 """
 Order schemas
 """
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, computed_field, field_validator, model_validator
 from typing import Optional, List, Any
 from decimal import Decimal
 from datetime import datetime
+from uuid import UUID
 
 
 class OrderItemResponse(BaseModel):
@@ -18,8 +19,7 @@ class OrderItemResponse(BaseModel):
     is_out_of_stock: bool
     quantity_fulfilled: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderResponse(BaseModel):
@@ -47,16 +47,14 @@ class OrderResponse(BaseModel):
     delivery: Optional[Any] = None
     items: List[OrderItemResponse] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderUpdate(BaseModel):
     status: Optional[str] = None
     special_instructions: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderListResponse(BaseModel):
@@ -69,6 +67,178 @@ class OrderListResponse(BaseModel):
     delivery_method: Optional[str] = None
     delivery_status: Optional[str] = None  # For delivery orders after ready: awaiting_driver, accepted, picked_up, in_transit, delivered
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
+
+class BulkStatusUpdate(BaseModel):
+    """POST /orders/bulk-status (and the chef equivalent): move these orders to one status."""
+    order_ids: List[UUID] = Field(..., min_length=1, max_length=200)
+    status: str
+    cancellation_reason: Optional[str] = None
+
+
+class BulkStatusResult(BaseModel):
+    order_id: UUID
+    success: bool
+    status: Optional[str] = None  # New status, or the current one when skipped (None: not found)
+    error: Optional[str] = None
+
+
+class BulkStatusResponse(BaseModel):
+    updated: int
+    failed: int
+    results: List[BulkStatusResult]
+
+
+
+# Typed responses validated straight from ORM objects (pydantic v2, from_attributes). Amounts are
+# floats and ids/datetimes plain JSON strings, matching what the hand-built dicts returned.
+
+def _first(value):
+    """Order.delivery is a list (backref of Delivery.order): the order's delivery, if any."""
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+
+class OrderItemOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    product_id: Optional[UUID] = None
+    product_name: str = ""
+    product_price: Optional[float] = None
+    quantity: int = 0
+    subtotal: Optional[float] = None
+    is_substituted: Optional[bool] = False
+    is_out_of_stock: Optional[bool] = False
+    quantity_fulfilled: Optional[int] = 0
+
+
+class CustomerOrderItemOut(OrderItemOut):
+    cuisine_id: Optional[UUID] = None
+
+
+class CustomerOrderDeliveryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    driver_id: Optional[UUID] = None
+    status: Optional[str] = None
+    current_eta_minutes: Optional[int] = None
+
+
+class CustomerOrderOut(BaseModel):
+    """GET /customer/orders row: the order, its items and its delivery (Order.delivery loaded)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    order_number: str = ""
+    customer_id: Optional[UUID] = None
+    chef_id: Optional[UUID] = None
+    vendor_id: Optional[UUID] = None
+    status: str = "new"
+    delivery_method: str = "delivery"
+    subtotal: Optional[float] = None
+    tax_amount: Optional[float] = None
+    shipping_amount: Optional[float] = None
+    discount_amount: Optional[float] = None
+    total_amount: Optional[float] = None
+    gross_sales: Optional[float] = None
+    commission_rate: Optional[float] = None
+    commission_amount: Optional[float] = None
+    net_payout: Optional[float] = None
+    payment_status: str = "pending"
+    special_instructions: Optional[str] = None
+    customer_notes: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    delivery: Optional[CustomerOrderDeliveryOut] = None
+    items: List[CustomerOrderItemOut] = []
+
+    @field_validator("order_number", "status", "delivery_method", "payment_status", mode="before")
+    @classmethod
+    def _none_to_default(cls, value, info):
+        return cls.model_fields[info.field_name].default if value is None else value
+
+    @field_validator("delivery", mode="before")
+    @classmethod
+    def _single_delivery(cls, value):
+        return _first(value)
+
+    @field_validator("items", mode="before")
+    @classmethod
+    def _items(cls, value):
+        return value or []
+
+    @model_validator(mode="after")
+    def _updated_defaults_to_created(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        return self
+
+    @computed_field
+    @property
+    def delivery_status(self) -> Optional[str]:
+        return self.delivery.status if self.delivery else None
+
+
+class VendorOrderDriverOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    name: str
+    phone: Optional[str] = None
+    vehicle_type: Optional[str] = None
+    license_plate: Optional[str] = None
+
+
+class VendorOrderDeliveryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    status: Optional[str] = None
+    accepted_at: Optional[datetime] = None
+    picked_up_at: Optional[datetime] = Field(None, validation_alias=AliasChoices("picked_up_at", "actual_pickup_time"))
+    delivered_at: Optional[datetime] = Field(None, validation_alias=AliasChoices("delivered_at", "actual_delivery_time"))
+    estimated_pickup_time: Optional[datetime] = None
+    estimated_delivery_time: Optional[datetime] = None
+    distance_km: Optional[float] = None
+
+
+class VendorOrderOut(BaseModel):
+    """Vendor order detail (GET /orders/{id} and the status transitions)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    order_number: str
+    customer_id: Optional[UUID] = None
+    status: str
+    delivery_method: Optional[str] = None
+    subtotal: Optional[float] = None
+    tax_amount: Optional[float] = None
+    shipping_amount: Optional[float] = None
+    discount_amount: Optional[float] = None
+    total_amount: Optional[float] = None
+    gross_sales: Optional[float] = None
+    commission_rate: Optional[float] = None
+    commission_amount: Optional[float] = None
+    net_payout: Optional[float] = None
+    payment_status: Optional[str] = None
+    special_instructions: Optional[str] = None
+    customer_notes: Optional[str] = None
+    driver_id: Optional[UUID] = None
+    driver: Optional[VendorOrderDriverOut] = None
+    delivery: Optional[VendorOrderDeliveryOut] = None
+    ready_at: Optional[datetime] = None
+    picked_up_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    vendor_commission_rate: Optional[float] = None
+    items: List[OrderItemOut] = []
+
+    @field_validator("delivery", mode="before")
+    @classmethod
+    def _single_delivery(cls, value):
+        return _first(value)
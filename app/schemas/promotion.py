@@ -65,3 +65,13 @@ class PromotionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class PromotionMaintenanceResponse(BaseModel):
+    """POST /promotions/maintenance/revert-expired: what the scheduler run changed."""
+    message: str
+    skipped: bool = False  # another worker holds the scheduler lease: nothing was run
+    reverted_count: int = 0  # promotions
+    applied_count: int = 0
+    products_reverted: int = 0  # product rows whose price was changed
+    products_discounted: int = 0
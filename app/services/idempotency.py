@@ -0,0 +1,235 @@
+"""
+Idempotency-Key support for checkout and payment endpoints
+
+Clients on flaky networks retry POSTs whose response they never received; without a key each retry
+placed another order (or charged again). With an `Idempotency-Key` header, run() executes the
+request once per (endpoint, customer, key) and stores its response:
+
+  - a retry after completion gets the stored response back (header Idempotent-Replayed: true),
+    from the per-worker LRU when it is there, else from the idempotency_keys table;
+  - a retry while the first request is still running waits for it (an asyncio.Event in the same
+    worker, polling the table across workers) for up to IDEMPOTENCY_WAIT_SECONDS, then gets 409;
+  - the same key with a different body is a client bug: 422;
+  - if the request fails (any exception, HTTPException included) the key is dropped, so the retry
+    runs again: nothing was committed, since endpoints commit last.
+
+Claims are an INSERT ... ON CONFLICT on their own session and commit at once, so every worker sees
+them; a claim still in progress after IDEMPOTENCY_LOCK_SECONDS is treated as abandoned. So the
+stored result must not be lost once the request has committed: an endpoint calls record(db, body)
+before its own commit, and the key is completed in the same transaction as the orders. Otherwise
+run() caches the result first and then writes it back, logging (not raising) if that write fails.
+Requests without the header are executed as before.
+"""
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Waiting on another worker's request: poll the table this often
+POLL_SECONDS = 0.2
+PURGE_INTERVAL_SECONDS = 300
+
+# Completed results: {(scope, principal, key): (fingerprint, response body)}
+_responses = TTLCache(
+    "idempotency",
+    max_entries=settings.IDEMPOTENCY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.IDEMPOTENCY_CACHE_TTL_SECONDS,
+)
+# Requests running in this worker: {(scope, principal, key): (fingerprint, Event set when done)}
+_inflight = {}
+_last_purge = 0.0
+# The keyed request executing in this task: {"ident": (scope, principal, key), "recorded": bool}
+_current: ContextVar[Optional[dict]] = ContextVar("idempotency_request", default=None)
+
+
+def fingerprint(payload: Any) -> str:
+    """sha256 of the request body, key order insensitive."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _mismatch() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Idempotency-Key was already used with a different request body",
+    )
+
+
+def _replay(stored: tuple, request_fingerprint: str, response: Response):
+    stored_fingerprint, body = stored
+    if stored_fingerprint != request_fingerprint:
+        raise _mismatch()
+    response.headers[REPLAYED_HEADER] = "true"
+    return body
+
+
+def _where(ident: tuple):
+    scope, principal, key = ident
+    return and_(IdempotencyKey.scope == scope, IdempotencyKey.principal_id == principal, IdempotencyKey.key == key)
+
+
+async def _claim(ident: tuple, request_fingerprint: str):
+    """(True, None) if this request now owns the key, else (False, existing row or None)."""
+    global _last_purge
+    scope, principal, key = ident
+    now = datetime.utcnow()
+    statement = insert(IdempotencyKey).values(
+        id=uuid.uuid4(),
+        scope=scope,
+        principal_id=principal,
+        key=key,
+        fingerprint=request_fingerprint,
+        status="in_progress",
+        locked_until=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+        created_at=now,
+    )
+    # An expired key, or a claim abandoned by a dead worker, is taken over
+    statement = statement.on_conflict_do_update(
+        constraint="uq_idempotency_keys_scope_principal_key",
+        set_={
+            "fingerprint": statement.excluded.fingerprint,
+            "status": "in_progress",
+            "response_body": None,
+            "locked_until": statement.excluded.locked_until,
+            "expires_at": statement.excluded.expires_at,
+            "created_at": statement.excluded.created_at,
+            "completed_at": None,
+        },
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(IdempotencyKey.status == "in_progress", IdempotencyKey.locked_until < now),
+        ),
+    ).returning(IdempotencyKey.id)
+
+    async with AsyncSessionLocal() as db:
+        claimed = (await db.execute(statement)).scalar() is not None
+        existing = None
+        if not claimed:
+            existing = (await db.execute(
+                select(IdempotencyKey.fingerprint, IdempotencyKey.status, IdempotencyKey.response_body)
+                .where(_where(ident))
+            )).first()
+        if time.monotonic() - _last_purge > PURGE_INTERVAL_SECONDS:
+            _last_purge = time.monotonic()
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < now))
+        await db.commit()
+    return claimed, existing
+
+
+def _completed(body: Any) -> dict:
+    return {"status": "completed", "response_body": body, "completed_at": datetime.utcnow()}
+
+
+async def record(db, body: Any) -> None:
+    """
+    Complete the current request's key with `body` in the caller's (async) transaction: call it
+    just before the endpoint's commit, so the key and the endpoint's writes commit together.
+    No-op without an Idempotency-Key. `body` must be what execute() then returns.
+    """
+    current = _current.get()
+    if current is None:
+        return
+    await db.execute(
+        update(IdempotencyKey)
+        .where(_where(current["ident"]), IdempotencyKey.status == "in_progress")
+        .values(**_completed(body))
+        .execution_options(synchronize_session=False)
+    )
+    current["recorded"] = True
+
+
+async def _finish(ident: tuple, body: Any) -> None:
+    async with AsyncSessionLocal() as db:
+        if body is None:
+            await db.execute(delete(IdempotencyKey).where(_where(ident), IdempotencyKey.status == "in_progress"))
+        else:
+            await db.execute(update(IdempotencyKey).where(_where(ident)).values(**_completed(body)))
+        await db.commit()
+
+
+async def run(scope: str, principal, key: Optional[str], payload: Any,
+              execute: Callable[[], Awaitable[Any]], response: Response):
+    """
+    execute() once per (scope, principal, key) and return its result, or the first execution's
+    result for a repeated key. Without a key, just execute(). The result must be JSON-serializable.
+    """
+    if not key:
+        return await execute()
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key longer than {MAX_KEY_LENGTH} characters")
+
+    ident = (scope, str(principal), key)
+    request_fingerprint = fingerprint(payload)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        stored = _responses.get(ident)
+        if stored is not None:
+            return _replay(stored, request_fingerprint, response)
+
+        running = _inflight.get(ident)
+        if running is not None:
+            # Same key in flight in this worker: wait for it, then look again
+            if running[0] != request_fingerprint:
+                raise _mismatch()
+            try:
+                await asyncio.wait_for(running[1].wait(), max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            continue
+
+        # Registered before the first await: later duplicates in this worker wait on this one
+        done = asyncio.Event()
+        _inflight[ident] = (request_fingerprint, done)
+        try:
+            claimed, existing = await _claim(ident, request_fingerprint)
+            if claimed:
+                current = {"ident": ident, "recorded": False}
+                token = _current.set(current)
+                try:
+                    body = await execute()
+                except BaseException:
+                    # A failed request gives its key up so a retry runs again
+                    await _finish(ident, None)
+                    raise
+                finally:
+                    _current.reset(token)
+                _responses.set(ident, (request_fingerprint, body))
+                if not current["recorded"]:
+                    try:
+                        await _finish(ident, body)
+                    except Exception as e:
+                        # The request succeeded: return its result. Until the claim's lock runs out,
+                        # retries are answered from _responses (this worker) or wait (the others)
+                        print(f"Warning: could not store idempotent result for {ident[0]} key: {e}")
+                return body
+        finally:
+            _inflight.pop(ident, None)
+            done.set()
+
+        if existing is not None:
+            if existing.fingerprint != request_fingerprint:
+                raise _mismatch()
+            if existing.status == "completed":
+                stored = (existing.fingerprint, existing.response_body)
+                _responses.set(ident, stored)
+                return _replay(stored, request_fingerprint, response)
+        # In progress in another worker (or gone between the insert and the read): poll
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        await asyncio.sleep(POLL_SECONDS)
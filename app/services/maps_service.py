@@ -1,39 +1,44 @@
 """
 Google Maps service for routing and ETA calculations
 """
-try:
-    import googlemaps
-    GOOGLEMAPS_AVAILABLE = True
-except ImportError:
-    GOOGLEMAPS_AVAILABLE = False
-    googlemaps = None
-
 from typing import Optional, Dict, Tuple
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+_UNSET = object()
+
 
 class MapsService:
     """Service for Google Maps API operations"""
     
     def __init__(self):
-        if not GOOGLEMAPS_AVAILABLE:
-            logger.warning("googlemaps package not installed. Maps features will be disabled.")
-            self.client = None
-            return
-            
+        # googlemaps (and requests under it) is imported on first use, not at app startup
+        self._client = _UNSET
         self.api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', None)
-        if self.api_key:
-            try:
-                self.client = googlemaps.Client(key=self.api_key)
-            except Exception as e:
-                logger.error(f"Failed to initialize Google Maps client: {e}")
-                self.client = None
-        else:
+    
+    @property
+    def client(self):
+        """Google Maps client, created on first access (None when unavailable)"""
+        if self._client is _UNSET:
+            self._client = self._create_client()
+        return self._client
+    
+    def _create_client(self):
+        if not self.api_key:
             logger.warning("GOOGLE_MAPS_API_KEY not set. Maps features will be disabled.")
-            self.client = None
+            return None
+        try:
+            import googlemaps
+        except ImportError:
+            logger.warning("googlemaps package not installed. Maps features will be disabled.")
+            return None
+        try:
+            return googlemaps.Client(key=self.api_key)
+        except Exception as e:
+            logger.error(f"Failed to initialize Google Maps client: {e}")
+            return None
     
     def is_available(self) -> bool:
         """Check if Maps service is available"""
@@ -0,0 +1,99 @@
+"""
+Related rows for a page of vendor orders, loaded once per page instead of once per order
+
+Serializing a vendor order used to query its driver, its delivery (the lazy Order.delivery backref)
+and the vendor's commission rate; the deliveries list also queried the customer, the order and the
+driver of every row. OrderBatch loads each kind of row for the whole page with one IN query, the
+first time it is asked for it, so a page costs a fixed number of queries whatever its size:
+
+  - deliveries: Delivery rows by order (newest first), also set on Order.delivery so validating
+    VendorOrderOut from the order doesn't lazy-load it;
+  - drivers: by id, for the orders' driver_id and their deliveries' driver_id;
+  - customers: by id;
+  - commission_rate: the vendor's current rate.
+
+Used by the vendor orders endpoints (list, detail, status transitions) and vendor_deliveries.
+"""
+from functools import cached_property
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.customer import Customer
+from app.models.driver import Delivery, Driver
+from app.models.vendor import Vendor
+
+
+class OrderBatch:
+    """Lazily batch-loaded drivers, deliveries, customers and commission rate for `orders`."""
+
+    def __init__(self, db: Session, orders: Iterable, vendor_id=None, deliveries: Optional[list] = None):
+        """`deliveries`: already loaded Delivery rows of these orders, used instead of querying them."""
+        self.db = db
+        self.orders = list(orders)
+        self.vendor_id = vendor_id
+        if deliveries is not None:
+            self.__dict__["deliveries"] = self._by_order(deliveries)
+
+    @staticmethod
+    def _by_order(deliveries: Iterable) -> dict:
+        by_order = {}
+        for delivery in deliveries:
+            by_order.setdefault(delivery.order_id, []).append(delivery)
+        return by_order
+
+    @cached_property
+    def deliveries(self) -> dict:
+        """{order_id: [Delivery, ...]}, newest first."""
+        order_ids = [order.id for order in self.orders]
+        if not order_ids:
+            return {}
+        return self._by_order(
+            self.db.query(Delivery)
+            .filter(Delivery.order_id.in_(order_ids))
+            .order_by(Delivery.created_at.desc())
+            .all()
+        )
+
+    @cached_property
+    def drivers(self) -> dict:
+        """{driver_id: Driver} for the orders and their deliveries."""
+        ids = {order.driver_id for order in self.orders if order.driver_id}
+        ids.update(d.driver_id for rows in self.deliveries.values() for d in rows if d.driver_id)
+        if not ids:
+            return {}
+        return {driver.id: driver for driver in self.db.query(Driver).filter(Driver.id.in_(ids)).all()}
+
+    @cached_property
+    def customers(self) -> dict:
+        """{customer_id: Customer}."""
+        ids = {order.customer_id for order in self.orders if order.customer_id}
+        if not ids:
+            return {}
+        return {customer.id: customer for customer in self.db.query(Customer).filter(Customer.id.in_(ids)).all()}
+
+    @cached_property
+    def commission_rate(self) -> Optional[float]:
+        """The vendor's current commission rate (percent), None without one."""
+        if self.vendor_id is None:
+            return None
+        rate = self.db.query(Vendor.commission_rate).filter(Vendor.id == self.vendor_id).scalar()
+        return float(rate) if rate is not None else None
+
+    def delivery(self, order):
+        """The order's latest delivery, if any."""
+        rows = self.deliveries.get(order.id)
+        return rows[0] if rows else None
+
+    def driver(self, driver_id):
+        return self.drivers.get(driver_id) if driver_id else None
+
+    def customer(self, customer_id):
+        return self.customers.get(customer_id) if customer_id else None
+
+    def attach_deliveries(self) -> None:
+        """Set Order.delivery from the batch (no lazy load when it is read)."""
+        deliveries = self.deliveries
+        for order in self.orders:
+            set_committed_value(order, "delivery", list(deliveries.get(order.id, ())))
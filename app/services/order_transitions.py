@@ -0,0 +1,111 @@
+"""
+Bulk order status transitions (vendor and chef portals)
+
+At lunch rush a vendor accepts or marks ready a queue of orders; one PUT /orders/{id}/accept per
+order is a full request, commit and history insert each. apply() moves a list of orders to one
+target status in a single transaction:
+
+  - the orders are row-locked in id order in one SELECT (the same order every writer uses, so two
+    overlapping bulk requests can't deadlock) and checked against the target's allowed source
+    statuses, in memory, all at once;
+  - the valid ones are updated with one UPDATE and get their OrderStatusHistory rows with one
+    multi-row INSERT; then one commit;
+  - every requested id gets a result: its new status, or why it was skipped (not found, wrong
+    status). Skipped orders don't fail the others.
+
+The transition tables below repeat the rules of the single-order endpoints.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import any_, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderStatusHistory
+
+# target status -> (allowed current statuses (None: any not final), timestamp columns set, history note)
+FINAL_STATUSES = ("picked_up", "delivered", "cancelled")
+VENDOR_TRANSITIONS = {
+    "accepted": (("new",), ("accepted_at",), "Order accepted by vendor"),
+    "picking": (("accepted",), ("picking_started_at",), "Picking started"),
+    "ready": (("picking", "accepted"), ("picking_completed_at", "ready_at"), "Order ready for pickup/delivery"),
+    # Pickup orders only: delivery orders are completed by the driver
+    "picked_up": (("ready",), ("picked_up_at",), "Order picked_up"),
+    "cancelled": (None, ("cancelled_at",), "Cancelled: {reason}"),
+}
+CHEF_TRANSITIONS = {
+    "accepted": (("new",), ("accepted_at",), "Order accepted by chef"),
+    "ready": (("accepted", "new"), ("ready_at",), "Order ready for pickup/delivery"),
+    "cancelled": (None, ("cancelled_at",), "Cancelled: {reason}"),
+}
+
+
+def _skipped(order_id, current_status: Optional[str], error: str) -> dict:
+    return {"order_id": order_id, "success": False, "status": current_status, "error": error}
+
+
+def _check(order, target: str, allowed) -> Optional[str]:
+    """Why the order can't move to target, None if it can."""
+    if allowed is None:
+        if order.status in FINAL_STATUSES:
+            return f"Order cannot be cancelled. Current status: {order.status}"
+        return None
+    if order.status not in allowed:
+        return f"Order cannot move to {target}. Current status: {order.status}"
+    if target == "picked_up" and order.delivery_method != "pickup":
+        return "Delivery order status is updated by the driver. Track progress in Deliveries."
+    return None
+
+
+def apply(db: Session, owner_clause, order_ids: list, target: str, transitions: dict,
+          changed_by=None, cancellation_reason: Optional[str] = None) -> dict:
+    """
+    Move the orders matching owner_clause (e.g. Order.vendor_id == ...) among order_ids to target.
+    Returns {"updated": n, "failed": n, "results": [...]} in request order. Commits.
+    """
+    allowed, timestamps, note = transitions[target]
+    ids = list(dict.fromkeys(order_ids))
+    locked = db.execute(
+        select(Order.id, Order.status, Order.delivery_method)
+        .where(Order.id == any_(literal(sorted(ids), ARRAY(UUID(as_uuid=True)))), owner_clause)
+        .order_by(Order.id)
+        .with_for_update()
+    ).all()
+    orders = {order.id: order for order in locked}
+
+    results, valid = {}, []
+    for order_id in ids:
+        order = orders.get(order_id)
+        if order is None:
+            results[order_id] = _skipped(order_id, None, "Order not found")
+            continue
+        error = _check(order, target, allowed)
+        if error:
+            results[order_id] = _skipped(order_id, order.status, error)
+        else:
+            valid.append(order_id)
+            results[order_id] = {"order_id": order_id, "success": True, "status": target, "error": None}
+
+    if valid:
+        now = datetime.utcnow()
+        values = {"status": target, **{column: now for column in timestamps}}
+        if target == "accepted" and changed_by is not None:
+            values["accepted_by"] = changed_by
+        if target == "cancelled":
+            values["cancellation_reason"] = cancellation_reason
+            if changed_by is not None:
+                values["cancelled_by"] = changed_by
+        db.execute(
+            update(Order)
+            .where(Order.id == any_(literal(valid, ARRAY(UUID(as_uuid=True)))))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        notes = note.format(reason=cancellation_reason or "No reason provided")
+        db.execute(insert(OrderStatusHistory), [
+            {"order_id": order_id, "status": target, "changed_by": changed_by, "notes": notes}
+            for order_id in valid
+        ])
+    db.commit()
+    return {"updated": len(valid), "failed": len(ids) - len(valid), "results": [results[i] for i in ids]}
@@ -0,0 +1,82 @@
+"""
+Product search: Postgres full-text search with trigram typo tolerance
+
+`products.search_vector` is a stored generated tsvector (name weighted A, description B) with a
+GIN index, and pg_trgm GIN indexes cover name, sku and barcode (migrations/add_product_search.sql).
+A search term matches a product when:
+  - its words match the tsvector (stemmed: "peppers" finds "Pepper Soup"; websearch syntax:
+    "quoted phrase", -exclude, or), or
+  - it is close to a word of the name (`term <% name`: "jolof" finds "Jollof Mix").
+Both are index lookups, unlike ILIKE '%term%' which scans every product.
+
+PRODUCT_SEARCH_MODE=fulltext enables it once the migration has run; the default, ilike, keeps the old
+substring matching (and no highlights).
+The column is not mapped on Product, so ORM loads and inserts never touch it.
+"""
+import html
+
+from sqlalchemy import String, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.core.config import settings
+from app.models.product import Product
+
+# Must match the expression of the generated column, or queries can't use its index
+FULLTEXT_CONFIG = "english"
+# ts_headline marks matches with these sentinels, not <mark>: the text is vendor input, so it is
+# HTML-escaped first (as_html) and only then are the sentinels turned into tags
+START_SEL, STOP_SEL = "{{hl}}", "{{/hl}}"
+HEADLINE_OPTIONS = f"StartSel={START_SEL}, StopSel={STOP_SEL}, MaxFragments=2, MaxWords=20, MinWords=5"
+NAME_HEADLINE_OPTIONS = f"HighlightAll=true, StartSel={START_SEL}, StopSel={STOP_SEL}"
+
+search_vector = literal_column("products.search_vector", TSVECTOR)
+
+
+def fulltext_enabled() -> bool:
+    return settings.PRODUCT_SEARCH_MODE == "fulltext"
+
+
+def tsquery(term: str):
+    return func.websearch_to_tsquery(FULLTEXT_CONFIG, term)
+
+
+def ilike_match(term: str):
+    """The legacy substring match on name/description (sequential scan)."""
+    pattern = f"%{term}%"
+    return or_(Product.name.ilike(pattern), Product.description.ilike(pattern))
+
+
+def fulltext_match(term: str):
+    return or_(
+        search_vector.op("@@")(tsquery(term)),
+        literal(term, String).op("<%")(Product.name),
+    )
+
+
+def match(term: str):
+    """WHERE clause for a search term, in the configured mode."""
+    return fulltext_match(term) if fulltext_enabled() else ilike_match(term)
+
+
+def rank(term: str):
+    """Relevance, higher first: text rank (name hits weigh more) plus closeness to a word of the name."""
+    return func.ts_rank_cd(search_vector, tsquery(term), 32) + func.word_similarity(term, Product.name)
+
+
+def highlights(term: str, product_ids: list):
+    """
+    select() of (id, name, description) with matches between START_SEL and STOP_SEL; run for one
+    page only, and pass the values through as_html().
+    """
+    query = tsquery(term)
+    return select(
+        Product.id,
+        func.ts_headline(FULLTEXT_CONFIG, Product.name, query, NAME_HEADLINE_OPTIONS).label("name"),
+        func.ts_headline(FULLTEXT_CONFIG, func.coalesce(Product.description, ""), query, HEADLINE_OPTIONS)
+        .label("description"),
+    ).where(Product.id.in_(product_ids))
+
+
+def as_html(headline: str) -> str:
+    """A highlights() value as safe HTML: the text escaped, matches wrapped in <mark>."""
+    return html.escape(headline).replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
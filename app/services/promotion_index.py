@@ -0,0 +1,141 @@
+"""
+In-memory index of active vendor promotions, for the storefront
+
+GET /customer/products used to query every active promotion for each page (and, for the discounted
+filter, test `product = ANY(promotions.product_ids)` per row). Instead each worker keeps the active
+and upcoming promotions indexed by vendor (vendor-wide ones) and by product:
+
+  - promotions_for(product_id, vendor_id, now): the badges of one product, two dict lookups;
+  - on_sale_clause(now): "discounted" as a plain WHERE on products (vendor IN (...) OR id = ANY(...)).
+
+Entries keep their start/end dates and lookups filter on them, so a promotion appears and
+disappears exactly at its boundaries; the index is also rebuilt once the earliest boundary passes,
+so ended promotions drop out. Promotion writes call invalidate() (this worker rebuilds on its next
+lookup); other workers pick writes up within PROMOTION_INDEX_TTL_SECONDS.
+"""
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, any_, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from app.core.config import settings
+from app.models.product import Product
+from app.models.promotion import Promotion
+
+
+class PromotionEntry:
+    __slots__ = ("id", "start_date", "end_date", "badge")
+
+    def __init__(self, promotion: Promotion):
+        self.id = promotion.id
+        self.start_date = promotion.start_date
+        self.end_date = promotion.end_date
+        self.badge = {
+            "id": str(promotion.id),
+            "name": str(promotion.name).strip() if promotion.name and str(promotion.name).strip() else "Special Offer",
+            "discount_type": promotion.discount_type,
+            "discount_value": float(promotion.discount_value) if promotion.discount_value else None,
+        }
+
+    def running(self, now: datetime) -> bool:
+        return self.start_date <= now <= self.end_date
+
+
+class ActivePromotions:
+    """Immutable snapshot: promotions by vendor (vendor-wide) and by product (listed products)."""
+
+    def __init__(self, promotions: list, version: int):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_vendor = {}
+        self.by_product = {}
+        for promotion in promotions:
+            entry = PromotionEntry(promotion)
+            if promotion.applies_to_all_products:
+                self.by_vendor.setdefault(promotion.vendor_id, []).append(entry)
+            elif promotion.product_ids:
+                for product_id in promotion.product_ids:
+                    self.by_product.setdefault(product_id, []).append(entry)
+        entries = [entry for group in (*self.by_vendor.values(), *self.by_product.values()) for entry in group]
+        now = datetime.utcnow()
+        # Earliest start still ahead or end still ahead: past it the snapshot should be rebuilt
+        upcoming = [d for entry in entries for d in (entry.start_date, entry.end_date) if d and d > now]
+        self.next_boundary: Optional[datetime] = min(upcoming) if upcoming else None
+        self.size = len({entry.id for entry in entries})
+
+    def promotions_for(self, product_id, vendor_id, now: datetime) -> list:
+        """Badges of the promotions running for a product (vendor-wide ones first)."""
+        entries = self.by_vendor.get(vendor_id, []) + self.by_product.get(product_id, [])
+        return [entry.badge for entry in entries if entry.running(now)]
+
+    def on_sale_clause(self, now: datetime):
+        """compare_at_price above price, or in a running promotion (vendor-wide or listing the product)."""
+        vendor_ids = [vendor_id for vendor_id, entries in self.by_vendor.items()
+                      if any(entry.running(now) for entry in entries)]
+        product_ids = [product_id for product_id, entries in self.by_product.items()
+                       if any(entry.running(now) for entry in entries)]
+        clauses = [and_(Product.compare_at_price.isnot(None), Product.compare_at_price > Product.price)]
+        if vendor_ids:
+            clauses.append(Product.vendor_id.in_(vendor_ids))
+        if product_ids:
+            # One array parameter however many products are promoted
+            clauses.append(Product.id == any_(literal(product_ids, ARRAY(UUID(as_uuid=True)))))
+        return or_(*clauses)
+
+
+class PromotionIndex:
+    """Per-worker holder of the current snapshot; rebuilt on invalidate(), TTL or a passed boundary."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[ActivePromotions] = None
+        self._version = 0
+        self.rebuilds = 0
+        self.invalidations = 0
+
+    def _fresh(self, snapshot: Optional[ActivePromotions]) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self._version
+            and time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+            and (snapshot.next_boundary is None or datetime.utcnow() < snapshot.next_boundary)
+        )
+
+    async def current(self, db) -> ActivePromotions:
+        """The snapshot, rebuilt first (one query) when stale."""
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            return snapshot
+        # Requests racing a rebuild each load their own copy; the last one to finish is kept
+        version = self._version
+        promotions = (await db.scalars(select(Promotion).where(
+            Promotion.is_active == True,
+            Promotion.end_date >= datetime.utcnow(),
+            Promotion.vendor_id.isnot(None)
+        ))).all()
+        # Built under the version read before loading: a write meanwhile makes it stale at once
+        snapshot = ActivePromotions(promotions, version)
+        self._snapshot = snapshot
+        self.rebuilds += 1
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Call after committing a promotion write."""
+        self._version += 1
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "promotions": snapshot.size if snapshot else 0,
+            "vendor_wide_vendors": len(snapshot.by_vendor) if snapshot else 0,
+            "products_listed": len(snapshot.by_product) if snapshot else 0,
+            "next_boundary": snapshot.next_boundary.isoformat() if snapshot and snapshot.next_boundary else None,
+            "rebuilds": self.rebuilds,
+            "invalidations": self.invalidations,
+        }
+
+
+promotion_index = PromotionIndex(ttl_seconds=settings.PROMOTION_INDEX_TTL_SECONDS)
@@ -0,0 +1,159 @@
+"""
+Promotion prices: write a promotion's discount to its products' prices, and take it back off
+
+A discounted product keeps its regular price in compare_at_price and the discounted one in price.
+Every change is one `UPDATE products SET price = ..., compare_at_price = ...` per chunk of
+PROMOTION_PRICE_CHUNK_SIZE products (keyset over id, rows locked in id order, committed per chunk so
+a vendor-wide promotion on a large catalog never holds thousands of row locks at once). A promotion's
+prices_applied_at is committed with its last chunk. Prices are computed in SQL numeric,
+rounded to cents, so there is no float drift. Re-running any of these is harmless: the discount is
+always taken off the regular price.
+
+apply_promotion_to_products and revert_promotion_prices return the number of products they updated.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import Numeric, any_, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from app.core.config import settings
+from app.models.product import Product
+from app.models.promotion import Promotion
+
+
+def _promotion_products(vendor_id, applies_to_all: bool, product_ids) -> list:
+    """WHERE clauses for the active products a promotion covers, or None if it covers none."""
+    if applies_to_all:
+        return [Product.vendor_id == vendor_id, Product.status == "active"]
+    if product_ids:
+        return [Product.id.in_(product_ids), Product.vendor_id == vendor_id, Product.status == "active"]
+    return None
+
+
+def _update_in_chunks(db, conditions: list, values: dict, finish=None) -> int:
+    """
+    Apply `values` to the products matching `conditions`, a chunk per transaction. Each chunk's rows
+    are locked in id order first, like every other product writer (checkout, stock reservations), so
+    a chunk can't deadlock with them. finish(), if given, runs in the last chunk's transaction.
+    """
+    chunk = settings.PROMOTION_PRICE_CHUNK_SIZE
+    updated, last_id = 0, None
+    while True:
+        batch = select(Product.id).where(*conditions)
+        if last_id is not None:
+            batch = batch.where(Product.id > last_id)
+        ids = db.scalars(batch.order_by(Product.id).limit(chunk).with_for_update()).all()
+        if ids:
+            db.execute(
+                update(Product)
+                .where(Product.id == any_(literal(ids, ARRAY(UUID(as_uuid=True)))))
+                .values(values)
+                .execution_options(synchronize_session=False)
+            )
+        last_chunk = len(ids) < chunk
+        if last_chunk and finish is not None:
+            finish()
+        db.commit()
+        updated += len(ids)
+        if last_chunk:
+            return updated
+        last_id = ids[-1]
+
+
+def discounted_price(promotion):
+    """SQL expression for a product's price under `promotion`, or None if it has no usable discount."""
+    if not promotion.discount_value:
+        return None
+    value = Decimal(str(promotion.discount_value))
+    regular_price = func.coalesce(Product.compare_at_price, Product.price)
+    if promotion.discount_type == "percentage":
+        price = regular_price * literal(100 - value, Numeric(10, 2)) / 100
+    elif promotion.discount_type == "fixed_amount":
+        price = regular_price - literal(value, Numeric(10, 2))
+    else:
+        return None
+    # Never below zero
+    return func.greatest(func.round(price, 2), 0)
+
+
+def apply_promotion_to_products(promotion, db) -> int:
+    """Apply promotion discount to products (only while it is active, approved and running)"""
+    now = datetime.utcnow()
+    if not (promotion.is_active and promotion.approval_status == "approved" and promotion.start_date <= now <= promotion.end_date):
+        return 0
+
+    conditions = _promotion_products(promotion.vendor_id, promotion.applies_to_all_products, promotion.product_ids)
+    price = discounted_price(promotion)
+
+    def mark_applied():
+        # The scheduler applies started promotions that don't have this yet: set it with the last
+        # chunk, so a run that fails partway is retried (re-applying is harmless)
+        promotion.prices_applied_at = now
+
+    if conditions is None or price is None:
+        mark_applied()
+        db.commit()
+        return 0
+
+    # SET expressions read the row as it was: compare_at_price keeps the regular price once discounted
+    return _update_in_chunks(db, conditions, {
+        Product.price: price,
+        Product.compare_at_price: func.coalesce(Product.compare_at_price, Product.price),
+    }, finish=mark_applied)
+
+
+def revert_promotion_prices(promotion, old_product_ids, old_applies_to_all, db) -> int:
+    """Revert prices for products that were previously affected by this promotion"""
+    conditions = _promotion_products(promotion.vendor_id, old_applies_to_all, old_product_ids)
+    if conditions is None:
+        return 0
+    # Set price back to compare_at_price, clear compare_at_price
+    return _update_in_chunks(db, conditions + [Product.compare_at_price.isnot(None)], {
+        Product.price: Product.compare_at_price,
+        Product.compare_at_price: None,
+    })
+
+
+def revert_expired_promotions(db) -> dict:
+    """
+    Revert prices of approved, active promotions past their end date and deactivate them:
+    {"promotions": n, "products": products reverted}. The same vendors' running promotions are
+    marked unapplied (their products may have been reverted too) for the scheduler to re-apply.
+    """
+    now = datetime.utcnow()
+    expired_promotions = db.scalars(select(Promotion).where(
+        Promotion.end_date < now,
+        Promotion.is_active == True,
+        Promotion.approval_status == "approved"
+    )).all()
+
+    reverted = {"promotions": 0, "products": 0}
+    vendor_ids = set()
+    for promotion in expired_promotions:
+        reverted["products"] += revert_promotion_prices(
+            promotion, promotion.product_ids, promotion.applies_to_all_products, db
+        )
+        promotion.is_active = False
+        db.commit()
+        reverted["promotions"] += 1
+        vendor_ids.add(promotion.vendor_id)
+
+    if vendor_ids:
+        # The revert also took off the discount of any product in the vendor's other running
+        # promotions; unmark those so the scheduler's due query applies them again
+        db.execute(
+            update(Promotion)
+            .where(
+                Promotion.vendor_id.in_(vendor_ids),
+                Promotion.is_active == True,
+                Promotion.approval_status == "approved",
+                Promotion.start_date <= now,
+                Promotion.end_date >= now,
+                Promotion.prices_applied_at.isnot(None),
+            )
+            .values(prices_applied_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    return reverted
@@ -0,0 +1,176 @@
+"""
+Promotion scheduler: product prices follow promotion start and end dates
+
+Discounts used to be applied only when a promotion was saved (so one starting tomorrow never took
+effect) and reverted from inside GET /customer/products, which made a storefront read take write
+locks and commit. Instead every worker runs a background loop that wakes at the next promotion
+boundary (or after PROMOTION_SCHEDULER_INTERVAL_SECONDS at most) and:
+  - reverts prices of approved, active promotions whose end_date has passed (and deactivates them),
+  - applies approved, active promotions whose start_date has passed and prices_applied_at is unset.
+
+Only one worker does the work per run: it claims the "promotion_scheduler" row of scheduler_leases
+for PROMOTION_SCHEDULER_LEASE_SECONDS (a committed row, so it works through PgBouncer transaction
+pooling, where a session advisory lock would stay on whichever backend took it), and the others skip
+that run. The lease is given back at the end of the run; a crashed worker's lease just runs out. POST /promotions/maintenance/revert-expired
+triggers a run by hand (e.g. from cron when the scheduler is disabled).
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.promotion import Promotion
+from app.models.scheduler import SchedulerLease
+from app.services import promotion_pricing
+
+LEASE_NAME = "promotion_scheduler"
+
+_task: Optional[asyncio.Task] = None
+
+
+def _scheduled() -> tuple:
+    """Promotions whose dates drive product prices (chef promotions have no vendor products)."""
+    return (
+        Promotion.is_active == True,
+        Promotion.approval_status == "approved",
+        Promotion.vendor_id.isnot(None),
+    )
+
+
+def run_boundaries(db: Session) -> dict:
+    """
+    Revert expired and apply due promotions:
+    {"reverted": n, "applied": n, "products_reverted": n, "products_discounted": n}.
+    """
+    # Revert first: a product leaving one promotion and entering another ends up with the new price.
+    # The revert also unmarks the vendor's running promotions, so they are in `due` and re-applied
+    reverted = promotion_pricing.revert_expired_promotions(db)
+    now = datetime.utcnow()
+    due = db.scalars(select(Promotion).where(
+        *_scheduled(),
+        Promotion.start_date <= now,
+        Promotion.end_date >= now,
+        Promotion.prices_applied_at.is_(None),
+    ).order_by(Promotion.start_date)).all()
+    discounted = sum(promotion_pricing.apply_promotion_to_products(promotion, db) for promotion in due)
+    return {
+        "reverted": reverted["promotions"],
+        "applied": len(due),
+        "products_reverted": reverted["products"],
+        "products_discounted": discounted,
+    }
+
+
+def next_boundary(db: Session) -> Optional[datetime]:
+    """Earliest upcoming start (of a promotion not yet applied) or end date, None if nothing is scheduled."""
+    now = datetime.utcnow()
+    starts = select(func.min(Promotion.start_date)).where(
+        *_scheduled(),
+        Promotion.start_date > now,
+        Promotion.prices_applied_at.is_(None),
+    ).scalar_subquery()
+    ends = select(func.min(Promotion.end_date)).where(
+        *_scheduled(),
+        Promotion.end_date >= now,
+    ).scalar_subquery()
+    first_start, first_end = db.execute(select(starts, ends)).one()
+    upcoming = [boundary for boundary in (first_start, first_end) if boundary is not None]
+    return min(upcoming) if upcoming else None
+
+
+def _claim_lease(db: Session, holder: str) -> bool:
+    """Take the lease if it is free (or expired); committed at once. Database time throughout."""
+    locked_until = func.now() + timedelta(seconds=settings.PROMOTION_SCHEDULER_LEASE_SECONDS)
+    statement = insert(SchedulerLease).values(
+        name=LEASE_NAME, holder=holder, locked_until=func.timezone("UTC", locked_until)
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[SchedulerLease.name],
+        set_={"holder": statement.excluded.holder, "locked_until": statement.excluded.locked_until},
+        where=SchedulerLease.locked_until < func.timezone("UTC", func.now()),
+    ).returning(SchedulerLease.name)
+    claimed = db.execute(statement).scalar() is not None
+    db.commit()
+    return claimed
+
+
+def _release_lease(db: Session, holder: str) -> None:
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == LEASE_NAME, SchedulerLease.holder == holder)
+        .values(locked_until=func.timezone("UTC", func.now()))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def run_once() -> Optional[dict]:
+    """
+    One run under the lease: run_boundaries() counts plus "next_boundary" (datetime or None),
+    or None when another worker holds it.
+    """
+    holder = uuid.uuid4().hex
+    with SessionLocal() as db:
+        if not _claim_lease(db, holder):
+            return None
+        try:
+            result = run_boundaries(db)
+            result["next_boundary"] = next_boundary(db)
+            db.commit()
+            return result
+        finally:
+            db.rollback()
+            _release_lease(db, holder)
+
+
+async def run_once_async() -> Optional[dict]:
+    return await asyncio.to_thread(run_once)
+
+
+def _sleep_seconds(next_at: Optional[datetime]) -> float:
+    interval = settings.PROMOTION_SCHEDULER_INTERVAL_SECONDS
+    if next_at is None:
+        return interval
+    # Boundaries are inclusive (start_date <= now): wake just after
+    return min(interval, max(1.0, (next_at - datetime.utcnow()).total_seconds() + 1))
+
+
+async def _loop() -> None:
+    while True:
+        next_at = None
+        try:
+            result = await run_once_async()
+            if result is not None:
+                next_at = result["next_boundary"]
+                if result["reverted"] or result["applied"]:
+                    print(f"[promotions] reverted {result['reverted']} ({result['products_reverted']} products), "
+                          f"applied {result['applied']} ({result['products_discounted']} products)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Keep the loop alive: the next run retries
+            print(f"Warning: promotion scheduler run failed: {e}")
+        await asyncio.sleep(_sleep_seconds(next_at))
+
+
+def start() -> None:
+    global _task
+    if settings.PROMOTION_SCHEDULER_ENABLED and _task is None:
+        _task = asyncio.get_running_loop().create_task(_loop())
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
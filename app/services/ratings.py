@@ -0,0 +1,144 @@
+"""
+Denormalized ratings: rating_sum / rating_count / average_rating on products, vendors and chefs
+
+Listings used to run AVG(rating) / COUNT(*) over reviews for every page. Instead each row carries the
+sum and count of its public reviews and the average derived from them, and every write that adds,
+removes, hides or un-hides a review adjusts them in the same transaction with a relative UPDATE
+(`rating_sum = rating_sum + :rating`), so concurrent reviews never overwrite each other.
+Vendors and chefs keep their existing total_reviews column as the count.
+
+Write paths: customer_reviews.create_product_review and admin_reviews moderation/deletion. Chef
+reviews have no write endpoint yet; their totals come from the backfill.
+
+    python -m app.services.ratings --check       # rows whose totals disagree with their reviews
+    python -m app.services.ratings --backfill    # recompute those rows (one-shot, idempotent)
+"""
+import argparse
+import sys
+
+from sqlalchemy import Numeric, cast, func, text, update
+
+from app.models.product import Product
+from app.models.vendor import Vendor
+
+# table -> (reviews table, foreign key, count column, average when there are no reviews)
+TARGETS = {
+    "products": ("reviews", "product_id", "rating_count", "NULL"),
+    "vendors": ("reviews", "vendor_id", "total_reviews", "0"),
+    "chefs": ("chef_reviews", "chef_id", "total_reviews", "0"),
+}
+
+
+def _adjusted(model, count_column, rating: int, delta: int, empty):
+    # SET expressions see the row before the update, so the average is computed from the new totals
+    rating_sum = func.coalesce(model.rating_sum, 0) + rating * delta
+    rating_count = func.coalesce(count_column, 0) + delta
+    average = func.round(cast(rating_sum, Numeric) / func.nullif(rating_count, 0), 2)
+    return {
+        model.rating_sum: rating_sum,
+        count_column: rating_count,
+        model.average_rating: average if empty is None else func.coalesce(average, empty),
+    }
+
+
+def apply_review(db, review, delta: int) -> None:
+    """
+    Count (delta=1) or uncount (delta=-1) a public review on its product and vendor. Runs in the
+    caller's transaction: commit together with the review change, then invalidate the "vendors"
+    and "stores" reference data (they carry vendor ratings).
+    """
+    # Always product before vendor, so concurrent reviews lock rows in the same order
+    if review.product_id:
+        db.execute(
+            update(Product).where(Product.id == review.product_id)
+            .values(_adjusted(Product, Product.rating_count, review.rating, delta, None))
+            .execution_options(synchronize_session=False)
+        )
+    db.execute(
+        update(Vendor).where(Vendor.id == review.vendor_id)
+        .values(_adjusted(Vendor, Vendor.total_reviews, review.rating, delta, 0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def apply_visibility_change(db, review, was_public: bool) -> None:
+    """After moderation changed `review.is_public`: count it if it became public, uncount if hidden."""
+    is_public = review.is_public is True
+    if is_public != was_public:
+        apply_review(db, review, 1 if is_public else -1)
+
+
+def _actual(table: str) -> str:
+    reviews, key, _, _ = TARGETS[table]
+    return f"""
+        SELECT t.id, COALESCE(SUM(r.rating), 0) AS rating_sum, COUNT(r.id) AS rating_count
+        FROM {table} t LEFT JOIN {reviews} r ON r.{key} = t.id AND r.is_public = true
+        GROUP BY t.id
+    """
+
+
+def _average(table: str, alias: str) -> str:
+    empty = TARGETS[table][3]
+    return f"COALESCE(ROUND({alias}.rating_sum::numeric / NULLIF({alias}.rating_count, 0), 2), {empty})"
+
+
+def _differs(table: str) -> str:
+    count_column = TARGETS[table][2]
+    return (
+        f"(t.rating_sum, t.{count_column}, t.average_rating) IS DISTINCT FROM "
+        f"(a.rating_sum, a.rating_count, {_average(table, 'a')})"
+    )
+
+
+def check(db, sample: int = 10) -> dict:
+    """{table: {"mismatched": n, "sample": [ids]}} of rows whose totals disagree with their reviews."""
+    report = {}
+    for table in TARGETS:
+        rows = db.execute(text(
+            f"WITH a AS ({_actual(table)}) SELECT t.id FROM {table} t JOIN a ON a.id = t.id WHERE {_differs(table)}"
+        )).scalars().all()
+        report[table] = {"mismatched": len(rows), "sample": [str(row_id) for row_id in rows[:sample]]}
+    return report
+
+
+def backfill(db) -> dict:
+    """Recompute totals from reviews for the rows that disagree; {table: rows updated}. Commits."""
+    updated = {}
+    for table in TARGETS:
+        count_column = TARGETS[table][2]
+        result = db.execute(text(f"""
+            WITH a AS ({_actual(table)})
+            UPDATE {table} t
+            SET rating_sum = a.rating_sum, {count_column} = a.rating_count, average_rating = {_average(table, 'a')}
+            FROM a WHERE a.id = t.id AND {_differs(table)}
+        """))
+        updated[table] = result.rowcount
+        db.commit()
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--check", action="store_true", help="Report rows whose totals disagree with their reviews")
+    group.add_argument("--backfill", action="store_true", help="Recompute totals from reviews")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+    db = SessionLocal()
+    try:
+        if args.backfill:
+            for table, count in backfill(db).items():
+                print(f"{table:>10}: {count} rows updated")
+            return
+        report = check(db)
+    finally:
+        db.close()
+    for table, result in report.items():
+        print(f"{table:>10}: {result['mismatched']} mismatched" + (f", e.g. {result['sample']}" if result["sample"] else ""))
+    if any(result["mismatched"] for result in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Stock reservations: units held for a customer while they pay
+
+Stock used to be checked only at POST /customer/cart/checkout, after the customer had paid, so during
+a flash promotion several customers could pay for the last units and all but one then failed with
+"Insufficient stock". Now, when /customer/payments/create-payment-intent is sent the cart's items,
+they are held for STOCK_RESERVATION_TTL_SECONDS (a new intent replaces the customer's earlier holds):
+
+  - available = stock_quantity - units held by other customers' active, unexpired reservations;
+  - reserve() and checkout lock the products (lock_products(): one statement, id order) before
+    reading it, so two customers can't both hold or buy the last unit;
+  - checkout marks the customer's holds consumed in the same transaction that takes the stock.
+
+A hold stops counting at expires_at whatever its status; a background sweep on every worker marks
+those holds expired (for the expiration metrics and to keep the active-hold indexes small).
+reservation_index keeps the units held per product in memory for the storefront's availability.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import any_, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.inventory import StockReservation
+from app.models.product import Product
+
+_task: Optional[asyncio.Task] = None
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product: Optional[Product], product_id, available: int):
+        self.product = product
+        self.product_id = product_id
+        self.available = available
+        name = product.name if product is not None else str(product_id)
+        super().__init__(f"Insufficient stock for {name}. Available: {available}")
+
+
+class ReservationStats:
+    """Per-worker counters for /metrics."""
+    __slots__ = ("created", "consumed", "released", "expired", "sweeps")
+
+    def __init__(self):
+        self.created = 0
+        self.consumed = 0
+        self.released = 0
+        self.expired = 0
+        self.sweeps = 0
+
+
+reservation_stats = ReservationStats()
+
+
+def _active(now: datetime) -> tuple:
+    return StockReservation.status == "active", StockReservation.expires_at > now
+
+
+async def lock_products(db, product_ids) -> dict:
+    """{id: Product}, row-locked in id order in one statement (every writer locks in this order)."""
+    ids = sorted(product_ids)
+    products = await db.scalars(
+        select(Product)
+        .where(Product.id == any_(literal(ids, ARRAY(UUID(as_uuid=True)))))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+    return {product.id: product for product in products.all()}
+
+
+async def held_quantities(db, product_ids, exclude_customer_id=None) -> dict:
+    """{product_id: units held} by active reservations (other customers' only, with exclude_customer_id)."""
+    statement = select(StockReservation.product_id, func.sum(StockReservation.quantity)).where(
+        *_active(datetime.utcnow()),
+        StockReservation.product_id.in_(list(product_ids)),
+    ).group_by(StockReservation.product_id)
+    if exclude_customer_id is not None:
+        statement = statement.where(StockReservation.customer_id != exclude_customer_id)
+    return {product_id: int(units) for product_id, units in (await db.execute(statement)).all()}
+
+
+async def check_available(db, products: dict, quantities: dict, customer_id) -> None:
+    """Raise InsufficientStock unless every {product_id: quantity} is available to this customer."""
+    held = await held_quantities(db, list(quantities), exclude_customer_id=customer_id)
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
+        if product is None:
+            raise InsufficientStock(None, product_id, 0)
+        available = (product.stock_quantity or 0) - held.get(product_id, 0)
+        if available < quantity:
+            raise InsufficientStock(product, product_id, max(available, 0))
+
+
+async def _set_status(db, status: str, *conditions) -> int:
+    ids = await db.scalars(
+        update(StockReservation)
+        .where(StockReservation.status == "active", *conditions)
+        .values(status=status)
+        .returning(StockReservation.id)
+        .execution_options(synchronize_session=False)
+    )
+    return len(ids.all())
+
+
+async def reserve(db, customer_id, quantities: dict) -> datetime:
+    """
+    Hold {product_id: quantity} for the customer, replacing their earlier holds; returns expires_at.
+    Raises InsufficientStock (nothing held). Commits.
+    """
+    # Products first, like checkout: both lock products before touching reservation rows
+    products = await lock_products(db, list(quantities))
+    try:
+        await check_available(db, products, quantities, customer_id)
+    except InsufficientStock:
+        await db.rollback()
+        raise
+    released = await _set_status(db, "released", StockReservation.customer_id == customer_id)
+    expires_at = datetime.utcnow() + timedelta(seconds=settings.STOCK_RESERVATION_TTL_SECONDS)
+    await db.execute(insert(StockReservation), [
+        {"product_id": product_id, "customer_id": customer_id, "quantity": quantity, "expires_at": expires_at}
+        for product_id, quantity in quantities.items()
+    ])
+    await db.commit()
+    reservation_stats.released += released
+    reservation_stats.created += len(quantities)
+    reservation_index.invalidate()
+    return expires_at
+
+
+async def release(db, customer_id) -> int:
+    """Drop the customer's holds (e.g. the payment intent could not be created). Commits."""
+    released = await _set_status(db, "released", StockReservation.customer_id == customer_id)
+    await db.commit()
+    reservation_stats.released += released
+    reservation_index.invalidate()
+    return released
+
+
+async def consume(db, customer_id, product_ids) -> int:
+    """Mark the customer's holds on these products consumed; part of the caller's transaction."""
+    consumed = await _set_status(
+        db, "consumed", StockReservation.customer_id == customer_id, StockReservation.product_id.in_(list(product_ids))
+    )
+    reservation_stats.consumed += consumed
+    return consumed
+
+
+async def expire(db) -> int:
+    """Mark active holds past expires_at expired. Commits."""
+    expired = await _set_status(db, "expired", StockReservation.expires_at <= datetime.utcnow())
+    await db.commit()
+    reservation_stats.expired += expired
+    reservation_stats.sweeps += 1
+    if expired:
+        reservation_index.invalidate()
+    return expired
+
+
+class HeldUnits:
+    """Immutable snapshot: active holds per product, each (expires_at, quantity)."""
+
+    def __init__(self, rows: list, version: int):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_product = {}
+        for product_id, quantity, expires_at in rows:
+            self.by_product.setdefault(product_id, []).append((expires_at, quantity))
+        self.size = len(rows)
+
+    def held(self, product_id, now: datetime) -> int:
+        return sum(quantity for expires_at, quantity in self.by_product.get(product_id, ()) if expires_at > now)
+
+    def available(self, product: Product, now: datetime) -> int:
+        """stock_quantity minus units held, never below zero."""
+        return max((product.stock_quantity or 0) - self.held(product.id, now), 0)
+
+
+class ReservationIndex:
+    """Per-worker holder of the current HeldUnits; rebuilt on invalidate() or after its TTL."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[HeldUnits] = None
+        self._version = 0
+        self.rebuilds = 0
+
+    async def current(self, db) -> HeldUnits:
+        """The snapshot, rebuilt first (one query) when stale."""
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot.version == self._version
+                and time.monotonic() - snapshot.loaded_at < self.ttl_seconds):
+            return snapshot
+        version = self._version
+        rows = (await db.execute(select(
+            StockReservation.product_id, StockReservation.quantity, StockReservation.expires_at
+        ).where(*_active(datetime.utcnow())))).all()
+        snapshot = HeldUnits(rows, version)
+        self._snapshot = snapshot
+        self.rebuilds += 1
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Call after committing a reservation write."""
+        self._version += 1
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "active_reservations": snapshot.size if snapshot else 0,
+            "products_held": len(snapshot.by_product) if snapshot else 0,
+            "rebuilds": self.rebuilds,
+        }
+
+
+reservation_index = ReservationIndex(ttl_seconds=settings.STOCK_RESERVATION_INDEX_TTL_SECONDS)
+
+
+async def _loop() -> None:
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                expired = await expire(db)
+            if expired:
+                print(f"[reservations] expired {expired} stock holds")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Keep the loop alive: the next sweep retries
+            print(f"Warning: stock reservation sweep failed: {e}")
+        await asyncio.sleep(settings.STOCK_RESERVATION_SWEEP_INTERVAL_SECONDS)
+
+
+def start() -> None:
+    global _task
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_loop())
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Event-loop blocking benchmark for the async data layer.
+
+Measures p50/p95/p99 of concurrent GET /api/v1/customer/products calls in three scenarios:
+  baseline    - nothing else running
+  sync_slow   - a slow query runs on the sync Session inside an `async def` route
+                (how admin analytics/export still work): it freezes the event loop
+  async_slow  - the same slow query on the AsyncSession: the loop keeps serving
+
+Usage:
+    python -m benchmarks.async_db_latency --requests 200 --concurrency 20 --slow-seconds 2
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.main import app  # noqa: E402
+from app.core.database import get_db, get_async_db  # noqa: E402
+from benchmarks.common import serve, run_load, summarize, write_results  # noqa: E402
+
+
+@app.get("/__bench/slow-sync", include_in_schema=False)
+async def _slow_sync(seconds: float, db: Session = Depends(get_db)):
+    db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+    return {"slept": seconds}
+
+
+@app.get("/__bench/slow-async", include_in_schema=False)
+async def _slow_async(seconds: float, db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+    return {"slept": seconds}
+
+
+async def _scenario(base_url: str, args, slow_path=None) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        # Warm up pools before measuring
+        await run_load(client, "GET", "/api/v1/customer/products", total=args.concurrency, concurrency=args.concurrency)
+        slow_task = None
+        if slow_path:
+            async def keep_slow_query_running():
+                while True:
+                    await client.get(slow_path, params={"seconds": args.slow_seconds})
+            slow_task = asyncio.create_task(keep_slow_query_running())
+            await asyncio.sleep(0.2)  # let the first slow query start
+        try:
+            latencies, errors, elapsed = await run_load(
+                client, "GET", "/api/v1/customer/products",
+                total=args.requests, concurrency=args.concurrency,
+                request_kwargs={"params": {"limit": 20}},
+            )
+        finally:
+            if slow_task:
+                slow_task.cancel()
+    return summarize(latencies, elapsed, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--slow-seconds", type=float, default=2.0)
+    parser.add_argument("--output", default="benchmarks/results/async_db_latency.json")
+    args = parser.parse_args()
+
+    results = {}
+    with serve(app) as base_url:
+        results["baseline"] = asyncio.run(_scenario(base_url, args))
+        results["sync_slow"] = asyncio.run(_scenario(base_url, args, "/__bench/slow-sync"))
+        results["async_slow"] = asyncio.run(_scenario(base_url, args, "/__bench/slow-async"))
+
+    for name, stats in results.items():
+        print(f"{name:>11}: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms "
+              f"({stats['throughput_rps']} req/s, {stats['errors']} errors)")
+    path = write_results(args.output, {"benchmark": "async_db_latency", "params": vars(args), "results": results})
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Concurrent checkout: throughput under contention, and an oversell stress test.
+
+Scenarios (against the seeded bench catalog, see benchmarks.seed):
+
+  contention   Many customers checking out at once, every cart drawing 2-5 lines from a small set
+               of hot products in a different order (the pattern that deadlocks or oversells when
+               stock is checked and written per line without locks).
+  oversell     One product with --stock units left and --buyers concurrent checkouts of 1 unit each.
+               Exactly --stock of them must succeed, the rest must be refused, and stock must end at
+               0: anything else is an oversell (or a lost sale) and the script exits with status 1.
+
+The oversell product's stock is restored to the checkout pool level afterwards.
+
+Usage:
+    python -m benchmarks.seed --scale 1            # once
+    python -m benchmarks.checkout_concurrency
+    python -m benchmarks.checkout_concurrency --requests 500 --concurrency 50 --hot 5 --stock 25 --buyers 200
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+from sqlalchemy import select, update
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.main import app  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from benchmarks.common import serve, summarize, write_results  # noqa: E402
+from benchmarks.seed import CHECKOUT_POOL_STOCK, bench_fixtures  # noqa: E402
+
+API = "/api/v1"
+CHECKOUT = f"{API}/customer/cart/checkout"
+
+
+def _headers(fixtures: dict) -> dict:
+    customer = fixtures["customer"]
+    token = create_access_token({"sub": customer["email"], "customer_id": customer["id"]}, timedelta(hours=2))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _body(fixtures: dict, items: list) -> dict:
+    return {
+        "items": items,
+        "delivery_method": "delivery",
+        "delivery_address_id": fixtures["customer"]["address_id"],
+        "payment_method": "cash",
+    }
+
+
+async def _checkouts(client: httpx.AsyncClient, headers: dict, bodies: list, concurrency: int) -> tuple:
+    """POST every body with at most `concurrency` in flight: (latencies_ms, status counts, elapsed_s)."""
+    latencies, statuses = [], Counter()
+    queue = iter(bodies)
+    # All workers start together so the first wave really does collide
+    gate = asyncio.Event()
+
+    async def worker():
+        await gate.wait()
+        for body in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.post(CHECKOUT, json=body, headers=headers)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError:
+                statuses["error"] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    started = time.perf_counter()
+    gate.set()
+    await asyncio.gather(*tasks)
+    return latencies, statuses, time.perf_counter() - started
+
+
+def _stock(product_id: str) -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(Product.stock_quantity).where(Product.id == product_id))
+    finally:
+        db.close()
+
+
+def _set_stock(product_id: str, stock: int) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(Product).where(Product.id == product_id).values(stock_quantity=stock))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def contention(client, fixtures: dict, headers: dict, args) -> dict:
+    hot = fixtures["checkout_product_ids"][:args.hot]
+
+    def cart(i: int) -> list:
+        # A different subset and order per request: lock order in the endpoint must not depend on it
+        lines = 2 + i % 4
+        return [{"product_id": hot[(i * 7 + k * (1 + i % 3)) % len(hot)], "quantity": 1} for k in range(lines)]
+
+    bodies = [_body(fixtures, cart(i)) for i in range(args.requests)]
+    latencies, statuses, elapsed = await _checkouts(client, headers, bodies, args.concurrency)
+    errors = sum(count for status, count in statuses.items() if status != 201)
+    return {**summarize(latencies, elapsed, errors), "statuses": dict(statuses)}
+
+
+async def oversell(client, fixtures: dict, headers: dict, args) -> dict:
+    product_id = fixtures["checkout_product_ids"][-1]
+    _set_stock(product_id, args.stock)
+    try:
+        bodies = [_body(fixtures, [{"product_id": product_id, "quantity": 1}]) for _ in range(args.buyers)]
+        latencies, statuses, elapsed = await _checkouts(client, headers, bodies, args.concurrency)
+        final_stock = _stock(product_id)
+    finally:
+        _set_stock(product_id, CHECKOUT_POOL_STOCK)
+    sold = statuses.get(201, 0)
+    return {
+        **summarize(latencies, elapsed, args.buyers - sold),
+        "statuses": dict(statuses),
+        "initial_stock": args.stock,
+        "sold": sold,
+        "final_stock": final_stock,
+        "oversold": sold > args.stock or final_stock < 0,
+        "consistent": sold == args.stock and final_stock == 0,
+    }
+
+
+async def _run(base_url: str, fixtures: dict, args) -> dict:
+    headers = _headers(fixtures)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        return {
+            "contention": await contention(client, fixtures, headers, args),
+            "oversell": await oversell(client, fixtures, headers, args),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="Checkouts in the contention scenario")
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--hot", type=int, default=5, help="Products every contention cart draws from")
+    parser.add_argument("--stock", type=int, default=20, help="Units of the oversell product")
+    parser.add_argument("--buyers", type=int, default=200, help="Concurrent 1-unit checkouts of it")
+    parser.add_argument("--output", default="benchmarks/results/checkout_concurrency.json")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fixtures = bench_fixtures(db)
+    finally:
+        db.close()
+    if len(fixtures["checkout_product_ids"]) <= args.hot:
+        raise SystemExit("Not enough checkout pool products: reseed with `python -m benchmarks.seed`")
+
+    with serve(app) as base_url:
+        results = asyncio.run(_run(base_url, fixtures, args))
+
+    c, o = results["contention"], results["oversell"]
+    print(f"  contention: {c['throughput_rps']} checkouts/s  p50={c['p50_ms']}ms  p95={c['p95_ms']}ms  "
+          f"p99={c['p99_ms']}ms  statuses={c['statuses']}")
+    print(f"    oversell: stock {o['initial_stock']}, {args.buyers} buyers -> sold {o['sold']}, "
+          f"final stock {o['final_stock']}  statuses={o['statuses']}")
+
+    path = write_results(args.output, {"benchmark": "checkout_concurrency", "params": vars(args), "results": results})
+    print(f"Results written to {path}")
+    if not o["consistent"]:
+        raise SystemExit("OVERSELL: sold units and remaining stock don't add up to the initial stock")
+
+
+if __name__ == "__main__":
+    main()
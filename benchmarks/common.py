@@ -0,0 +1,98 @@
+"""
+Shared helpers for the benchmark scripts: in-process server, load generator, stats
+"""
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import uvicorn
+
+
+def percentile(values: list, pct: float) -> Optional[float]:
+    """Nearest-rank percentile (pct in 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies_ms: list, elapsed_s: float, errors: int = 0) -> dict:
+    """Throughput and latency percentiles for one scenario."""
+    count = len(latencies_ms)
+    return {
+        "requests": count,
+        "errors": errors,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(count / elapsed_s, 2) if elapsed_s > 0 else None,
+        "p50_ms": _round(percentile(latencies_ms, 50)),
+        "p95_ms": _round(percentile(latencies_ms, 95)),
+        "p99_ms": _round(percentile(latencies_ms, 99)),
+        "max_ms": _round(max(latencies_ms) if latencies_ms else None),
+    }
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+@contextmanager
+def serve(app, host: str = "127.0.0.1", port: int = 0):
+    """Run an ASGI app with uvicorn in a background thread; yields its base URL."""
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{bound_port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+async def run_load(client: httpx.AsyncClient, method: str, url: str, total: int, concurrency: int,
+                   request_kwargs=None) -> tuple:
+    """
+    Fire `total` requests with at most `concurrency` in flight.
+    `request_kwargs` is a dict or a callable(i) -> dict (for per-request bodies/headers).
+    Returns (latencies_ms, errors, elapsed_s).
+    """
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            kwargs = request_kwargs(i) if callable(request_kwargs) else (request_kwargs or {})
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def write_results(path, payload: dict) -> Path:
+    """Write a results document as pretty JSON and return its path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return path
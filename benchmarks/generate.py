@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Large-scale synthetic data generator (COPY FROM STDIN, tables in parallel).
+
+Produces rows in the shapes of the existing models - vendors, vendor users, stores with
+coordinates, categories, products, customers, addresses, drivers, orders with items,
+deliveries, reviews, chat messages and promotions - streamed to Postgres with COPY, so
+millions of rows load in minutes instead of hours through the ORM.
+
+Scale 1 is roughly 5.5M rows: 1,000 vendors, 3,000 stores, 200,000 products,
+200,000 customers, 2,000 drivers, 1,000,000 orders (~2.5M items), ~650,000 deliveries,
+~180,000 reviews, 500,000 chat messages and 5,000 promotions.
+
+Determinism: ids are derived from (--seed, table, row index) and every row's content from its
+own seeded RNG, so the same --seed/--scale/--as-of gives identical data regardless of --workers.
+Rows are tagged like benchmarks.seed (emails @bench.eazyfoods.test, "bench-" slugs) and
+include the bench principals, so benchmarks.hot_paths runs against either dataset.
+
+Tables load in dependency waves (parents before children so foreign keys hold); tables within
+a wave run in parallel worker processes.
+
+Usage:
+    python -m benchmarks.generate --scale 0.01            # ~55k rows, quick check
+    python -m benchmarks.generate --scale 1 --workers 6   # millions of rows
+    python -m benchmarks.seed --reset                     # remove it again
+"""
+import argparse
+import hashlib
+import io
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.database import SessionLocal, engine  # noqa: E402
+from app.services import ratings  # noqa: E402
+from benchmarks.seed import (  # noqa: E402
+    CATEGORY_NAMES, CHECKOUT_POOL_SIZE, CHECKOUT_POOL_STOCK, PRODUCT_KINDS, PRODUCT_WORDS,
+    bench_email, reset,
+)
+
+# City centres; stores, customers and drivers are scattered around them
+CITIES = {
+    "Calgary": (51.0447, -114.0719),
+    "Edmonton": (53.5461, -113.4938),
+    "Toronto": (43.6532, -79.3832),
+    "Vancouver": (49.2827, -123.1207),
+    "Winnipeg": (49.8951, -97.1384),
+    "Ottawa": (45.4215, -75.6972),
+    "Montreal": (45.5019, -73.5674),
+    "Halifax": (44.6488, -63.5752),
+}
+CITY_NAMES = list(CITIES)
+
+STORES_PER_VENDOR = 3
+PRODUCTS_PER_VENDOR = 200
+PROMOTIONS_PER_VENDOR = 5
+
+ORDER_STATUSES = ("delivered", "cancelled", "new", "accepted", "picking", "ready", "picked_up")
+ORDER_STATUS_WEIGHTS = (60, 8, 5, 5, 3, 4, 5)
+CHAT_LINES = ["Is this in stock?", "When will my order arrive?", "Thanks!", "Can I substitute the brand?",
+              "Your driver is on the way", "We have restocked this item", "Please leave it at the door"]
+REVIEW_TITLES = ["Great quality", "Fast delivery", "Just okay", "Will buy again", "Not as described"]
+
+
+def base_counts(scale: float) -> dict:
+    vendors = max(2, int(1000 * scale))
+    customers = max(2, int(200_000 * scale))
+    return {
+        "vendors": vendors,
+        "stores": vendors * STORES_PER_VENDOR,
+        "products": max(CHECKOUT_POOL_SIZE, vendors * PRODUCTS_PER_VENDOR),
+        "customers": customers,
+        "customer_addresses": customers,
+        "drivers": max(2, int(2000 * scale)),
+        "orders": max(10, int(1_000_000 * scale)),
+        "chat_messages": int(500_000 * scale),
+        "promotions": vendors * PROMOTIONS_PER_VENDOR,
+    }
+
+
+class Plan:
+    """Everything a worker needs to regenerate any row: sizes, seed and time anchor."""
+
+    def __init__(self, scale: float, seed: int, as_of: date):
+        self.seed = seed
+        self.counts = base_counts(scale)
+        self.now = datetime(as_of.year, as_of.month, as_of.day)
+
+    def uid(self, table: str, index: int) -> str:
+        """Deterministic UUID for row `index` of `table`."""
+        digest = hashlib.blake2b(f"{self.seed}:{table}:{index}".encode(), digest_size=16).digest()
+        return str(uuid.UUID(bytes=digest, version=4))
+
+    def rng(self, table: str, index: int) -> random.Random:
+        return random.Random(f"{self.seed}:{table}:{index}")
+
+    def vendor_of_product(self, p: int) -> int:
+        return p % self.counts["vendors"]
+
+    def products_of_vendor(self, v: int) -> range:
+        return range(v, self.counts["products"], self.counts["vendors"])
+
+    def product(self, p: int) -> dict:
+        rng = self.rng("products", p)
+        price = round(rng.uniform(1.5, 80), 2)
+        discounted = rng.random() < 0.2
+        v = self.vendor_of_product(p)
+        return {
+            "vendor": v,
+            "store": None if rng.random() < 0.25 else v + self.counts["vendors"] * rng.randrange(STORES_PER_VENDOR),
+            "name": f"{rng.choice(PRODUCT_WORDS)} {rng.choice(PRODUCT_KINDS)} {p}",
+            "price": price,
+            "sale_price": round(price * rng.uniform(0.6, 0.9), 2) if discounted else None,
+            "compare_at_price": round(price * 1.25, 2) if discounted else None,
+            "category": rng.randrange(len(CATEGORY_NAMES)),
+            "stock": CHECKOUT_POOL_STOCK if p < CHECKOUT_POOL_SIZE else rng.randint(0, 500),
+            "featured": rng.random() < 0.05,
+            "new": rng.random() < 0.1,
+            "created_at": self.now - timedelta(days=rng.uniform(0, 730)),
+        }
+
+    def order(self, o: int, prices: list) -> dict:
+        rng = self.rng("orders", o)
+        n = self.counts
+        last = o == n["orders"] - 1
+        customer = 0 if last else rng.randrange(n["customers"])
+        vendor = rng.randrange(n["vendors"])
+        if last:
+            # The bench driver's active delivery (update-location scenario)
+            status, method, driver = "picked_up", "delivery", 0
+        else:
+            status = rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0]
+            method = "delivery" if rng.random() < 0.85 else "pickup"
+            driver = rng.randrange(n["drivers"]) if method == "delivery" and status in ("delivered", "picked_up") else None
+        candidates = self.products_of_vendor(vendor)
+        items = [(p, rng.randint(1, 3)) for p in rng.sample(candidates, k=min(len(candidates), rng.randint(1, 4)))]
+        subtotal = round(sum(prices[p] * q for p, q in items), 2)
+        created_at = self.now - timedelta(minutes=rng.uniform(0, 240)) if status in ("ready", "new") or last \
+            else self.now - timedelta(days=rng.uniform(0, 365))
+        return {
+            "customer": customer, "vendor": vendor, "status": status, "method": method, "driver": driver,
+            "items": items, "subtotal": subtotal, "created_at": created_at,
+            "review": status == "delivered" and rng.random() < 0.3,
+            "rating": rng.choices((1, 2, 3, 4, 5), (5, 5, 15, 35, 40))[0],
+        }
+
+    def product_prices(self) -> list:
+        return [self.product(p)["price"] for p in range(self.counts["products"])]
+
+    def product_names(self) -> list:
+        return [self.product(p)["name"] for p in range(self.counts["products"])]
+
+
+def _near(rng: random.Random, city: str, spread: float = 0.15) -> tuple:
+    lat, lng = CITIES[city]
+    return round(lat + rng.uniform(-spread, spread), 6), round(lng + rng.uniform(-spread, spread), 6)
+
+
+def _ts(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# --- Row generators: each yields tuples in the order of TABLES[name] columns ---
+
+def gen_categories(plan: Plan):
+    for c, name in enumerate(CATEGORY_NAMES):
+        yield plan.uid("categories", c), name, f"bench-{name.lower()}", True, _ts(plan.now), _ts(plan.now)
+
+
+def gen_vendors(plan: Plan):
+    for v in range(plan.counts["vendors"]):
+        rng = plan.rng("vendors", v)
+        city = "Calgary" if v == 0 else CITY_NAMES[v % len(CITY_NAMES)]
+        lat, lng = _near(rng, city)
+        created = plan.now - timedelta(days=rng.uniform(30, 900))
+        yield (plan.uid("vendors", v), f"Bench Market {v}", rng.choice(("grocery", "butcher", "bakery")),
+               bench_email("vendor", v), f"555-{v:07d}", f"{v} Bench St", city, "T2P 1J9", "Canada", lat, lng,
+               "active", "verified", 15.0, 5.0, True, True, 0.0, 0, _ts(created), _ts(created))
+
+
+def gen_vendor_users(plan: Plan):
+    for v in range(plan.counts["vendors"]):
+        yield (plan.uid("vendor_users", v), plan.uid("vendors", v), bench_email("vendor-owner", v),
+               "Bench", f"Owner {v}", "store_owner", True, _ts(plan.now), _ts(plan.now))
+
+
+def gen_stores(plan: Plan):
+    n_vendors = plan.counts["vendors"]
+    for s in range(plan.counts["stores"]):
+        rng = plan.rng("stores", s)
+        v = s % n_vendors
+        city = "Calgary" if v == 0 else CITY_NAMES[v % len(CITY_NAMES)]
+        lat, lng = _near(rng, city)
+        yield (plan.uid("stores", s), plan.uid("vendors", v), f"Bench Market {v} #{s // n_vendors + 1}",
+               f"{s} Market Ave", city, "T2P 1J9", "Canada", lat, lng, True, s < n_vendors, "active",
+               True, True, 5.0, 0.0, _ts(plan.now), _ts(plan.now))
+
+
+def gen_products(plan: Plan):
+    for p in range(plan.counts["products"]):
+        d = plan.product(p)
+        yield (plan.uid("products", p), plan.uid("vendors", d["vendor"]),
+               plan.uid("stores", d["store"]) if d["store"] is not None else None,
+               d["name"], f"{d['name']} from the bench catalog", d["price"], d["sale_price"], d["compare_at_price"],
+               plan.uid("categories", d["category"]), f"BENCH-{p:08d}", "piece", d["stock"], 10, True,
+               "active", d["featured"], d["new"], f"bench-{p}", _ts(d["created_at"]), _ts(d["created_at"]))
+
+
+def gen_customers(plan: Plan):
+    for c in range(plan.counts["customers"]):
+        created = plan.now - timedelta(days=plan.rng("customers", c).uniform(0, 900))
+        yield (plan.uid("customers", c), bench_email("customer", c), "Bench", f"Customer {c}",
+               f"555-{c:07d}", True, _ts(created), _ts(created))
+
+
+def gen_customer_addresses(plan: Plan):
+    for a in range(plan.counts["customer_addresses"]):
+        rng = plan.rng("customer_addresses", a)
+        city = CITY_NAMES[a % len(CITY_NAMES)]
+        lat, lng = _near(rng, city, 0.25)
+        yield (plan.uid("customer_addresses", a), plan.uid("customers", a), "shipping", f"{a} Customer Rd",
+               city, "T2P 1J9", "Canada", lat, lng, True, _ts(plan.now), _ts(plan.now))
+
+
+def gen_drivers(plan: Plan):
+    for d in range(plan.counts["drivers"]):
+        rng = plan.rng("drivers", d)
+        city = "Calgary" if d == 0 else CITY_NAMES[d % len(CITY_NAMES)]
+        lat, lng = _near(rng, city)
+        yield (plan.uid("drivers", d), bench_email("driver", d), f"555-{d:07d}", "Bench", f"Driver {d}",
+               f"{d} Driver Way", city, "T2P 1J9", "Canada", rng.choice(("car", "bicycle", "scooter")),
+               "approved", True, d == 0 or rng.random() < 0.3, lat, lng, 0, 0, 0, 0.0, 0, 0.0, 10.0,
+               _ts(plan.now), _ts(plan.now))
+
+
+def gen_admin_users(plan: Plan):
+    # "!" is not a valid bcrypt hash: the bench admin can't log in, benchmarks mint its token directly
+    yield (plan.uid("admin_users", 0), bench_email("admin", 0), "!", "Bench", "Admin", "super_admin", True,
+           _ts(plan.now), _ts(plan.now))
+
+
+def gen_orders(plan: Plan):
+    prices = plan.product_prices()
+    n_vendors = plan.counts["vendors"]
+    for o in range(plan.counts["orders"]):
+        d = plan.order(o, prices)
+        subtotal = d["subtotal"]
+        tax = round(subtotal * 0.08, 2)
+        shipping = 5.0 if d["method"] == "delivery" else 0.0
+        commission = round(subtotal * 0.15, 2)
+        store = d["vendor"] + n_vendors * (o % STORES_PER_VENDOR)
+        yield (plan.uid("orders", o), f"BENCH-{plan.seed}-{o:09d}", plan.uid("vendors", d["vendor"]),
+               plan.uid("stores", store), plan.uid("customers", d["customer"]), d["status"], d["method"],
+               plan.uid("customer_addresses", d["customer"]) if d["method"] == "delivery" else None,
+               plan.uid("drivers", d["driver"]) if d["driver"] is not None else None,
+               subtotal, tax, shipping, 0.0, round(subtotal + tax + shipping, 2), subtotal, 15.0, commission,
+               round(subtotal - commission, 2), "paid", "stripe", _ts(d["created_at"]), _ts(d["created_at"]))
+
+
+def gen_order_items(plan: Plan):
+    prices, names = plan.product_prices(), plan.product_names()
+    i = 0
+    for o in range(plan.counts["orders"]):
+        d = plan.order(o, prices)
+        for p, quantity in d["items"]:
+            yield (plan.uid("order_items", i), plan.uid("orders", o), plan.uid("products", p), names[p],
+                   prices[p], quantity, round(prices[p] * quantity, 2), False, False, quantity, _ts(d["created_at"]))
+            i += 1
+
+
+def gen_deliveries(plan: Plan):
+    prices = plan.product_prices()
+    last = plan.counts["orders"] - 1
+    for o in range(plan.counts["orders"]):
+        d = plan.order(o, prices)
+        if d["driver"] is None:
+            continue
+        status = "delivered" if d["status"] == "delivered" else "in_transit"
+        delivered_at = _ts(d["created_at"] + timedelta(minutes=45)) if status == "delivered" else None
+        drop = CITIES["Calgary"] if o == last else (None, None)
+        yield (plan.uid("deliveries", o), plan.uid("orders", o), plan.uid("drivers", d["driver"]), status,
+               delivered_at, drop[0], drop[1], 5.0, 4.0, _ts(d["created_at"]), _ts(d["created_at"]))
+
+
+def gen_reviews(plan: Plan):
+    prices = plan.product_prices()
+    for o in range(plan.counts["orders"]):
+        d = plan.order(o, prices)
+        if not d["review"]:
+            continue
+        created = d["created_at"] + timedelta(days=1)
+        yield (plan.uid("reviews", o), plan.uid("vendors", d["vendor"]), plan.uid("products", d["items"][0][0]),
+               plan.uid("orders", o), plan.uid("customers", d["customer"]), d["rating"],
+               REVIEW_TITLES[o % len(REVIEW_TITLES)], "Synthetic review text", True, True, False, False,
+               _ts(created), _ts(created))
+
+
+def gen_chat_messages(plan: Plan):
+    n = plan.counts
+    for m in range(n["chat_messages"]):
+        rng = plan.rng("chat_messages", m)
+        customer = plan.uid("customers", rng.randrange(n["customers"]))
+        other_type = rng.choice(("vendor", "admin"))
+        other = plan.uid("vendors", rng.randrange(n["vendors"])) if other_type == "vendor" else None
+        if rng.random() < 0.5:
+            sender_type, sender, recipient_type, recipient = "customer", customer, other_type, other
+        else:
+            sender_type, sender = other_type, other or plan.uid("admin_users", 0)
+            recipient_type, recipient = "customer", customer
+        created = plan.now - timedelta(minutes=rng.uniform(0, 60 * 24 * 180))
+        is_read = rng.random() < 0.7
+        yield (plan.uid("chat_messages", m), sender_type, sender, recipient_type, recipient,
+               rng.choice(CHAT_LINES), is_read, _ts(created) if is_read else None, _ts(created))
+
+
+def gen_promotions(plan: Plan):
+    for i in range(plan.counts["promotions"]):
+        rng = plan.rng("promotions", i)
+        v = i % plan.counts["vendors"]
+        start = plan.now + timedelta(days=rng.uniform(-60, 30))
+        end = start + timedelta(days=rng.uniform(1, 30))
+        all_products = rng.random() < 0.3
+        products = None if all_products else "{" + ",".join(
+            plan.uid("products", p) for p in rng.sample(plan.products_of_vendor(v), k=3)) + "}"
+        yield (plan.uid("promotions", i), plan.uid("vendors", v), f"Bench promo {i}", "discount", "percentage",
+               rng.choice((10, 15, 20, 25)), all_products, products, True, False, "approved",
+               _ts(start), _ts(end), True, _ts(plan.now), _ts(plan.now))
+
+
+# table -> (columns, generator); column order matches what the generator yields
+TABLES = {
+    "categories": ("id, name, slug, is_active, created_at, updated_at", gen_categories),
+    "vendors": ("id, business_name, business_type, email, phone, street_address, city, postal_code, country, "
+                "latitude, longitude, status, verification_status, commission_rate, delivery_radius_km, "
+                "pickup_available, delivery_available, average_rating, total_reviews, created_at, updated_at",
+                gen_vendors),
+    "vendor_users": ("id, vendor_id, email, first_name, last_name, role, is_active, created_at, updated_at",
+                     gen_vendor_users),
+    "stores": ("id, vendor_id, name, street_address, city, postal_code, country, latitude, longitude, is_active, "
+               "is_primary, status, pickup_available, delivery_available, delivery_radius_km, delivery_fee, "
+               "created_at, updated_at", gen_stores),
+    "products": ("id, vendor_id, store_id, name, description, price, sale_price, compare_at_price, category_id, "
+                 "sku, unit, stock_quantity, low_stock_threshold, track_inventory, status, is_featured, "
+                 "is_newly_stocked, slug, created_at, updated_at", gen_products),
+    "customers": ("id, email, first_name, last_name, phone, is_email_verified, created_at, updated_at",
+                  gen_customers),
+    "customer_addresses": ("id, customer_id, type, street_address, city, postal_code, country, latitude, "
+                           "longitude, is_default, created_at, updated_at", gen_customer_addresses),
+    "drivers": ("id, email, phone, first_name, last_name, street_address, city, postal_code, country, "
+                "vehicle_type, verification_status, is_active, is_available, current_location_latitude, "
+                "current_location_longitude, total_deliveries, completed_deliveries, cancelled_deliveries, "
+                "average_rating, total_ratings, total_earnings, delivery_radius_km, created_at, updated_at",
+                gen_drivers),
+    "admin_users": ("id, email, password_hash, first_name, last_name, role, is_active, created_at, updated_at",
+                    gen_admin_users),
+    "orders": ("id, order_number, vendor_id, store_id, customer_id, status, delivery_method, delivery_address_id, "
+               "driver_id, subtotal, tax_amount, shipping_amount, discount_amount, total_amount, gross_sales, "
+               "commission_rate, commission_amount, net_payout, payment_status, payment_method, created_at, "
+               "updated_at", gen_orders),
+    "order_items": ("id, order_id, product_id, product_name, product_price, quantity, subtotal, is_substituted, "
+                    "is_out_of_stock, quantity_fulfilled, created_at", gen_order_items),
+    "deliveries": ("id, order_id, driver_id, status, delivered_at, delivery_latitude, delivery_longitude, "
+                   "delivery_fee, driver_earnings, created_at, updated_at", gen_deliveries),
+    "reviews": ("id, vendor_id, product_id, order_id, customer_id, rating, title, comment, is_verified_purchase, "
+                "is_public, is_reported, is_abusive, created_at, updated_at", gen_reviews),
+    "chat_messages": ("id, sender_type, sender_id, recipient_type, recipient_id, message, is_read, read_at, "
+                      "created_at", gen_chat_messages),
+    "promotions": ("id, vendor_id, name, promotion_type, discount_type, discount_value, applies_to_all_products, "
+                   "product_ids, is_active, requires_approval, approval_status, start_date, end_date, "
+                   "minimum_margin_enforced, created_at, updated_at", gen_promotions),
+}
+
+# Parents before children; tables in the same wave have no foreign keys between them
+WAVES = [
+    ["categories", "vendors", "customers", "drivers", "admin_users", "chat_messages"],
+    ["vendor_users", "stores", "customer_addresses", "promotions"],
+    ["products"],
+    ["orders"],
+    ["order_items", "deliveries", "reviews"],
+]
+
+
+def _copy_field(value) -> str:
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return str(value)
+
+
+class CopyStream(io.TextIOBase):
+    """File-like view over a row generator in COPY text format, so nothing is materialized."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._buffer = ""
+        self.count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        chunks, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = "\t".join(_copy_field(v) for v in row) + "\n"
+            chunks.append(line)
+            length += len(line)
+            self.count += 1
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _worker_init():
+    # Connections inherited from the parent process must not be reused (SQLAlchemy multiprocessing guidance)
+    engine.dispose(close=False)
+
+
+def load_table(table: str, scale: float, seed: int, as_of: date) -> tuple:
+    """COPY one table; runs in a worker process. Returns (table, rows, seconds)."""
+    plan = Plan(scale, seed, as_of)
+    columns, generator = TABLES[table]
+    stream = CopyStream(iter(generator(plan)))
+    started = time.perf_counter()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SET synchronous_commit = off")
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", stream, size=1 << 16)
+        connection.commit()
+    finally:
+        connection.close()
+    return table, stream.count, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="1 = ~5.5M rows (default)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="Anchor date for timestamps (YYYY-MM-DD, default today)")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel worker processes per wave")
+    parser.add_argument("--no-reset", action="store_true", help="Don't remove existing benchmark rows first")
+    args = parser.parse_args()
+
+    if not args.no_reset:
+        print("Removing existing benchmark rows...")
+        db = SessionLocal()
+        try:
+            reset(db)
+        finally:
+            db.close()
+
+    started = time.perf_counter()
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_worker_init) as pool:
+        for wave in WAVES:
+            futures = [pool.submit(load_table, table, args.scale, args.seed, args.as_of) for table in wave]
+            for future in futures:
+                table, rows, seconds = future.result()
+                total += rows
+                print(f"{table:>20}: {rows:>10,} rows in {seconds:6.1f}s")
+    print(f"{'total':>20}: {total:>10,} rows in {time.perf_counter() - started:6.1f}s")
+
+    # COPY bypasses the review write path: derive the denormalized rating totals once
+    db = SessionLocal()
+    try:
+        updated = ratings.backfill(db)
+    finally:
+        db.close()
+    print(f"{'rating totals':>20}: {sum(updated.values()):>10,} rows backfilled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Throughput and p50/p95/p99 for the hot API paths against a seeded local database.
+
+Scenarios:
+  products_city          GET  /customer/products?city=...
+  products_search        GET  /customer/products?search=...
+  products_discounted    GET  /customer/products?discounted=true
+  checkout               POST /customer/cart/checkout (1-3 items from the bench catalog)
+  driver_available       GET  /driver/available-orders
+  driver_location        POST /driver/deliveries/{id}/update-location
+  admin_overview         GET  /admin/analytics/overview
+  admin_master_export    GET  /admin/export/master-export (fewer requests, low concurrency)
+
+Results go to benchmarks/results/hot_paths-<commit>.json so runs can be diffed across commits.
+
+Usage:
+    python -m benchmarks.seed --scale 1            # once per scale
+    python -m benchmarks.hot_paths --requests 300 --concurrency 20
+    python -m benchmarks.hot_paths --scale 5 --only products_city,checkout   # reseed, then run two
+"""
+import argparse
+import asyncio
+import platform
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.main import app  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from benchmarks.common import serve, run_load, summarize, write_results  # noqa: E402
+from benchmarks.seed import bench_fixtures, reset, seed  # noqa: E402
+
+API = "/api/v1"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _tokens(fixtures: dict) -> dict:
+    """Mint tokens directly (no login round-trips, no bcrypt in the measured path)."""
+    ttl = timedelta(hours=2)
+    customer, driver, admin = fixtures["customer"], fixtures["driver"], fixtures["admin"]
+    return {
+        "customer": create_access_token({"sub": customer["email"], "customer_id": customer["id"]}, ttl),
+        "driver": create_access_token({"sub": driver["email"], "driver_id": driver["id"]}, ttl),
+        "admin": create_access_token({"sub": admin["email"], "admin_id": admin["id"], "role": admin["role"]}, ttl),
+    }
+
+
+def build_scenarios(fixtures: dict, args) -> list:
+    """(name, method, path, request_kwargs, total, concurrency) for every scenario."""
+    tokens = _tokens(fixtures)
+
+    def auth(kind: str) -> dict:
+        return {"Authorization": f"Bearer {tokens[kind]}"}
+
+    product_ids = fixtures["checkout_product_ids"]
+
+    def checkout_body(i: int) -> dict:
+        count = 1 + i % 3
+        items = [{"product_id": product_ids[(i + k) % len(product_ids)], "quantity": 1} for k in range(count)]
+        return {
+            "headers": auth("customer"),
+            "json": {
+                "items": items,
+                "delivery_method": "delivery",
+                "delivery_address_id": fixtures["customer"]["address_id"],
+                "payment_method": "cash",
+            },
+        }
+
+    def location_body(i: int) -> dict:
+        return {
+            "headers": auth("driver"),
+            "json": {"latitude": 51.0447 + (i % 100) / 10000, "longitude": -114.0719 + (i % 100) / 10000},
+        }
+
+    requests, concurrency = args.requests, args.concurrency
+    export_requests = max(3, requests // 20)
+    export_concurrency = min(2, concurrency)
+    return [
+        ("products_city", "GET", f"{API}/customer/products",
+         {"params": {"city": fixtures["city"], "limit": 20}}, requests, concurrency),
+        ("products_search", "GET", f"{API}/customer/products",
+         {"params": {"search": args.search, "limit": 20}}, requests, concurrency),
+        ("products_discounted", "GET", f"{API}/customer/products",
+         {"params": {"discounted": "true", "limit": 20}}, requests, concurrency),
+        ("checkout", "POST", f"{API}/customer/cart/checkout", checkout_body, requests, concurrency),
+        ("driver_available", "GET", f"{API}/driver/available-orders",
+         {"headers": auth("driver")}, requests, concurrency),
+        ("driver_location", "POST", f"{API}/driver/deliveries/{fixtures['driver']['delivery_id']}/update-location",
+         location_body, requests, concurrency),
+        ("admin_overview", "GET", f"{API}/admin/analytics/overview",
+         {"headers": auth("admin")}, requests, concurrency),
+        ("admin_master_export", "GET", f"{API}/admin/export/master-export",
+         {"headers": auth("admin")}, export_requests, export_concurrency),
+    ]
+
+
+async def _run(base_url: str, scenarios: list, warmup: int) -> dict:
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        for name, method, path, request_kwargs, total, concurrency in scenarios:
+            # Warm-up requests fill the pools and caches; they are not measured
+            await run_load(client, method, path, total=min(warmup, total), concurrency=concurrency,
+                           request_kwargs=request_kwargs)
+            latencies, errors, elapsed = await run_load(client, method, path, total=total,
+                                                        concurrency=concurrency, request_kwargs=request_kwargs)
+            results[name] = {"method": method, "path": path, "concurrency": concurrency,
+                             **summarize(latencies, elapsed, errors)}
+            stats = results[name]
+            print(f"{name:>20}: {stats['throughput_rps']} req/s  p50={stats['p50_ms']}ms  "
+                  f"p95={stats['p95_ms']}ms  p99={stats['p99_ms']}ms  errors={stats['errors']}/{stats['requests']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each scenario")
+    parser.add_argument("--scale", type=float, default=None, help="Reseed at this scale before running")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--search", default="jollof", help="Term for the products_search scenario")
+    parser.add_argument("--only", default="", help="Comma-separated scenario names to run")
+    parser.add_argument("--output", default=None, help="Default: benchmarks/results/hot_paths-<commit>.json")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        counts = None
+        if args.scale is not None:
+            reset(db)
+            counts = seed(db, args.scale, args.seed)
+        fixtures = bench_fixtures(db)
+    finally:
+        db.close()
+
+    scenarios = build_scenarios(fixtures, args)
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        unknown = wanted - {s[0] for s in scenarios}
+        if unknown:
+            raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        scenarios = [s for s in scenarios if s[0] in wanted]
+
+    with serve(app) as base_url:
+        results = asyncio.run(_run(base_url, scenarios, args.warmup))
+
+    commit = _git_commit()
+    path = write_results(args.output or f"benchmarks/results/hot_paths-{commit}.json", {
+        "benchmark": "hot_paths",
+        "commit": commit,
+        "run_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "params": vars(args),
+        "seeded_rows": counts,
+        "results": results,
+    })
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+SQL statements per request for GET /customer/products: must not grow with page size or catalog size.
+
+Every scenario is requested with several page sizes/offsets (and, with --scales, after reseeding at
+each scale); statements are counted with the N+1 detector's per-block audit. A scenario whose
+statement count differs between variants is a per-row or per-match query sneaking back in, and
+the run exits non-zero.
+
+Usage:
+    python -m benchmarks.seed --scale 1
+    python -m benchmarks.query_count
+    python -m benchmarks.query_count --scales 0.2,1,5     # reseeds at each scale
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.main import app  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.nplusone import detect_nplusone  # noqa: E402
+from benchmarks.common import write_results  # noqa: E402
+from benchmarks.seed import bench_fixtures, reset, seed  # noqa: E402
+
+PATH = "/api/v1/customer/products"
+# Non-empty pages: an empty page skips the per-page lookups and costs fewer statements
+PAGES = [{"limit": 1}, {"limit": 20}, {"limit": 100}, {"limit": 20, "skip": 40}]
+
+
+def scenarios(fixtures: dict, search: str) -> dict:
+    city = fixtures["city"]
+    return {
+        "all": {},
+        "city": {"city": city},
+        "city_search": {"city": city, "search": search},
+        "city_discounted": {"city": city, "discounted": "true"},
+        "city_price": {"city": city, "min_price": 1, "max_price": 50},
+    }
+
+
+async def count_statements(client: httpx.AsyncClient, params: dict) -> tuple:
+    # Threshold out of reach: only counting here, never flagging
+    with detect_nplusone(threshold=10 ** 9, strict=True, label=PATH) as audit:
+        response = await client.get(PATH, params=params)
+    return response.status_code, sum(audit.shapes.values())
+
+
+async def measure(search: str) -> dict:
+    db = SessionLocal()
+    try:
+        fixtures = bench_fixtures(db)
+    finally:
+        db.close()
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(PATH, params={"limit": 1})  # warm up pools and mappers
+        for name, params in scenarios(fixtures, search).items():
+            runs = []
+            for page in PAGES:
+                status, statements = await count_statements(client, {**params, **page})
+                runs.append({"params": page, "status": status, "statements": statements})
+            results[name] = runs
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="", help="Comma-separated scales to reseed and measure at")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--search", default="jollof")
+    parser.add_argument("--output", default="benchmarks/results/query_count.json")
+    args = parser.parse_args()
+
+    scales = [float(s) for s in args.scales.split(",") if s.strip()] or [None]
+    by_scale = {}
+    for scale in scales:
+        if scale is not None:
+            db = SessionLocal()
+            try:
+                reset(db)
+                seed(db, scale, args.seed)
+            finally:
+                db.close()
+        by_scale["current" if scale is None else str(scale)] = asyncio.run(measure(args.search))
+
+    failures = []
+    for name in next(iter(by_scale.values())):
+        runs = [run for results in by_scale.values() for run in results[name]]
+        counts = sorted({run["statements"] for run in runs})
+        errors = [run for run in runs if run["status"] >= 400]
+        print(f"{name:>16}: {' / '.join(map(str, counts))} statements per request over {len(runs)} variants")
+        if len(counts) > 1:
+            failures.append(f"{name}: statement count varies {counts}")
+        if errors:
+            failures.append(f"{name}: {len(errors)} request(s) failed, e.g. HTTP {errors[0]['status']}")
+
+    path = write_results(args.output, {"benchmark": "query_count", "params": vars(args), "results": by_scale})
+    print(f"Results written to {path}")
+    if failures:
+        raise SystemExit("Statement count is not constant:\n  " + "\n  ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Product search: ILIKE '%term%' (old) vs full-text + trigram (app/services/product_search.py).
+
+Runs the catalog search query the way GET /customer/products does (active products of active
+vendors, page of 20 plus total in one statement) for each term and mode, straight against the
+database, and reports p50/p95 latency, match counts and whether the plan used an index.
+Meant for ~1M products:
+
+    python -m benchmarks.generate --scale 5        # 1,000,000 products
+    psql "$DATABASE_URL" -f migrations/add_product_search.sql
+    python -m benchmarks.search --runs 20
+
+Terms default to a common word, a stemmed form, a typo, a phrase and a product number (one match).
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.main  # noqa: E402,F401  (configures mappers)
+from app.core.database import SessionLocal  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.models.vendor import Vendor  # noqa: E402
+from app.services import product_search  # noqa: E402
+from benchmarks.common import percentile, write_results  # noqa: E402
+
+DEFAULT_TERMS = ["jollof", "peppers", "jolof", "palm oil", "123457"]
+PAGE_SIZE = 20
+
+
+def search_statement(term: str, mode: str):
+    query = select(Product.id, Product.name, func.count().over().label("total")).join(
+        Vendor, Product.vendor_id == Vendor.id
+    ).where(Product.status == "active", Vendor.status == "active")
+    if mode == "ilike":
+        query = query.where(product_search.ilike_match(term)).order_by(Product.created_at.desc(), Product.id.desc())
+    else:
+        query = query.where(product_search.fulltext_match(term)).order_by(
+            product_search.rank(term).desc(), Product.created_at.desc(), Product.id.desc()
+        )
+    return query.limit(PAGE_SIZE)
+
+
+def _plan_nodes(plan: dict) -> set:
+    nodes = {plan["Node Type"] + (f" on {plan['Index Name']}" if "Index Name" in plan else "")}
+    for child in plan.get("Plans", []):
+        nodes |= _plan_nodes(child)
+    return nodes
+
+
+def explain(db, statement) -> list:
+    compiled = statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return sorted(n for n in _plan_nodes(plan[0]["Plan"]) if "Scan" in n)
+
+
+def measure(db, term: str, mode: str, runs: int) -> dict:
+    statement = search_statement(term, mode)
+    rows = db.execute(statement).all()  # warm-up (and result for the report)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        db.execute(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "matches": rows[0].total if rows else 0,
+        "top": [row.name for row in rows[:3]],
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "scans": explain(db, statement),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="Timed executions per term and mode")
+    parser.add_argument("--terms", default=",".join(DEFAULT_TERMS), help="Comma-separated search terms")
+    parser.add_argument("--output", default="benchmarks/results/search.json")
+    args = parser.parse_args()
+
+    terms = [t.strip() for t in args.terms.split(",") if t.strip()]
+    db = SessionLocal()
+    try:
+        products = db.scalar(select(func.count()).select_from(Product))
+        print(f"{products:,} products")
+        if products < 1_000_000:
+            print("  (fewer than 1M: generate more with `python -m benchmarks.generate --scale 5` for the target size)")
+        results = {}
+        for term in terms:
+            results[term] = {mode: measure(db, term, mode, args.runs) for mode in ("ilike", "fulltext")}
+            old, new = results[term]["ilike"], results[term]["fulltext"]
+            speedup = old["p50_ms"] / new["p50_ms"] if new["p50_ms"] else None
+            print(f"{term!r:>24}: ilike p50 {old['p50_ms']:>8} ms ({old['matches']:,} matches) | "
+                  f"fulltext p50 {new['p50_ms']:>8} ms ({new['matches']:,} matches)"
+                  + (f" | {speedup:.1f}x" if speedup else ""))
+            print(f"{'':>26}fulltext top: {new['top']}  scans: {new['scans']}")
+    finally:
+        db.close()
+
+    summary = {mode: statistics.median(r[mode]["p50_ms"] for r in results.values()) for mode in ("ilike", "fulltext")}
+    path = write_results(args.output, {
+        "benchmark": "search", "params": vars(args), "products": products,
+        "median_p50_ms": summary, "results": results,
+    })
+    print(f"Median p50: ilike {summary['ilike']} ms, fulltext {summary['fulltext']} ms")
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
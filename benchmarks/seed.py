@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Seed a local database with benchmark data at a configurable scale.
+
+Every row is tagged so it can be found and removed again: emails end in @bench.eazyfoods.test,
+category slugs start with "bench-". Re-running with the same --scale/--seed produces the same
+catalog (names, prices, cities, order mix), so runs are comparable across commits.
+
+Scale 1 is roughly: 20 vendors, 40 stores, 5,000 products, 500 customers, 50 drivers,
+5,000 historical orders (~12,500 items) and 200 orders waiting for a driver.
+
+Usage:
+    python -m benchmarks.seed --scale 1
+    python -m benchmarks.seed --reset        # remove benchmark rows only
+"""
+import argparse
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import insert, select, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app.main  # noqa: E402,F401  (registers every model so mappers configure)
+from app.core.database import SessionLocal  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.models.admin import AdminUser  # noqa: E402
+from app.models.customer import Customer, CustomerAddress  # noqa: E402
+from app.models.driver import Driver, Delivery  # noqa: E402
+from app.models.order import Order, OrderItem  # noqa: E402
+from app.models.product import Category, Product  # noqa: E402
+from app.models.store import Store  # noqa: E402
+from app.models.vendor import Vendor  # noqa: E402
+
+BENCH_DOMAIN = "bench.eazyfoods.test"
+BENCH_CITY = "Calgary"
+CITIES = ["Calgary", "Edmonton", "Toronto", "Vancouver", "Winnipeg", "Ottawa"]
+CATEGORY_NAMES = ["Grains", "Spices", "Produce", "Frozen", "Snacks", "Beverages",
+                  "Meat", "Seafood", "Dairy", "Bakery", "Sauces", "Household"]
+PRODUCT_WORDS = ["Jollof", "Egusi", "Plantain", "Cassava", "Suya", "Fufu", "Injera", "Berbere",
+                 "Ogbono", "Palm Oil", "Garri", "Yam", "Teff", "Shito", "Pepper Soup", "Moi Moi"]
+PRODUCT_KINDS = ["Mix", "Flour", "Seasoning", "Chips", "Paste", "Blend", "Pack", "Sauce"]
+ORDER_STATUSES = ["delivered"] * 6 + ["cancelled", "new", "accepted", "picked_up"]
+
+# Checkout scenarios draw from these products; they get enough stock never to run out
+CHECKOUT_POOL_SIZE = 50
+CHECKOUT_POOL_STOCK = 10_000_000
+
+
+def bench_email(kind: str, i: int) -> str:
+    return f"{kind}-{i}@{BENCH_DOMAIN}"
+
+
+def reset(db) -> None:
+    """Delete every benchmark-tagged row (children first), from this script or benchmarks.generate."""
+    like = f"%@{BENCH_DOMAIN}"
+    bench_vendors = "SELECT id FROM vendors WHERE email LIKE :like"
+    bench_customers = "SELECT id FROM customers WHERE email LIKE :like"
+    bench_drivers = "SELECT id FROM drivers WHERE email LIKE :like"
+    bench_orders = (f"SELECT id FROM orders WHERE vendor_id IN ({bench_vendors}) "
+                    f"OR customer_id IN ({bench_customers})")
+    for statement in (
+        f"DELETE FROM reviews WHERE vendor_id IN ({bench_vendors}) OR customer_id IN ({bench_customers})",
+        f"DELETE FROM chat_messages WHERE sender_id IN ({bench_customers}) OR recipient_id IN ({bench_customers})",
+        f"DELETE FROM promotions WHERE vendor_id IN ({bench_vendors})",
+        f"DELETE FROM deliveries WHERE order_id IN ({bench_orders}) OR driver_id IN ({bench_drivers})",
+        f"DELETE FROM order_status_history WHERE order_id IN ({bench_orders})",
+        f"DELETE FROM order_items WHERE order_id IN ({bench_orders})",
+        f"DELETE FROM orders WHERE id IN ({bench_orders})",
+        f"DELETE FROM customer_addresses WHERE customer_id IN ({bench_customers})",
+        f"DELETE FROM products WHERE vendor_id IN ({bench_vendors})",
+        f"DELETE FROM stores WHERE vendor_id IN ({bench_vendors})",
+        f"DELETE FROM vendor_users WHERE vendor_id IN ({bench_vendors})",
+        "DELETE FROM categories WHERE slug LIKE 'bench-%'",
+        "DELETE FROM vendors WHERE email LIKE :like",
+        "DELETE FROM customers WHERE email LIKE :like",
+        "DELETE FROM drivers WHERE email LIKE :like",
+        "DELETE FROM admin_users WHERE email LIKE :like",
+    ):
+        db.execute(text(statement), {"like": like})
+    db.commit()
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(round(value, 2)))
+
+
+def seed(db, scale: float = 1.0, seed_value: int = 42) -> dict:
+    """Insert the benchmark dataset; returns row counts per table."""
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    n_vendors = max(2, int(20 * scale))
+    n_products = max(CHECKOUT_POOL_SIZE, int(5000 * scale))
+    n_customers = max(2, int(500 * scale))
+    n_drivers = max(2, int(50 * scale))
+    n_orders = int(5000 * scale)
+    n_ready = max(10, int(200 * scale))
+    password_hash = get_password_hash("bench-password")
+
+    categories = [
+        {"id": uuid.uuid4(), "name": name, "slug": f"bench-{name.lower()}", "is_active": True}
+        for name in CATEGORY_NAMES
+    ]
+
+    vendors = []
+    for i in range(n_vendors):
+        city = BENCH_CITY if i == 0 else CITIES[i % len(CITIES)]
+        vendors.append({
+            "id": uuid.uuid4(), "business_name": f"Bench Market {i}", "business_type": "grocery",
+            "email": bench_email("vendor", i), "phone": f"555-01{i:04d}", "street_address": f"{i} Bench St",
+            "city": city, "postal_code": "T2P 1J9", "status": "active", "verification_status": "verified",
+            "commission_rate": Decimal("15.00"),
+        })
+
+    stores = []
+    for vendor in vendors:
+        for j in range(2):
+            stores.append({
+                "id": uuid.uuid4(), "vendor_id": vendor["id"], "name": f"{vendor['business_name']} #{j + 1}",
+                "street_address": f"{j + 1} Market Ave", "city": vendor["city"], "postal_code": "T2P 1J9",
+                "is_active": True,
+            })
+    stores_by_vendor = {}
+    for store in stores:
+        stores_by_vendor.setdefault(store["vendor_id"], []).append(store["id"])
+
+    products = []
+    for i in range(n_products):
+        vendor = vendors[i % n_vendors]
+        name = f"{rng.choice(PRODUCT_WORDS)} {rng.choice(PRODUCT_KINDS)} {i}"
+        price = rng.uniform(2, 60)
+        discounted = rng.random() < 0.2
+        products.append({
+            "id": uuid.uuid4(), "vendor_id": vendor["id"],
+            # A quarter of the catalog is sold at every store of the vendor (store_id NULL)
+            "store_id": None if rng.random() < 0.25 else rng.choice(stores_by_vendor[vendor["id"]]),
+            "name": name, "slug": f"bench-{i}", "description": f"{name} imported for the benchmark catalog",
+            "price": _money(price),
+            "sale_price": _money(price * 0.8) if discounted else None,
+            "compare_at_price": _money(price * 1.25) if discounted else None,
+            "category_id": rng.choice(categories)["id"],
+            "stock_quantity": CHECKOUT_POOL_STOCK if i < CHECKOUT_POOL_SIZE else rng.randint(0, 500),
+            "status": "active", "is_featured": rng.random() < 0.05, "is_newly_stocked": rng.random() < 0.1,
+        })
+
+    customers, addresses = [], []
+    for i in range(n_customers):
+        customer_id = uuid.uuid4()
+        customers.append({
+            "id": customer_id, "email": bench_email("customer", i), "first_name": "Bench",
+            "last_name": f"Customer {i}", "password_hash": password_hash, "is_email_verified": True,
+        })
+        addresses.append({
+            "id": uuid.uuid4(), "customer_id": customer_id, "type": "shipping",
+            "street_address": f"{i} Customer Rd", "city": CITIES[i % len(CITIES)], "postal_code": "T2P 1J9",
+            "latitude": _money(51.0 + rng.random() / 10), "longitude": _money(-114.1 + rng.random() / 10),
+            "is_default": True,
+        })
+
+    drivers = []
+    for i in range(n_drivers):
+        drivers.append({
+            "id": uuid.uuid4(), "email": bench_email("driver", i), "phone": f"555-02{i:04d}",
+            "password_hash": password_hash, "first_name": "Bench", "last_name": f"Driver {i}",
+            "street_address": f"{i} Driver Way", "city": CITIES[i % len(CITIES)], "postal_code": "T2P 1J9",
+            "verification_status": "approved", "is_active": True, "is_available": i == 0,
+        })
+
+    orders, items, deliveries = [], [], []
+
+    def add_order(customer_index: int, status: str, created_at: datetime, driver=None) -> dict:
+        vendor = vendors[rng.randrange(n_vendors)]
+        vendor_products = products[vendors.index(vendor)::n_vendors]
+        chosen = rng.sample(vendor_products, k=min(len(vendor_products), rng.randint(1, 4)))
+        order_id = uuid.uuid4()
+        subtotal = Decimal("0.00")
+        for product in chosen:
+            quantity = rng.randint(1, 3)
+            subtotal += product["price"] * quantity
+            items.append({
+                "id": uuid.uuid4(), "order_id": order_id, "product_id": product["id"],
+                "product_name": product["name"], "product_price": product["price"], "quantity": quantity,
+                "subtotal": product["price"] * quantity, "created_at": created_at,
+            })
+        commission = (subtotal * Decimal("0.15")).quantize(Decimal("0.01"))
+        tax = (subtotal * Decimal("0.08")).quantize(Decimal("0.01"))
+        order = {
+            "id": order_id, "order_number": f"BENCH-{len(orders):08d}", "vendor_id": vendor["id"],
+            "customer_id": customers[customer_index]["id"],
+            "delivery_address_id": addresses[customer_index]["id"], "status": status,
+            "delivery_method": "delivery", "driver_id": driver["id"] if driver else None,
+            "subtotal": subtotal, "tax_amount": tax, "shipping_amount": Decimal("5.00"),
+            "total_amount": subtotal + tax + Decimal("5.00"), "gross_sales": subtotal,
+            "commission_rate": Decimal("15.00"), "commission_amount": commission,
+            "net_payout": subtotal - commission, "payment_status": "paid", "payment_method": "stripe",
+            "created_at": created_at, "updated_at": created_at,
+        }
+        orders.append(order)
+        return order
+
+    for i in range(n_orders):
+        status = rng.choice(ORDER_STATUSES)
+        created_at = now - timedelta(days=rng.uniform(0, 60))
+        driver = drivers[rng.randrange(n_drivers)] if status in ("delivered", "picked_up") else None
+        order = add_order(rng.randrange(n_customers), status, created_at, driver)
+        if driver:
+            deliveries.append({
+                "id": uuid.uuid4(), "order_id": order["id"], "driver_id": driver["id"],
+                "status": "delivered" if status == "delivered" else "in_transit",
+                "delivery_fee": Decimal("5.00"), "driver_earnings": Decimal("4.00"),
+                "created_at": created_at, "updated_at": created_at,
+            })
+
+    # Orders waiting for a driver: what GET /driver/available-orders lists
+    for i in range(n_ready):
+        add_order(rng.randrange(n_customers), "ready", now - timedelta(minutes=rng.uniform(0, 120)))
+
+    # The bench driver's active delivery, target of the update-location scenario
+    active = add_order(0, "picked_up", now - timedelta(minutes=20), drivers[0])
+    deliveries.append({
+        "id": uuid.uuid4(), "order_id": active["id"], "driver_id": drivers[0]["id"], "status": "in_transit",
+        "pickup_latitude": Decimal("51.0447"), "pickup_longitude": Decimal("-114.0719"),
+        "delivery_latitude": Decimal("51.0486"), "delivery_longitude": Decimal("-114.0708"),
+        "delivery_fee": Decimal("5.00"), "driver_earnings": Decimal("4.00"),
+    })
+
+    admins = [{
+        "id": uuid.uuid4(), "email": bench_email("admin", 0), "password_hash": password_hash,
+        "first_name": "Bench", "last_name": "Admin", "role": "super_admin", "is_active": True,
+    }]
+
+    counts = {}
+    for model, rows in (
+        (Category, categories), (Vendor, vendors), (Store, stores), (Product, products),
+        (Customer, customers), (CustomerAddress, addresses), (Driver, drivers), (AdminUser, admins),
+        (Order, orders), (OrderItem, items), (Delivery, deliveries),
+    ):
+        # ORM bulk insert: applies the models' Python-side defaults, batches with insertmanyvalues
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(model), rows[start:start + 5000])
+        counts[model.__tablename__] = len(rows)
+    db.commit()
+    return counts
+
+
+def bench_fixtures(db) -> dict:
+    """Ids the benchmark scenarios act on (requires a seeded database)."""
+    customer = db.scalars(select(Customer).where(Customer.email == bench_email("customer", 0))).first()
+    driver = db.scalars(select(Driver).where(Driver.email == bench_email("driver", 0))).first()
+    admin = db.scalars(select(AdminUser).where(AdminUser.email == bench_email("admin", 0))).first()
+    if not (customer and driver and admin):
+        raise SystemExit("No benchmark data found: run `python -m benchmarks.seed --scale 1` first")
+    address_id = db.scalars(select(CustomerAddress.id).where(CustomerAddress.customer_id == customer.id)).first()
+    delivery_id = db.scalars(
+        select(Delivery.id).where(Delivery.driver_id == driver.id, Delivery.status == "in_transit")
+        .order_by(Delivery.created_at.desc())
+    ).first()
+    checkout_products = db.scalars(
+        select(Product.id).join(Vendor, Product.vendor_id == Vendor.id)
+        .where(Vendor.email.like(f"%@{BENCH_DOMAIN}"), Product.stock_quantity >= CHECKOUT_POOL_STOCK // 2)
+        .order_by(Product.slug)
+    ).all()
+    return {
+        "customer": {"id": str(customer.id), "email": customer.email, "address_id": str(address_id)},
+        "driver": {"id": str(driver.id), "email": driver.email, "delivery_id": str(delivery_id)},
+        "admin": {"id": str(admin.id), "email": admin.email, "role": admin.role},
+        "checkout_product_ids": [str(pid) for pid in checkout_products],
+        "city": BENCH_CITY,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for row counts (default 1)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed + scale = same data)")
+    parser.add_argument("--reset", action="store_true", help="Only remove benchmark rows")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        reset(db)
+        if args.reset:
+            print("Benchmark rows removed")
+            return
+        counts = seed(db, args.scale, args.seed)
+    finally:
+        db.close()
+    for table, count in counts.items():
+        print(f"{table:>20}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Response serialization microbenchmark: an order list of 50 orders x 20 items (GET /customer/orders).
+
+No database or server: the orders are transient ORM objects, and each path turns them into the
+response body the way FastAPI would:
+
+  legacy   dict built field by field (str(uuid), float(Decimal), isoformat(), getattr) ->
+           jsonable_encoder -> json.dumps        (the endpoint before typed schemas)
+  schema   CustomerOrderOut validated from attributes -> dump_python(mode="json") ->
+           orjson                                (response_model + FastJSONResponse, today's path)
+  direct   TypeAdapter.dump_json in one pydantic-core call (lower bound)
+
+Usage:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --orders 50 --items 20 --runs 500
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core import responses  # noqa: E402
+import app.main  # noqa: E402,F401  (configures mappers)
+from app.models.driver import Delivery  # noqa: E402
+from app.models.order import Order, OrderItem  # noqa: E402
+from app.schemas.order import CustomerOrderOut  # noqa: E402
+from benchmarks.common import percentile, write_results  # noqa: E402
+
+
+def build_orders(count: int, items: int) -> list:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    orders = []
+    for n in range(count):
+        order = Order(
+            id=uuid.uuid4(), order_number=f"ORD-{n:06d}", customer_id=uuid.uuid4(), vendor_id=uuid.uuid4(),
+            status="delivered", delivery_method="delivery", subtotal=Decimal("84.50"), tax_amount=Decimal("4.23"),
+            shipping_amount=Decimal("5.00"), discount_amount=Decimal("0.00"), total_amount=Decimal("93.73"),
+            gross_sales=Decimal("84.50"), commission_rate=Decimal("15.00"), commission_amount=Decimal("12.68"),
+            net_payout=Decimal("71.82"), payment_status="paid", special_instructions="Leave at the door",
+            created_at=now - timedelta(hours=n), updated_at=now - timedelta(hours=n) + timedelta(minutes=40),
+        )
+        order.items = [
+            OrderItem(
+                id=uuid.uuid4(), product_id=uuid.uuid4(), product_name=f"Product {i}", product_price=Decimal("4.25"),
+                quantity=2, subtotal=Decimal("8.50"), is_substituted=False, is_out_of_stock=False, quantity_fulfilled=2,
+            )
+            for i in range(items)
+        ]
+        order.delivery = [Delivery(id=uuid.uuid4(), driver_id=uuid.uuid4(), status="delivered", current_eta_minutes=0)]
+        orders.append(order)
+    return orders
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def legacy_payload(orders: list) -> list:
+    """The hand-built dicts GET /customer/orders returned before CustomerOrderOut."""
+    result = []
+    for order in orders:
+        delivery = order.delivery[0] if order.delivery else None
+        delivery_info = {
+            "id": str(delivery.id),
+            "driver_id": str(delivery.driver_id) if getattr(delivery, "driver_id", None) else None,
+            "status": getattr(delivery, "status", None),
+            "current_eta_minutes": getattr(delivery, "current_eta_minutes", None),
+        } if delivery else None
+        created_at = getattr(order, "created_at", None)
+        updated_at = getattr(order, "updated_at", None) or created_at
+        result.append({
+            "id": str(order.id),
+            "order_number": getattr(order, "order_number", "") or "",
+            "customer_id": str(order.customer_id) if getattr(order, "customer_id", None) else None,
+            "chef_id": str(order.chef_id) if getattr(order, "chef_id", None) else None,
+            "vendor_id": str(order.vendor_id) if getattr(order, "vendor_id", None) else None,
+            "status": getattr(order, "status", None) or "new",
+            "delivery_status": delivery_info.get("status") if delivery_info else None,
+            "delivery_method": getattr(order, "delivery_method", None) or "delivery",
+            **{field: _float(getattr(order, field, None)) for field in (
+                "subtotal", "tax_amount", "shipping_amount", "discount_amount", "total_amount",
+                "gross_sales", "commission_rate", "commission_amount", "net_payout",
+            )},
+            "payment_status": getattr(order, "payment_status", None) or "pending",
+            "special_instructions": getattr(order, "special_instructions", None),
+            "customer_notes": getattr(order, "customer_notes", None),
+            "created_at": created_at.isoformat() if created_at else "",
+            "updated_at": updated_at.isoformat() if updated_at else "",
+            "delivery": delivery_info,
+            "items": [
+                {
+                    "id": str(item.id),
+                    "product_id": str(item.product_id) if getattr(item, "product_id", None) else None,
+                    "cuisine_id": str(item.cuisine_id) if getattr(item, "cuisine_id", None) else None,
+                    "product_name": getattr(item, "product_name", "") or "",
+                    "product_price": _float(getattr(item, "product_price", None)),
+                    "quantity": getattr(item, "quantity", 0) or 0,
+                    "subtotal": _float(getattr(item, "subtotal", None)),
+                    "is_substituted": getattr(item, "is_substituted", False),
+                    "is_out_of_stock": getattr(item, "is_out_of_stock", False),
+                    "quantity_fulfilled": getattr(item, "quantity_fulfilled", 0),
+                }
+                for item in order.items
+            ],
+        })
+    return result
+
+
+ADAPTER = TypeAdapter(List[CustomerOrderOut])
+
+PATHS = {
+    "legacy": lambda orders: json.dumps(
+        jsonable_encoder(legacy_payload(orders)), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8"),
+    "schema": lambda orders: responses.dumps(
+        ADAPTER.dump_python(ADAPTER.validate_python(orders, from_attributes=True), mode="json")
+    ),
+    "direct": lambda orders: ADAPTER.dump_json(ADAPTER.validate_python(orders, from_attributes=True)),
+}
+
+
+def measure(fn, orders: list, runs: int) -> dict:
+    body = fn(orders)  # warm-up (and size for the report)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(orders)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "bytes": len(body),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--items", type=int, default=20, help="Items per order")
+    parser.add_argument("--runs", type=int, default=300, help="Timed serializations per path")
+    parser.add_argument("--output", default="benchmarks/results/serialization.json")
+    args = parser.parse_args()
+
+    orders = build_orders(args.orders, args.items)
+    # Same document either way: the schema path must not change the API
+    legacy, typed = json.loads(PATHS["legacy"](orders)), json.loads(PATHS["schema"](orders))
+    if legacy != typed:
+        raise SystemExit("schema output differs from the legacy dicts")
+
+    print(f"{args.orders} orders x {args.items} items, encoder: {'orjson' if responses.orjson else 'json (orjson missing)'}")
+    results = {name: measure(fn, orders, args.runs) for name, fn in PATHS.items()}
+    for name, result in results.items():
+        speedup = results["legacy"]["p50_ms"] / result["p50_ms"] if result["p50_ms"] else None
+        print(f"{name:>8}: p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  {result['bytes']:,} bytes"
+              + (f"  {speedup:.1f}x" if speedup and name != "legacy" else ""))
+
+    path = write_results(args.output, {"benchmark": "serialization", "params": vars(args), "results": results})
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time from process launch to the first served request.
+
+Launches `uvicorn app.main:app` as a fresh process (like a Render cold start or a new autoscaled
+worker) and measures, per run:
+  ready_s              launch -> first 200 from /health
+  first_api_request_s  launch -> first response from an /api/v1 route (unauthenticated, no DB access;
+                       with LAZY_ROUTERS this includes loading that route group)
+in eager and lazy router modes. Needs no database: engines connect lazily.
+
+Exits non-zero when the median first_api_request_s of a mode exceeds --budget-seconds, so CI can
+track the startup budget.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --budget-seconds 8
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import write_results  # noqa: E402
+
+FIRST_API_PATH = "/api/v1/admin/analytics/overview"  # 401 without a token; resolves the admin group
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(client: httpx.Client, url: str, deadline: float, ok) -> float:
+    while time.monotonic() < deadline:
+        try:
+            if ok(client.get(url)):
+                return time.monotonic()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"{url} not served before timeout")
+
+
+def measure_once(lazy: bool, timeout: float) -> dict:
+    port = _free_port()
+    env = dict(os.environ, LAZY_ROUTERS="true" if lazy else "false")
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            deadline = started + timeout
+            ready = _wait_for(client, "/health", deadline, lambda r: r.status_code == 200)
+            first_api = _wait_for(client, FIRST_API_PATH, deadline, lambda r: r.status_code < 500)
+    except TimeoutError:
+        process.kill()
+        raise SystemExit(f"Server did not start:\n{process.stderr.read().decode()[-4000:]}")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"ready_s": round(ready - started, 3), "first_api_request_s": round(first_api - started, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--modes", default="eager,lazy", help="Comma-separated: eager, lazy")
+    parser.add_argument("--budget-seconds", type=float, default=None,
+                        help="Fail if a mode's median first_api_request_s is above this")
+    parser.add_argument("--output", default="benchmarks/results/startup.json")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        runs = [measure_once(mode == "lazy", args.timeout) for _ in range(args.runs)]
+        results[mode] = {
+            "runs": runs,
+            "median_ready_s": statistics.median(r["ready_s"] for r in runs),
+            "median_first_api_request_s": statistics.median(r["first_api_request_s"] for r in runs),
+        }
+        print(f"{mode:>6}: ready {results[mode]['median_ready_s']}s, "
+              f"first API request {results[mode]['median_first_api_request_s']}s (median of {args.runs})")
+
+    path = write_results(args.output, {"benchmark": "startup", "params": vars(args), "results": results})
+    print(f"Results written to {path}")
+
+    if args.budget_seconds is not None:
+        over = [m for m, r in results.items() if r["median_first_api_request_s"] > args.budget_seconds]
+        if over:
+            raise SystemExit(f"Startup budget of {args.budget_seconds}s exceeded by: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
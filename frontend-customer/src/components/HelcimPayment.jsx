@@ -7,7 +7,7 @@ const HELCIM_SCRIPT_URL = 'https://secure.helcim.app/helcim-pay/services/start.j
 // When iframe is blocked (X-Frame-Options), open payment in a popup instead
 const HELCIM_POPUP_BASE = 'https://secure.helcim.app/helcim-pay/checkout'
 
-const HelcimPayment = ({ amount, token: tokenProp, onSuccess, onError, onPaymentReady, onCardReady }) => {
+const HelcimPayment = ({ amount, items, token: tokenProp, onSuccess, onError, onPaymentReady, onCardReady }) => {
   const { token: authToken } = useAuth()
   const token = authToken ?? tokenProp ?? (typeof localStorage !== 'undefined' ? localStorage.getItem('token') : null)
 
@@ -68,7 +68,8 @@ const HelcimPayment = ({ amount, token: tokenProp, onSuccess, onError, onPayment
         setError(null)
         const response = await api.post('/customer/payments/create-payment-intent', {
           total_amount: amount,
-          gateway: 'helcim'
+          gateway: 'helcim',
+          items // the cart's stock is held until checkout
         }, { headers: { Authorization: `Bearer ${token}` } })
         const ct = response.data.checkout_token || response.data.payment_token
         const st = response.data.secret_token
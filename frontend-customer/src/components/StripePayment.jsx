@@ -93,7 +93,7 @@ const StripePaymentForm = ({ amount, token, clientSecret, onSuccess, onError, on
   )
 }
 
-const StripePayment = ({ amount, token: tokenProp, onSuccess, onError, onPaymentReady, onCardReady }) => {
+const StripePayment = ({ amount, items, token: tokenProp, onSuccess, onError, onPaymentReady, onCardReady }) => {
   const { token: authToken } = useAuth()
   const token = authToken ?? tokenProp ?? (typeof localStorage !== 'undefined' ? localStorage.getItem('token') : null)
   const [clientSecret, setClientSecret] = useState(null)
@@ -138,7 +138,8 @@ const StripePayment = ({ amount, token: tokenProp, onSuccess, onError, onPayment
     if (!amount || amount <= 0 || !token || intentFetchedRef.current) return
     setError(null)
     intentFetchedRef.current = true
-    api.post('/customer/payments/create-payment-intent', { total_amount: amount, gateway: 'stripe' }, { headers: { Authorization: `Bearer ${token}` } })
+    // items: the cart's stock is held until checkout
+    api.post('/customer/payments/create-payment-intent', { total_amount: amount, gateway: 'stripe', items }, { headers: { Authorization: `Bearer ${token}` } })
       .then(res => {
         const secret = res.data?.client_secret
         if (secret) {
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect, useCallback, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import api from '../services/api'
 import { useCart } from '../contexts/CartContext'
@@ -13,6 +13,8 @@ const Checkout = () => {
   const { cart, getCartTotal, clearCart } = useCart()
   const { token } = useAuth()
   const navigate = useNavigate()
+  // One Idempotency-Key per order attempt: a retried submit returns the orders already placed
+  const checkoutKeyRef = useRef(null)
   const [loading, setLoading] = useState(false)
   const [processingPayment, setProcessingPayment] = useState(false)
   const [stores, setStores] = useState([])
@@ -210,7 +212,10 @@ const Checkout = () => {
 
       // Use token from AuthContext so we always send the same customer JWT that passed PrivateRoute
       const headers = token ? { Authorization: `Bearer ${token}` } : {}
+      if (!checkoutKeyRef.current) checkoutKeyRef.current = crypto.randomUUID()
+      headers['Idempotency-Key'] = checkoutKeyRef.current
       const response = await api.post('/customer/cart/checkout', orderData, { headers })
+      checkoutKeyRef.current = null
       clearCart()
       
       if (response.data.orders && response.data.orders.length > 0) {
@@ -269,6 +274,8 @@ const Checkout = () => {
   const tax = subtotal * 0.08
   const shipping = deliveryMethod === 'delivery' ? 5.00 : 0.00
   const total = subtotal + tax + shipping
+  // Store products in the cart: creating the payment holds their stock until checkout
+  const paymentItems = cart.filter(item => !(item.chef_id && item.cuisine_id)).map(item => ({ product_id: item.id, quantity: item.quantity }))
 
   // When payments are suspended, card is not required; otherwise card must be ready
   // selectedStoreId only required when cart has store items
@@ -534,6 +541,7 @@ const Checkout = () => {
                   <StripePayment
                     key={`stripe-${total}`}
                     amount={total}
+                    items={paymentItems}
                     token={token}
                     onSuccess={handlePaymentSuccess}
                     onError={handlePaymentError}
@@ -546,6 +554,7 @@ const Checkout = () => {
                 <div className="mt-3 pt-3 border-t border-gray-100">
                   <HelcimPayment
                     amount={total}
+                    items={paymentItems}
                     token={token}
                     onSuccess={handlePaymentSuccess}
                     onError={handlePaymentError}
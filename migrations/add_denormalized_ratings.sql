@@ -0,0 +1,16 @@
+-- Migration: denormalized rating totals on products, vendors and chefs
+-- rating_sum / rating_count (total_reviews on vendors and chefs) / average_rating cover public reviews
+-- and are kept current by app/services/ratings.py on every review write.
+-- After running this, fill them once: python -m app.services.ratings --backfill
+-- CONCURRENTLY avoids locking writes; run outside a transaction (psql -f, not inside BEGIN).
+
+ALTER TABLE products ADD COLUMN IF NOT EXISTS rating_sum INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE products ADD COLUMN IF NOT EXISTS rating_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE products ADD COLUMN IF NOT EXISTS average_rating DECIMAL(3, 2);
+
+ALTER TABLE vendors ADD COLUMN IF NOT EXISTS rating_sum INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE chefs ADD COLUMN IF NOT EXISTS rating_sum INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill and the consistency check aggregate reviews per product/vendor
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_product_public ON reviews (product_id) WHERE is_public = true;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_vendor_public ON reviews (vendor_id) WHERE is_public = true;
@@ -0,0 +1,15 @@
+-- Migration: spatial indexes for store, vendor and chef discovery (app/core/geo.py)
+-- GET /customer/stores and /customer/chefs with latitude/longitude filter by radius and sort by
+-- distance in SQL; these GiST indexes serve both the earth_box() prefilter and <-> nearest-first scans.
+-- The indexed expression must stay identical to app/core/geo.py (casts included).
+-- CONCURRENTLY avoids locking writes; run outside a transaction (psql -f, not inside BEGIN).
+
+CREATE EXTENSION IF NOT EXISTS cube;
+CREATE EXTENSION IF NOT EXISTS earthdistance;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stores_earth
+    ON stores USING gist (ll_to_earth(CAST(latitude AS FLOAT), CAST(longitude AS FLOAT)));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vendors_earth
+    ON vendors USING gist (ll_to_earth(CAST(latitude AS FLOAT), CAST(longitude AS FLOAT)));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chefs_earth
+    ON chefs USING gist (ll_to_earth(CAST(latitude AS FLOAT), CAST(longitude AS FLOAT)));
@@ -0,0 +1,19 @@
+-- Migration: (created_at, id) indexes for keyset (cursor) pagination
+-- Listings with ?cursor= read the next page as an index range scan starting after the cursor row.
+-- CONCURRENTLY avoids locking writes; run outside a transaction (psql -f, not inside BEGIN).
+
+-- Customer catalog and admin products
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_created_at_id ON products (created_at DESC, id DESC);
+
+-- Admin orders, customer order history, vendor orders
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_created_at_id ON orders (created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_customer_created_at_id ON orders (customer_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_vendor_created_at_id ON orders (vendor_id, created_at DESC, id DESC);
+
+-- Admin customers and activity log
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_customers_created_at_id ON customers (created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_admin_activity_logs_created_at_id ON admin_activity_logs (created_at DESC, id DESC);
+
+-- Chat /messages (each party sees messages it sent or received)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_sender_created_at_id ON chat_messages (sender_type, sender_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_recipient_created_at_id ON chat_messages (recipient_type, recipient_id, created_at, id);
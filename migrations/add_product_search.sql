@@ -0,0 +1,22 @@
+-- Migration: full-text and trigram product search (app/services/product_search.py)
+-- Once this has run, set PRODUCT_SEARCH_MODE=fulltext (the default, ilike, works without it).
+-- Adding the generated column rewrites the products table (takes a lock for the duration);
+-- the CONCURRENTLY index builds must run outside a transaction (psql -f, not inside BEGIN).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Name hits rank above description hits; 'english' must match FULLTEXT_CONFIG
+ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_search_vector ON products USING gin (search_vector);
+
+-- Typo-tolerant name matching (term <% name) and substring sku/barcode lookups (ILIKE '%...%')
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_name_trgm ON products USING gin (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_sku_trgm ON products USING gin (sku gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_barcode_trgm ON products USING gin (barcode gin_trgm_ops);
+
+COMMENT ON COLUMN products.search_vector IS 'Generated: weighted tsvector of name (A) and description (B) for product search';
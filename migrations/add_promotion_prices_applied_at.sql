@@ -0,0 +1,10 @@
+-- Migration: track when a promotion's discount was written to product prices
+-- The promotion scheduler (app/services/promotion_scheduler.py) applies approved promotions whose
+-- start_date has passed and prices_applied_at is still NULL, and reverts those past end_date.
+-- Existing promotions start out NULL: the first run re-applies the running ones (idempotent).
+
+ALTER TABLE promotions ADD COLUMN IF NOT EXISTS prices_applied_at TIMESTAMP;
+
+-- Due / expired lookups only look at active, approved promotions
+CREATE INDEX IF NOT EXISTS idx_promotions_active_schedule
+    ON promotions (start_date, end_date) WHERE is_active = true AND approval_status = 'approved';
@@ -0,0 +1,21 @@
+-- Migration: Idempotency-Key store for checkout and payments (app/services/idempotency.py)
+-- One row per (endpoint, customer, key): in_progress while the first request runs, then completed
+-- with its response, which retries get back instead of running the request again.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    scope VARCHAR(50) NOT NULL,
+    principal_id VARCHAR(64) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'in_progress',  -- in_progress, completed
+    response_body JSONB,
+    locked_until TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    CONSTRAINT uq_idempotency_keys_scope_principal_key UNIQUE (scope, principal_id, key)
+);
+
+-- Periodic purge of expired keys
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys (expires_at);
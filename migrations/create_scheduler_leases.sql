@@ -0,0 +1,11 @@
+-- Migration: leases for background jobs that must run on one worker at a time
+-- The promotion scheduler (app/services/promotion_scheduler.py) claims its row with a conditional
+-- INSERT ... ON CONFLICT DO UPDATE ... WHERE locked_until < now() in one committed statement, so the
+-- lease holds across connections (unlike a session advisory lock under PgBouncer transaction pooling).
+-- A worker that dies mid-run blocks the job only until locked_until.
+
+CREATE TABLE IF NOT EXISTS scheduler_leases (
+    name VARCHAR(50) PRIMARY KEY,
+    holder VARCHAR(64) NOT NULL,
+    locked_until TIMESTAMP NOT NULL
+);
@@ -0,0 +1,21 @@
+-- Migration: stock held for a customer between payment-intent creation and checkout
+-- (app/services/stock_reservations.py). Availability = stock_quantity - active, unexpired holds.
+-- The sweeper marks holds past expires_at as expired; checkout marks the customer's holds consumed.
+
+CREATE TABLE IF NOT EXISTS stock_reservations (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    status VARCHAR(20) NOT NULL DEFAULT 'active',  -- active, consumed, released, expired
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Every lookup only looks at active holds: units held per product, a customer's holds, the sweep
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_active_product
+    ON stock_reservations (product_id, expires_at) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_active_customer
+    ON stock_reservations (customer_id) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_active_expires_at
+    ON stock_reservations (expires_at) WHERE status = 'active';
@@ -1,14 +1,28 @@
 #!/usr/bin/env python3
 """
 Run the FastAPI application
+
+    python run.py                      # dev server with auto-reload
+    python run.py --profile-startup    # per-module import time and router build time, then exit
 """
+import argparse
+
 import uvicorn
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True  # Auto-reload on code changes
-    )
+    parser = argparse.ArgumentParser(description="Run the FastAPI application")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Report import and router build times (set LAZY_ROUTERS=true to profile lazy mode)")
+    parser.add_argument("--top", type=int, default=25, help="Rows per section in the startup report")
+    args = parser.parse_args()
 
+    if args.profile_startup:
+        from app.core.startup import profile_startup, print_startup_report
+        print_startup_report(profile_startup(top=args.top), top=args.top)
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True  # Auto-reload on code changes
+        )